@@ -12,6 +12,7 @@ from django.contrib.auth.models import User
 from django.db import IntegrityError
 from django.core.mail import send_mail
 from django.conf import settings
+from taskmanager_project.db_routers import replica_reads
 from django.utils.crypto import get_random_string
 from django.utils import timezone
 from datetime import timedelta
@@ -510,6 +511,7 @@ def logout(request):
 
 @api_view(['GET', 'PUT'])
 @permission_classes([IsAuthenticated])
+@replica_reads
 def profile(request):
     """
     Get or update user profile information.
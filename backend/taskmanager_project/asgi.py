@@ -1,5 +1,9 @@
 """
 ASGI config for taskmanager_project project.
+
+Serve the project through this entry point (e.g. `uvicorn
+taskmanager_project.asgi:application`) to hold the long-lived
+/api/tasks/events/ streams without tying up a worker thread each.
 """
 
 import os
@@ -1,9 +1,11 @@
 from django.contrib import admin
 from django.urls import path, include
-from django.http import HttpResponse
+from django.conf import settings
+from django.http import HttpResponse, JsonResponse
 from django.contrib.auth.models import User
 from authentication.models import UserProfile
 from tasks_api.models import Task
+from .pooled_postgresql.pool import pool_stats
 import json
 
 class CustomAdminSite(admin.AdminSite):
@@ -16,6 +18,7 @@ class CustomAdminSite(admin.AdminSite):
         custom_urls = [
             path('api-stats/', self.admin_view(self.api_stats_view), name='api_stats'),
             path('api-test/', self.admin_view(self.api_test_view), name='api_test'),
+            path('db-pool/', self.admin_view(self.db_pool_view), name='db_pool'),
         ]
         return custom_urls + urls
     
@@ -200,6 +203,23 @@ curl -X POST http://localhost:8000/api/tasks/ \\
         </html>
         """
         return HttpResponse(html)
+    
+    def db_pool_view(self, request):
+        """
+        Veritabanı bağlantı ayarları ve bu sürecin bağlantı havuzu metrikleri
+        (JSON; havuzlar süreç başına tutulur)
+        """
+        return JsonResponse({
+            'databases': {
+                alias: {
+                    'engine': database['ENGINE'],
+                    'conn_max_age': database.get('CONN_MAX_AGE', 0),
+                    'conn_health_checks': database.get('CONN_HEALTH_CHECKS', False),
+                }
+                for alias, database in settings.DATABASES.items()
+            },
+            'pools': pool_stats(),
+        })
 
 # Custom admin site'i kaydet
 custom_admin_site = CustomAdminSite(name='custom_admin')
@@ -0,0 +1,279 @@
+"""
+Read-replica routing for the API.
+
+Views decorated with `replica_reads` send the reads of their safe (GET,
+HEAD, OPTIONS) requests to a replica from DB_REPLICA_HOSTS; everything
+else, and every write, goes to the primary ('default'). The routing
+state is a context variable set after authentication, so it follows the
+request through sync and async code alike and ends with it; a streaming
+response keeps it until its content is consumed.
+
+Read-your-writes: a request that writes pins its user to the primary for
+DB_REPLICA_PIN_SECONDS through the cache, so the user's next reads see
+their own changes even while the replicas catch up. The pin lives in the
+default cache; with several worker processes that must be a shared cache
+(Redis, Memcached), not the per-process LocMemCache.
+
+Lag-aware fallback: each replica's replication lag is checked at most
+every DB_REPLICA_LAG_CHECK_INTERVAL seconds per process. A replica that
+lags more than DB_REPLICA_MAX_LAG seconds, is not streaming WAL from the
+primary, or cannot be reached, gets no reads until the next check; with
+no usable replica reads stay on the primary.
+"""
+
+import contextvars
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError, connections
+
+logger = logging.getLogger(__name__)
+
+PRIMARY = 'default'
+REPLICA_PREFIX = 'replica'
+
+
+@dataclass
+class RoutingState:
+    user_id: int = None
+    # Safe request of a decorated view, user not pinned to the primary
+    use_replicas: bool = False
+    wrote: bool = False
+
+
+_state = contextvars.ContextVar('db_routing_state', default=None)
+
+
+def replica_aliases():
+    return [alias for alias in connections if alias.startswith(REPLICA_PREFIX)]
+
+
+def pin_key(user_id):
+    return f'db:primary-pin:{user_id}'
+
+
+def pin_to_primary(user_id):
+    """Send the user's reads to the primary for the next DB_REPLICA_PIN_SECONDS"""
+    cache.set(pin_key(user_id), True, settings.DB_REPLICA_PIN_SECONDS)
+
+
+def is_pinned(user_id):
+    return user_id is not None and cache.get(pin_key(user_id)) is not None
+
+
+class ReplicaLagMonitor:
+    """Per-process record of which replicas are caught up enough to read from"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        # alias -> (checked at, usable)
+        self._checks = {}
+    
+    def usable(self, alias):
+        now = time.monotonic()
+        checked_at, usable = self._checks.get(alias, (None, False))
+        if checked_at is not None and now - checked_at < settings.DB_REPLICA_LAG_CHECK_INTERVAL:
+            return usable
+        with self._lock:
+            checked_at, usable = self._checks.get(alias, (None, False))
+            if checked_at is None or now - checked_at >= settings.DB_REPLICA_LAG_CHECK_INTERVAL:
+                usable = self.check(alias)
+                self._checks[alias] = (now, usable)
+        return usable
+    
+    def check(self, alias):
+        try:
+            lag = self.lag(connections[alias])
+        except DatabaseError:
+            logger.warning('Replica %s is unavailable, reading from the primary', alias, exc_info=True)
+            return False
+        if lag is None:
+            logger.warning('Replica %s is not streaming from the primary, reading from the primary', alias)
+            return False
+        if lag > settings.DB_REPLICA_MAX_LAG:
+            logger.warning('Replica %s lags %.1fs behind, reading from the primary', alias, lag)
+            return False
+        return True
+    
+    @staticmethod
+    def lag(connection):
+        """
+        Seconds the replica's replayed data is behind the primary, or None
+        when that is unknown: a standby whose WAL receiver is not streaming
+        (disconnected, or restoring from an archive) has replayed all it
+        received however far behind the primary it is.
+        """
+        if connection.vendor != 'postgresql':
+            return 0.0
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT pg_is_in_recovery(), "
+                "EXISTS (SELECT 1 FROM pg_stat_wal_receiver WHERE status = 'streaming'), "
+                "pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn(), "
+                "EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())"
+            )
+            in_recovery, streaming, replayed_all, replay_age = cursor.fetchone()
+        if not in_recovery:
+            return 0.0
+        if not streaming:
+            return None
+        # A streaming standby that replayed everything it received is current,
+        # however old its last replayed transaction is (the primary may be idle)
+        if replayed_all or replay_age is None:
+            return 0.0
+        return float(replay_age)
+    
+    def reset(self):
+        with self._lock:
+            self._checks.clear()
+
+
+lag_monitor = ReplicaLagMonitor()
+
+
+class ReplicaRouter:
+    """
+    Routes reads of replica_reads views to a caught-up replica and all
+    other queries to the primary.
+    """
+    
+    def db_for_read(self, model, **hints):
+        state = _state.get()
+        if state is None or not state.use_replicas or state.wrote:
+            return PRIMARY
+        replicas = [alias for alias in replica_aliases() if lag_monitor.usable(alias)]
+        return random.choice(replicas) if replicas else PRIMARY
+    
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None:
+            # Reads later in the request, and the user's next requests, see this write
+            state.wrote = True
+        return PRIMARY
+    
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {PRIMARY, *replica_aliases()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+    
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas get their schema from the primary
+        if db in replica_aliases():
+            return False
+        return None
+
+
+def _begin(request):
+    user_id = getattr(request.user, 'id', None)
+    safe = request.method in ('GET', 'HEAD', 'OPTIONS')
+    use_replicas = safe and bool(replica_aliases()) and not is_pinned(user_id)
+    return _state.set(RoutingState(user_id=user_id, use_replicas=use_replicas))
+
+
+def _end(token, response=None):
+    """
+    End the routing of a request; for a streaming response, which runs its
+    queries as its content is consumed, once that content is consumed.
+    """
+    state = _state.get()
+    _state.reset(token)
+    if state is None:
+        return
+    if getattr(response, 'streaming', False):
+        stream = _routed_async_stream if response.is_async else _routed_stream
+        response.streaming_content = stream(response.streaming_content, state)
+    else:
+        _finish(state)
+
+
+def _finish(state):
+    if state.wrote and state.user_id is not None:
+        pin_to_primary(state.user_id)
+
+
+def _routed_stream(content, state):
+    # Each chunk is produced under the request's routing state, in whatever
+    # context the server consumes the response in
+    iterator = iter(content)
+    try:
+        while True:
+            token = _state.set(state)
+            try:
+                chunk = next(iterator)
+            except StopIteration:
+                break
+            finally:
+                _state.reset(token)
+            yield chunk
+    finally:
+        close = getattr(iterator, 'close', None)
+        if close is not None:
+            close()
+        _finish(state)
+
+
+async def _routed_async_stream(content, state):
+    iterator = content.__aiter__()
+    try:
+        while True:
+            token = _state.set(state)
+            try:
+                chunk = await iterator.__anext__()
+            except StopAsyncIteration:
+                break
+            finally:
+                _state.reset(token)
+            yield chunk
+    finally:
+        close = getattr(iterator, 'aclose', None)
+        if close is not None:
+            await close()
+        await sync_to_async(_finish)(state)
+
+
+def replica_reads(view):
+    """
+    Let a DRF view read from the replicas on safe requests.
+    
+    Decorates an APIView/ViewSet class (routing starts once `initial` has
+    authenticated the request and ends in `finalize_response`, or once a
+    streaming response is consumed) or a function view below its @api_view
+    decorator.
+    """
+    if isinstance(view, type):
+        initial, finalize_response = view.initial, view.finalize_response
+        
+        def initial_with_routing(self, request, *args, **kwargs):
+            initial(self, request, *args, **kwargs)
+            self._db_routing_token = _begin(request)
+        
+        def finalize_response_with_routing(self, request, response, *args, **kwargs):
+            token = getattr(self, '_db_routing_token', None)
+            if token is not None:
+                self._db_routing_token = None
+                _end(token, response)
+            return finalize_response(self, request, response, *args, **kwargs)
+        
+        view.initial = wraps(initial)(initial_with_routing)
+        view.finalize_response = wraps(finalize_response)(finalize_response_with_routing)
+        return view
+    
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        token = _begin(request)
+        response = None
+        try:
+            response = view(request, *args, **kwargs)
+            return response
+        finally:
+            _end(token, response)
+    
+    return wrapper
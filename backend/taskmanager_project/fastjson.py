@@ -0,0 +1,85 @@
+"""
+orjson-backed JSON renderer and parser for the API.
+
+Both classes produce and accept exactly what DRF's JSONRenderer/JSONParser
+do; orjson only takes over the common case (compact UTF-8 output, UTF-8
+input) and everything else -- indented output, other charsets, values
+orjson cannot encode, malformed input -- goes through the stdlib path, so
+error messages stay the same. Without orjson installed they behave as the
+plain DRF classes.
+
+Two edge cases differ from the stdlib path: orjson writes NaN/Infinity as
+null instead of rejecting them, and reads integers wider than 64 bits as
+floats. API payloads never carry such values.
+"""
+
+import io
+
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+if orjson is not None:
+    # Datetimes go through DRF's encoder so they are formatted exactly as
+    # before ('Z' suffix for UTC); Decimals, lazy strings etc. land there too
+    ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_NON_STR_KEYS
+    _default = JSONEncoder().default
+
+
+def dumps(data):
+    """
+    Compact UTF-8 JSON bytes for `data`, encoded like DRF's JSONEncoder.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, default=_default, option=ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            pass
+    return JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode(data).encode()
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer using orjson for compact, non-ASCII-escaped output.
+    """
+    
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+        
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+        
+        try:
+            ret = orjson.dumps(data, default=_default, option=ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        
+        # Same \u2028 / \u2029 escaping as JSONRenderer (strict JavaScript subset)
+        return ret.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
+
+
+class FastJSONParser(JSONParser):
+    """
+    JSONParser using orjson for UTF-8 request bodies.
+    """
+    renderer_class = FastJSONRenderer
+    
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', 'utf-8')
+        if orjson is None or not self.strict or encoding.lower().replace('_', '-') not in ('utf-8', 'utf8'):
+            return super().parse(stream, media_type, parser_context)
+        
+        body = stream.read() if stream is not None else b''
+        try:
+            return orjson.loads(body)
+        except orjson.JSONDecodeError:
+            # Let the stdlib parser produce the usual ParseError message
+            return super().parse(io.BytesIO(body), media_type, parser_context)
@@ -0,0 +1,76 @@
+"""
+PostgreSQL backend drawing its connections from a process-wide pool.
+
+Django opens a connection per thread and, with CONN_MAX_AGE = 0, closes
+it after every request; under ASGI the threads running sync code come
+and go, so persistent connections do not help there either. With this
+backend (ENGINE 'taskmanager_project.pooled_postgresql', enabled by
+DB_POOL) "closing" a connection hands it back to the pool of its
+database alias, and the next request of any thread reuses it without a
+new TCP and authentication handshake.
+
+The pool is configured by the database's POOL settings (see
+ConnectionPool), and CONN_HEALTH_CHECKS checks reused connections.
+Run with CONN_MAX_AGE = 0 so connections go back at the end of each
+request.
+"""
+
+import psycopg2.extras
+from django.db.backends.base.base import NO_DB_ALIAS
+from django.db.backends.postgresql import base, creation
+from django.db.backends.postgresql.psycopg_any import IsolationLevel
+
+from .pool import ConnectionPool, close_pools, get_pool
+
+
+class DatabaseCreation(creation.DatabaseCreation):
+    """Closes the pooled connections, which keep it in use, before dropping a test database"""
+    
+    def _destroy_test_db(self, test_database_name, verbosity):
+        close_pools()
+        super()._destroy_test_db(test_database_name, verbosity)
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    creation_class = DatabaseCreation
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.pooled_connection = None
+        self.connection_pool = None
+    
+    def create_pool(self):
+        conn_params = self.get_connection_params()
+        
+        def connect():
+            connection = self.Database.connect(**conn_params)
+            # As in the postgresql backend: skip psycopg2's json decoding of jsonb
+            psycopg2.extras.register_default_jsonb(conn_or_curs=connection, loads=lambda x: x)
+            return connection
+        
+        return ConnectionPool(
+            connect, check=self.settings_dict['CONN_HEALTH_CHECKS'], **self.settings_dict.get('POOL', {})
+        )
+    
+    def get_new_connection(self, conn_params):
+        if self.alias == NO_DB_ALIAS:
+            # Maintenance connections to the 'postgres' database are not pooled
+            return super().get_new_connection(conn_params)
+        # Keyed by database name too: test runs switch to the test database
+        self.connection_pool = get_pool((self.alias, self.settings_dict['NAME']), self.create_pool)
+        self.pooled_connection = self.connection_pool.getconn()
+        connection = self.pooled_connection.connection
+        isolation_level = self.settings_dict['OPTIONS'].get('isolation_level')
+        if isolation_level is None:
+            self.isolation_level = IsolationLevel.READ_COMMITTED
+        else:
+            self.isolation_level = IsolationLevel(isolation_level)
+            connection.isolation_level = self.isolation_level
+        return connection
+    
+    def _close(self):
+        pooled, self.pooled_connection = self.pooled_connection, None
+        if pooled is None:
+            return super()._close()
+        with self.wrap_database_errors:
+            self.connection_pool.putconn(pooled)
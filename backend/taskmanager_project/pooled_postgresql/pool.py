@@ -0,0 +1,229 @@
+"""
+Process-wide psycopg2 connection pools, one per database alias.
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+
+import psycopg2
+from psycopg2 import extensions
+
+
+@dataclass
+class PoolStats:
+    checkouts: int = 0
+    # Checkouts that found no idle connection and the pool at its maximum size
+    waits: int = 0
+    wait_seconds: float = 0.0
+    timeouts: int = 0
+    connections_created: int = 0
+    connections_discarded: int = 0
+
+
+@dataclass
+class PooledConnection:
+    connection: object
+    created_at: float = field(default_factory=time.monotonic)
+    returned_at: float = field(default_factory=time.monotonic)
+
+
+class PoolTimeout(psycopg2.OperationalError):
+    pass
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of psycopg2 connections.
+    
+    Up to `max_size` connections are open at a time; a checkout with none
+    idle and the pool full waits up to `timeout` seconds for a connection
+    to come back. Idle connections are reused most recently returned
+    first, after a `SELECT 1` when `check` is set; connections idle for
+    more than `max_idle` seconds (beyond `min_size`), older than
+    `max_lifetime` seconds, closed or broken are discarded.
+    """
+    
+    def __init__(self, connect, min_size=0, max_size=10, timeout=10.0, max_idle=300.0, max_lifetime=1800.0,
+                 check=True):
+        self.connect = connect
+        self.check = check
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.max_lifetime = max_lifetime
+        self.stats = PoolStats()
+        # Oldest returned on the left
+        self._idle = deque()
+        self._size = 0
+        self._condition = threading.Condition()
+    
+    def getconn(self):
+        with self._condition:
+            self.stats.checkouts += 1
+        while True:
+            pooled = self._checkout()
+            if pooled is None:
+                return self._open()
+            if not self.check or self._healthy(pooled.connection):
+                return pooled
+            with self._condition:
+                self._discard(pooled)
+                self._condition.notify()
+    
+    def _checkout(self):
+        """An idle connection, or None with a slot reserved for a new one"""
+        with self._condition:
+            self._reap_idle()
+            started = None
+            while True:
+                pooled = self._pop_idle()
+                if pooled is not None or self._size < self.max_size:
+                    break
+                if started is None:
+                    started = time.monotonic()
+                    self.stats.waits += 1
+                remaining = started + self.timeout - time.monotonic()
+                if remaining <= 0:
+                    self.stats.wait_seconds += time.monotonic() - started
+                    self.stats.timeouts += 1
+                    raise PoolTimeout(
+                        f'No database connection available within {self.timeout}s '
+                        f'(all {self.max_size} pooled connections in use)'
+                    )
+                self._condition.wait(remaining)
+            if started is not None:
+                self.stats.wait_seconds += time.monotonic() - started
+            if pooled is None:
+                # The connection is opened outside the lock
+                self._size += 1
+            return pooled
+    
+    @staticmethod
+    def _healthy(connection):
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+            if connection.info.transaction_status != extensions.TRANSACTION_STATUS_IDLE:
+                connection.rollback()
+        except psycopg2.Error:
+            return False
+        return True
+    
+    def putconn(self, pooled, discard=False):
+        """Return a connection; an open transaction is rolled back"""
+        connection = pooled.connection
+        if not discard and not connection.closed:
+            status = connection.info.transaction_status
+            if status == extensions.TRANSACTION_STATUS_UNKNOWN:
+                discard = True
+            elif status != extensions.TRANSACTION_STATUS_IDLE:
+                try:
+                    connection.rollback()
+                except psycopg2.Error:
+                    discard = True
+        with self._condition:
+            if discard or connection.closed:
+                self._discard(pooled)
+            else:
+                pooled.returned_at = time.monotonic()
+                self._idle.append(pooled)
+            self._condition.notify()
+    
+    def close(self):
+        """Close the idle connections"""
+        with self._condition:
+            while self._idle:
+                self._discard(self._idle.pop())
+    
+    def _open(self):
+        # The caller reserved a slot in _size
+        try:
+            pooled = PooledConnection(self.connect())
+        except Exception:
+            with self._condition:
+                self._size -= 1
+                self._condition.notify()
+            raise
+        with self._condition:
+            self.stats.connections_created += 1
+        return pooled
+    
+    def _pop_idle(self):
+        # Called with the lock held
+        now = time.monotonic()
+        while self._idle:
+            pooled = self._idle.pop()
+            if not pooled.connection.closed and now - pooled.created_at < self.max_lifetime:
+                return pooled
+            self._discard(pooled)
+        return None
+    
+    def _reap_idle(self):
+        # Called with the lock held
+        now = time.monotonic()
+        while self._idle and self._size > self.min_size and now - self._idle[0].returned_at > self.max_idle:
+            self._discard(self._idle.popleft())
+    
+    def _discard(self, pooled):
+        # Called with the lock held
+        self._size -= 1
+        self.stats.connections_discarded += 1
+        try:
+            pooled.connection.close()
+        except psycopg2.Error:
+            pass
+    
+    def snapshot(self):
+        with self._condition:
+            idle = len(self._idle)
+            return {
+                'size': self._size,
+                'idle': idle,
+                'in_use': self._size - idle,
+                'min_size': self.min_size,
+                'max_size': self.max_size,
+                'checkouts': self.stats.checkouts,
+                'waits': self.stats.waits,
+                'wait_seconds': round(self.stats.wait_seconds, 3),
+                'timeouts': self.stats.timeouts,
+                'connections_created': self.stats.connections_created,
+                'connections_discarded': self.stats.connections_discarded,
+            }
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+_pools_pid = os.getpid()
+
+
+def get_pool(key, factory):
+    """The process's pool for `key` (database alias, name), created with factory() on first use"""
+    global _pools_pid
+    with _pools_lock:
+        if _pools_pid != os.getpid():
+            # Forked worker: the parent's sockets are not ours to use
+            _pools.clear()
+            _pools_pid = os.getpid()
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = factory()
+    return pool
+
+
+def close_pools():
+    """Close the idle connections of every pool"""
+    with _pools_lock:
+        pools = list(_pools.values())
+    for pool in pools:
+        pool.close()
+
+
+def pool_stats():
+    """{database alias: pool snapshot} of the pools opened by this process"""
+    with _pools_lock:
+        pools = dict(_pools)
+    return {alias: pool.snapshot() for (alias, _name), pool in pools.items()}
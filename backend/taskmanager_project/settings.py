@@ -4,7 +4,7 @@ Django settings for taskmanager_project project.
 
 import os
 from pathlib import Path
-from decouple import config
+from decouple import Csv, config
 from datetime import timedelta
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -74,17 +74,49 @@ TEMPLATES = [
 WSGI_APPLICATION = 'taskmanager_project.wsgi.application'
 
 # Database
+# Connections persist for DB_CONN_MAX_AGE seconds (0 closes them after each request) and are checked
+# before reuse. With DB_POOL (recommended under ASGI) each process shares a pool of connections per
+# database instead (taskmanager_project.pooled_postgresql); connections go back to it after each request.
+DB_POOL = config('DB_POOL', default=False, cast=bool)
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.postgresql',
+        'ENGINE': 'taskmanager_project.pooled_postgresql' if DB_POOL else 'django.db.backends.postgresql',
         'NAME': config('DB_NAME', default='taskmanager_db'),
         'USER': config('DB_USER', default='postgres'),
         'PASSWORD': config('DB_PASSWORD', default='password'),
         'HOST': config('DB_HOST', default='localhost'),
         'PORT': config('DB_PORT', default='5432'),
+        'CONN_MAX_AGE': 0 if DB_POOL else config('DB_CONN_MAX_AGE', default=60, cast=int),
+        'CONN_HEALTH_CHECKS': config('DB_CONN_HEALTH_CHECKS', default=True, cast=bool),
+        'POOL': {
+            'min_size': config('DB_POOL_MIN_SIZE', default=2, cast=int),
+            'max_size': config('DB_POOL_MAX_SIZE', default=20, cast=int),
+            # Seconds a request waits for a connection when all are in use
+            'timeout': config('DB_POOL_TIMEOUT', default=10.0, cast=float),
+            'max_idle': config('DB_POOL_MAX_IDLE', default=300.0, cast=float),
+            'max_lifetime': config('DB_POOL_MAX_LIFETIME', default=1800.0, cast=float),
+        },
     }
 }
 
+# Read replicas (host or host:port, comma separated) with the primary's name and credentials;
+# views decorated with taskmanager_project.db_routers.replica_reads read from them
+for _index, _host in enumerate(config('DB_REPLICA_HOSTS', default='', cast=Csv()), start=1):
+    _host, _, _port = _host.partition(':')
+    DATABASES[f'replica{_index}'] = {
+        **DATABASES['default'],
+        'HOST': _host,
+        'PORT': _port or DATABASES['default']['PORT'],
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['taskmanager_project.db_routers.ReplicaRouter']
+# Seconds a user's reads stay on the primary after they write (keep above DB_REPLICA_MAX_LAG)
+DB_REPLICA_PIN_SECONDS = config('DB_REPLICA_PIN_SECONDS', default=5, cast=int)
+# Replicas lagging more than this many seconds get no reads; lag is rechecked every interval seconds
+DB_REPLICA_MAX_LAG = config('DB_REPLICA_MAX_LAG', default=2.0, cast=float)
+DB_REPLICA_LAG_CHECK_INTERVAL = config('DB_REPLICA_LAG_CHECK_INTERVAL', default=1.0, cast=float)
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -125,6 +157,15 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'taskmanager_project.fastjson.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'taskmanager_project.fastjson.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
     'DEFAULT_FILTER_BACKENDS': [
@@ -134,6 +175,36 @@ REST_FRAMEWORK = {
     ],
 }
 
+# Task API limits
+TASK_BULK_MAX_ITEMS = config('TASK_BULK_MAX_ITEMS', default=5000, cast=int)
+# Rows fetched per server-side cursor round trip when exporting tasks
+TASK_EXPORT_CHUNK_SIZE = config('TASK_EXPORT_CHUNK_SIZE', default=2000, cast=int)
+# Streaming task import: rows per insert batch and row errors kept in the report
+TASK_IMPORT_BATCH_SIZE = config('TASK_IMPORT_BATCH_SIZE', default=5000, cast=int)
+TASK_IMPORT_MAX_ERRORS = config('TASK_IMPORT_MAX_ERRORS', default=1000, cast=int)
+# Most tasks (and deleted task ids) per delta sync page of /api/tasks/changes/
+TASK_SYNC_PAGE_SIZE = config('TASK_SYNC_PAGE_SIZE', default=1000, cast=int)
+# Seconds a task list/stats ETag stays valid when nothing changed (time-dependent fields)
+TASK_CONDITIONAL_WINDOW = config('TASK_CONDITIONAL_WINDOW', default=60, cast=int)
+# Longest from/to range (in days) of the task calendar endpoint
+TASK_CALENDAR_MAX_DAYS = config('TASK_CALENDAR_MAX_DAYS', default=731, cast=int)
+# Longest from/to range (in days) of the task analytics endpoint
+TASK_ANALYTICS_MAX_DAYS = config('TASK_ANALYTICS_MAX_DAYS', default=1830, cast=int)
+# Days deleted-task tombstones are kept for delta sync clients
+TASK_TOMBSTONE_RETENTION_DAYS = config('TASK_TOMBSTONE_RETENTION_DAYS', default=30, cast=int)
+# archive_tasks: days a completed/cancelled task stays untouched before it is archived, and tasks moved per transaction
+TASK_ARCHIVE_AFTER_DAYS = config('TASK_ARCHIVE_AFTER_DAYS', default=365, cast=int)
+TASK_ARCHIVE_BATCH_SIZE = config('TASK_ARCHIVE_BATCH_SIZE', default=1000, cast=int)
+# PostgreSQL: partition the task table by created_at month (tasks_api.partitioning), creating partitions this many months ahead
+TASK_PARTITIONING = config('TASK_PARTITIONING', default=False, cast=bool)
+TASK_PARTITION_MONTHS_AHEAD = config('TASK_PARTITION_MONTHS_AHEAD', default=3, cast=int)
+
+# Task change event streams (/api/tasks/events/, served under ASGI)
+TASK_EVENTS_BROKER = config('TASK_EVENTS_BROKER', default='tasks_api.events.InProcessBroker')
+TASK_EVENTS_QUEUE_SIZE = config('TASK_EVENTS_QUEUE_SIZE', default=100, cast=int)
+TASK_EVENTS_HEARTBEAT = config('TASK_EVENTS_HEARTBEAT', default=15, cast=int)
+TASK_EVENTS_MAX_AGE = config('TASK_EVENTS_MAX_AGE', default=300, cast=int)
+
 # Simple JWT
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=60),
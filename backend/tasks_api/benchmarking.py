@@ -0,0 +1,57 @@
+"""
+Helpers for the benchmark management commands.
+"""
+
+import random
+import statistics
+import time
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.utils import timezone
+
+from . import tracking
+from .models import Task, TaskCounter
+
+
+def seed_user(count, due_days=60):
+    """
+    A new user with `count` random tasks, due within `due_days` days before
+    or after now (a third without a due date), and a matching counter row.
+    """
+    user = User.objects.create_user(f'benchmark-{time.time_ns()}')
+    now = timezone.now()
+    tasks = [
+        Task(
+            user=user,
+            title=f'Benchmark task {n}',
+            description='Benchmark task description' if n % 2 else '',
+            status=random.choice(Task.STATUS_CHOICES)[0],
+            priority=random.choice(Task.PRIORITY_CHOICES)[0],
+            category=random.choice(Task.CATEGORY_CHOICES)[0],
+            due_date=now + timedelta(days=random.randint(-due_days, due_days), minutes=random.randint(0, 1439))
+            if n % 3 else None,
+        )
+        for n in range(count)
+    ]
+    for task in tasks:
+        task.set_derived_fields(now)
+    with tracking.bulk_tracking():
+        Task.objects.bulk_create(tasks, batch_size=5000)
+    TaskCounter.objects.filter(user=user).update(**TaskCounter.compute_for(user.id))
+    return user
+
+
+def time_runs(run, repeat):
+    """Milliseconds per call of run() over `repeat` calls, after one warm-up call"""
+    run()
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run()
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def summary(timings):
+    return f'median {statistics.median(timings):.2f} ms, max {max(timings):.2f} ms over {len(timings)} runs'
@@ -0,0 +1,54 @@
+"""
+Conditional GET support (ETag / Last-Modified) for task endpoints.
+
+Validators are derived from the user's TaskCounter row (change version and
+last write time), so a revalidation costs one primary-key read and a 304
+is returned before any task query or serialization runs. Responses that
+depend on the current time (is_overdue, days_until_due, overdue and due
+counters) are additionally keyed on a time window of
+TASK_CONDITIONAL_WINDOW seconds.
+"""
+
+from datetime import datetime, timezone as dt_timezone
+from functools import wraps
+
+from django.conf import settings
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+
+
+def get_validators(request, counter):
+    """Return (etag, last_modified timestamp) for the user's task data"""
+    window = settings.TASK_CONDITIONAL_WINDOW
+    now = int(datetime.now(dt_timezone.utc).timestamp())
+    window_start = now - now % window
+    renderer = getattr(request, 'accepted_renderer', None)
+    etag = '"{}-{}-{}-{}"'.format(
+        counter.user_id, counter.version, window_start, getattr(renderer, 'format', '')
+    )
+    last_modified = max(int(counter.updated_at.timestamp()), window_start)
+    return etag, last_modified
+
+
+def conditional_task_view(view_method):
+    """
+    Answer GET/HEAD requests with 304 Not Modified when the client's
+    validators match, and add ETag/Last-Modified to fresh responses.
+    """
+    @wraps(view_method)
+    def wrapper(self, request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            return view_method(self, request, *args, **kwargs)
+        
+        counter = self.get_task_counter()
+        etag, last_modified = get_validators(request, counter)
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = view_method(self, request, *args, **kwargs)
+            if response.status_code == 200:
+                response['ETag'] = etag
+                response['Last-Modified'] = http_date(last_modified)
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+    
+    return wrapper
@@ -0,0 +1,109 @@
+"""
+Real-time task change events.
+
+Task writes publish a small event per user once their transaction commits.
+A broker fans them out to the user's open Server-Sent Events streams. The
+default InProcessBroker works within a single process; multi-node setups
+point TASK_EVENTS_BROKER at a broker class that relays events between
+nodes (e.g. over Redis pub/sub) and fans them out locally the same way.
+"""
+
+import asyncio
+import threading
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+
+class Subscription:
+    """
+    One open event stream: a bounded queue living on the stream's event loop.
+
+    When a slow client lets the queue fill up, pending events are dropped
+    and replaced by a single `overflow` event telling the client to catch
+    up through the delta sync endpoint, so memory per stream stays bounded.
+    """
+
+    def __init__(self, user_id, loop, max_queue):
+        self.user_id = user_id
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=max_queue)
+
+    def push(self, event):
+        """Enqueue an event; must run on the subscription's loop"""
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait({'event': 'overflow', 'token': event.get('token')})
+
+    async def get(self, timeout):
+        """Next event, or None when nothing arrived within `timeout` seconds"""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class InProcessBroker:
+    """
+    Fan-out hub for the streams held by this process.
+
+    publish() may be called from any thread (request threads publish after
+    commit); delivery is handed to each stream's event loop.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscriptions = {}
+
+    def subscribe(self, user_id):
+        subscription = Subscription(user_id, asyncio.get_running_loop(), settings.TASK_EVENTS_QUEUE_SIZE)
+        with self._lock:
+            self._subscriptions.setdefault(user_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.user_id)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions[subscription.user_id]
+
+    def publish(self, user_id, event):
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(user_id, ()))
+        for subscription in subscriptions:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.push, event)
+            except RuntimeError:
+                # The stream's loop has shut down
+                self.unsubscribe(subscription)
+
+    def stats(self):
+        """Open stream counts, for monitoring"""
+        with self._lock:
+            return {
+                'users': len(self._subscriptions),
+                'streams': sum(len(subscriptions) for subscriptions in self._subscriptions.values()),
+            }
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    """The process-wide broker configured by TASK_EVENTS_BROKER"""
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                _broker = import_string(settings.TASK_EVENTS_BROKER)()
+    return _broker
+
+
+def publish_task_event(user_id, event):
+    get_broker().publish(user_id, event)
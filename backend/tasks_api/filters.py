@@ -0,0 +1,132 @@
+"""
+Task filter backends.
+"""
+
+import re
+from datetime import timedelta
+
+from django.db import connections
+from django.db.models import F, Q
+from django.db.models.expressions import RawSQL
+from django.utils import timezone
+from django_filters import rest_framework as django_filters
+from rest_framework import filters
+
+from .models import ArchivedTask, Task
+from .pagination import TaskKeysetPagination
+
+
+class TaskFilterSet(django_filters.FilterSet):
+    """
+    Task list filters.
+    
+    `is_overdue` and `due_within_days` mirror the Task.is_overdue and
+    Task.days_until_due properties, but are translated into range predicates
+    on due_date, so the (user, due_date) index narrows the rows instead of
+    every task of the user being evaluated.
+    """
+    is_overdue = django_filters.BooleanFilter(method='filter_is_overdue')
+    due_within_days = django_filters.NumberFilter(
+        method='filter_due_within_days', min_value=0, max_value=36500, decimal_places=0
+    )
+    # Creation time range; with a partitioned task table only the months in range are scanned
+    created_after = django_filters.IsoDateTimeFilter(field_name='created_at', lookup_expr='gte')
+    created_before = django_filters.IsoDateTimeFilter(field_name='created_at', lookup_expr='lt')
+    
+    class Meta:
+        model = Task
+        fields = ['status', 'priority', 'category']
+    
+    def filter_is_overdue(self, queryset, name, value):
+        overdue = Q(due_date__lt=timezone.now()) & ~Q(status='completed')
+        return queryset.filter(overdue if value else ~overdue | Q(due_date__isnull=True))
+    
+    def filter_due_within_days(self, queryset, name, value):
+        # 0 <= days_until_due <= value; days_until_due rounds down to whole days
+        now = timezone.now()
+        return queryset.filter(due_date__gte=now, due_date__lt=now + timedelta(days=int(value) + 1))
+
+
+class ArchivedTaskFilterSet(TaskFilterSet):
+    """The task list filters, applied to archived tasks"""
+    
+    class Meta(TaskFilterSet.Meta):
+        model = ArchivedTask
+
+
+class TaskFilterBackend(django_filters.DjangoFilterBackend):
+    """
+    Applies the view's filterset, or ArchivedTaskFilterSet to archived task
+    querysets, so `?include_archived=true` listings filter both tables alike.
+    """
+    
+    def get_filterset_class(self, view, queryset=None):
+        if queryset is not None and queryset.model is ArchivedTask:
+            return ArchivedTaskFilterSet
+        return super().get_filterset_class(view, queryset)
+
+
+class TaskSearchFilter(filters.SearchFilter):
+    """
+    Full-text search over title and description.
+    
+    On PostgreSQL the `search_vector` column (generated from title and
+    description, GIN indexed) is matched against a prefix tsquery built from
+    the search terms and results carry a `search_rank` annotation. Other
+    databases fall back to the regular icontains search.
+    """
+    search_vector_column = 'search_vector'
+    search_config = 'simple'
+    word_re = re.compile(r'\w+')
+    
+    def get_tsquery(self, terms):
+        """Raw tsquery matching every word of the terms as a prefix"""
+        words = [word for term in terms for word in self.word_re.findall(term)]
+        return ' & '.join(f"'{word}':*" for word in words)
+    
+    def filter_queryset(self, request, queryset, view):
+        if connections[queryset.db].vendor != 'postgresql':
+            return super().filter_queryset(request, queryset, view)
+        
+        tsquery = self.get_tsquery(self.get_search_terms(request))
+        if not tsquery:
+            return super().filter_queryset(request, queryset, view)
+        
+        from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVectorField
+        
+        query = SearchQuery(tsquery, config=self.search_config, search_type='raw')
+        column = f'{queryset.model._meta.db_table}.{self.search_vector_column}'
+        return queryset.alias(
+            search_document=RawSQL(column, [], output_field=SearchVectorField())
+        ).filter(
+            search_document=query
+        ).annotate(
+            search_rank=SearchRank(F('search_document'), query)
+        )
+
+
+class TaskOrderingFilter(filters.OrderingFilter):
+    """
+    Ordering filter that ranks full-text search results by relevance when
+    no explicit ordering is requested, and maps fields to the column they
+    sort by (days_until_due like due_date, priority by its urgency rank).
+    """
+    ordering_aliases = {
+        'days_until_due': 'due_date',
+        'priority': 'priority_rank',
+    }
+    
+    def get_ordering(self, request, queryset, view):
+        ranked = 'search_rank' in queryset.query.annotations
+        if ranked and not request.query_params.get(self.ordering_param) \
+                and not TaskKeysetPagination.is_requested(request):
+            return ['-search_rank', '-created_at']
+        ordering = super().get_ordering(request, queryset, view)
+        if ordering is None:
+            return None
+        return [self.resolve_alias(field) for field in ordering]
+    
+    def resolve_alias(self, field):
+        prefix = '-' if field.startswith('-') else ''
+        name = field.lstrip('-')
+        return prefix + self.ordering_aliases.get(name, name)
@@ -0,0 +1,159 @@
+"""
+Streaming bulk import of tasks from CSV or NDJSON.
+"""
+
+import csv
+import io
+import json
+import re
+import time
+
+from django.conf import settings
+from django.db import connection, transaction
+from rest_framework.exceptions import ValidationError
+
+from .models import Task, TaskCounter
+from .serializers import TaskCreateSerializer
+from . import tracking
+
+
+IMPORT_FORMATS = ('csv', 'ndjson')
+
+
+# Bytes that are not UTF-8, as decoded by open_text
+UNDECODABLE_RE = re.compile('[\udc80-\udcff]')
+
+
+def open_text(binary_stream):
+    """
+    Text stream over an uploaded or opened file. Bytes that are not UTF-8
+    are kept as surrogates instead of failing the read, so only the rows
+    holding them are rejected.
+    """
+    return io.TextIOWrapper(binary_stream, encoding='utf-8-sig', errors='surrogateescape', newline='')
+
+
+def text_error(row):
+    """Why a row's text cannot be stored, or None"""
+    for value in row.values():
+        if not isinstance(value, str):
+            continue
+        if UNDECODABLE_RE.search(value):
+            return 'Satır geçerli UTF-8 metni değil.'
+        if '\x00' in value:
+            return 'Satır NUL karakteri içeriyor.'
+    return None
+
+
+def read_rows(stream, file_format):
+    """
+    Yield (row number, row dict) pairs from a text stream, one at a time.
+    """
+    if file_format == 'csv':
+        for number, row in enumerate(csv.DictReader(stream), start=1):
+            # Empty cells fall back to the field defaults
+            yield number, {key: value for key, value in row.items() if key and value != ''}
+        return
+    
+    for number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            row = None
+        yield number, row if isinstance(row, dict) else None
+
+
+class TaskImporter:
+    """
+    Validate rows with TaskCreateSerializer and insert them in batches
+    (COPY on PostgreSQL, bulk_create elsewhere). Only one batch is held in
+    memory and at most TASK_IMPORT_MAX_ERRORS row errors are kept, so memory
+    use does not grow with the size of the input.
+    """
+    
+    def __init__(self, user, batch_size=None):
+        self.user = user
+        self.batch_size = batch_size or settings.TASK_IMPORT_BATCH_SIZE
+        self.imported = 0
+        self.failed = 0
+        self.errors = []
+    
+    def run(self, stream, file_format):
+        started = time.monotonic()
+        batch = []
+        error = None
+        # One serializer validates every row, so its fields are built only once
+        serializer = TaskCreateSerializer()
+        number = 0
+        try:
+            for number, row in read_rows(stream, file_format):
+                if row is None:
+                    self.add_error(number, {'non_field_errors': ['Satır geçerli bir JSON nesnesi değil.']})
+                    continue
+                row_error = text_error(row)
+                if row_error is not None:
+                    self.add_error(number, {'non_field_errors': [row_error]})
+                    continue
+                try:
+                    validated_data = serializer.run_validation(row)
+                except ValidationError as exc:
+                    self.add_error(number, exc.detail)
+                    continue
+                batch.append(Task(user=self.user, **validated_data))
+                if len(batch) >= self.batch_size:
+                    self.insert(batch)
+                    batch = []
+        except csv.Error as exc:
+            # The file structure cannot be trusted past this point; the valid rows before it are kept
+            error = f'Row {number + 1} is not valid CSV ({exc}); the rows after it were not read'
+        if batch:
+            self.insert(batch)
+        
+        elapsed = time.monotonic() - started
+        result = {
+            'imported': self.imported,
+            'failed': self.failed,
+            'errors': self.errors,
+            'rows_per_second': round((self.imported + self.failed) / elapsed) if elapsed > 0 else None,
+        }
+        if error is not None:
+            result['error'] = error
+        return result
+    
+    def add_error(self, number, errors):
+        self.failed += 1
+        if len(self.errors) < settings.TASK_IMPORT_MAX_ERRORS:
+            self.errors.append({'row': number, 'errors': errors})
+    
+    def insert(self, tasks):
+        with transaction.atomic(), tracking.bulk_tracking():
+            seq = TaskCounter.next_change_seq(self.user.id)
+            for task in tasks:
+                task.change_seq = seq
+                task.set_derived_fields()
+            if connection.vendor == 'postgresql':
+                self.copy(tasks)
+            else:
+                Task.objects.bulk_create(tasks, batch_size=1000)
+            tracking.track_created(self.user.id, [tracking.task_state(task) for task in tasks], seq)
+        self.imported += len(tasks)
+    
+    def copy(self, tasks):
+        """Insert tasks with COPY ... FROM STDIN in CSV format"""
+        fields = [field for field in Task._meta.concrete_fields if not field.primary_key]
+        buffer = io.StringIO()
+        for task in tasks:
+            values = []
+            for field in fields:
+                value = field.get_db_prep_save(field.pre_save(task, add=True), connection)
+                # Unquoted empty cells are NULL, quoted ones are values
+                values.append('' if value is None else '"' + str(value).replace('"', '""') + '"')
+            buffer.write(','.join(values) + '\n')
+        buffer.seek(0)
+        
+        columns = ', '.join(connection.ops.quote_name(field.column) for field in fields)
+        table = connection.ops.quote_name(Task._meta.db_table)
+        with connection.cursor() as cursor:
+            cursor.cursor.copy_expert(f'COPY {table} ({columns}) FROM STDIN WITH (FORMAT csv)', buffer)
@@ -0,0 +1,80 @@
+"""
+Move old completed and cancelled tasks to the archive table.
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from tasks_api import tracking
+from tasks_api.models import ArchivedTask, Task, TaskCounter
+
+
+class Command(BaseCommand):
+    help = ('Move completed/cancelled tasks not updated for TASK_ARCHIVE_AFTER_DAYS into ArchivedTask, '
+            'one chunk per transaction (safe to interrupt and re-run)')
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=settings.TASK_ARCHIVE_AFTER_DAYS,
+                            help='Archive tasks last updated more than this many days ago')
+        parser.add_argument('--batch-size', type=int, default=settings.TASK_ARCHIVE_BATCH_SIZE,
+                            help='Tasks moved per transaction')
+        parser.add_argument('--user', action='append', dest='users', default=[],
+                            help='Username to process (repeatable); defaults to all users')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Report how many tasks would be archived without moving them')
+    
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options['days'])
+        candidates = Task.objects.filter(status__in=ArchivedTask.ARCHIVABLE_STATUSES, updated_at__lt=cutoff).order_by()
+        users = User.objects.order_by('id')
+        if options['users']:
+            users = users.filter(username__in=options['users'])
+            candidates = candidates.filter(user_id__in=users.values('id'))
+        
+        pending = dict(candidates.values_list('user_id').annotate(count=Count('id')))
+        users = users.filter(id__in=list(pending)).values_list('id', 'username')
+        
+        archived = 0
+        for user_id, username in users.iterator():
+            if options['dry_run']:
+                self.stdout.write(f'{username}: {pending[user_id]} tasks to archive')
+                archived += pending[user_id]
+                continue
+            
+            moved = 0
+            while True:
+                count = self.archive_chunk(candidates.filter(user_id=user_id), user_id, options['batch_size'])
+                moved += count
+                if count < options['batch_size']:
+                    break
+            self.stdout.write(f'{username}: archived {moved} tasks')
+            archived += moved
+        
+        action = 'Would archive' if options['dry_run'] else 'Archived'
+        self.stdout.write(self.style.SUCCESS(f'{action} {archived} tasks for {len(pending)} users'))
+    
+    def archive_chunk(self, queryset, user_id, batch_size):
+        """
+        Move up to `batch_size` of a user's tasks in one transaction, so an
+        interrupted run leaves every task either live or archived.
+        """
+        with transaction.atomic(), tracking.bulk_tracking():
+            # Lock the counter row so the user's writes queue behind the move
+            seq = TaskCounter.next_change_seq(user_id)
+            rows = list(
+                queryset.order_by('id').select_for_update().values(*ArchivedTask.copied_fields())[:batch_size]
+            )
+            if not rows:
+                return 0
+            now = timezone.now()
+            ArchivedTask.objects.bulk_create([ArchivedTask.from_task(row, now) for row in rows], batch_size=1000)
+            task_ids = [row['id'] for row in rows]
+            Task.objects.filter(id__in=task_ids).delete()
+            tracking.track_archived(user_id, task_ids, seq)
+        return len(rows)
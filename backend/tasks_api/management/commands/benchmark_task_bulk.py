@@ -0,0 +1,59 @@
+"""
+Compare creating tasks with one bulk request against one POST /api/tasks/ per task.
+"""
+
+import statistics
+
+from django.core.management.base import BaseCommand
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from tasks_api.benchmarking import seed_user, summary, time_runs
+from tasks_api.views import TaskViewSet
+
+
+class Command(BaseCommand):
+    help = (
+        'Time creating N tasks with one POST /api/tasks/bulk/ against N POST /api/tasks/ calls, '
+        'through the views in-process (no HTTP or network round trips, which only widen the gap). '
+        'Requests commit as they would in production; the benchmark user is deleted afterwards'
+    )
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 1000], help='Tasks created per run')
+        parser.add_argument('--repeat', type=int, default=5, help='Timed runs per variant')
+    
+    def handle(self, *args, **options):
+        user = seed_user(0)
+        create_view = TaskViewSet.as_view({'post': 'create'})
+        bulk_view = TaskViewSet.as_view({'post': 'bulk'})
+        factory = APIRequestFactory()
+        
+        def post(view, url, data):
+            request = factory.post(url, data, format='json')
+            force_authenticate(request, user=user)
+            response = view(request)
+            assert response.status_code in (200, 201), response.data
+        
+        try:
+            for size in options['sizes']:
+                items = [{'title': f'task {n}', 'priority': 'high' if n % 4 == 0 else 'medium'} for n in range(size)]
+                
+                def single():
+                    for item in items:
+                        post(create_view, '/api/tasks/', item)
+                
+                def bulk():
+                    post(bulk_view, '/api/tasks/bulk/', {'create': items})
+                
+                single_timings = time_runs(single, options['repeat'])
+                bulk_timings = time_runs(bulk, options['repeat'])
+                single_rate = size / statistics.median(single_timings) * 1000
+                bulk_rate = size / statistics.median(bulk_timings) * 1000
+                self.stdout.write(f'{size} tasks:')
+                self.stdout.write(f'  {size} x POST /api/tasks/: {summary(single_timings)} ({single_rate:.0f} tasks/s)')
+                self.stdout.write(
+                    f'  POST /api/tasks/bulk/: {summary(bulk_timings)} '
+                    f'({bulk_rate:.0f} tasks/s, {bulk_rate / single_rate:.1f}x)'
+                )
+        finally:
+            user.delete()
@@ -0,0 +1,81 @@
+"""
+Compare the grouped calendar query with fetching the tasks and bucketing them in Python.
+"""
+
+import statistics
+import zoneinfo
+from collections import Counter
+from datetime import date, datetime, time, timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from tasks_api.benchmarking import seed_user, summary, time_runs
+from tasks_api.models import Task
+from tasks_api.views import TaskViewSet
+
+
+class Command(BaseCommand):
+    help = (
+        'Time GET /api/tasks/calendar/ against fetching every task in range and bucketing it in Python '
+        '(what the calendar page did before), on a seeded user with due dates spread over two years '
+        'that is rolled back afterwards'
+    )
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--tasks', type=int, default=100000, help='Tasks to seed for the benchmark user')
+        parser.add_argument('--repeat', type=int, default=10, help='Timed runs per variant')
+        parser.add_argument('--tz', default='America/New_York', help='Timezone days are cut in')
+    
+    def handle(self, *args, **options):
+        tz = zoneinfo.ZoneInfo(options['tz'])
+        today = timezone.localdate(timezone=tz)
+        month_start = today.replace(day=1)
+        ranges = [
+            ('one month by day', month_start, (month_start + timedelta(days=31)).replace(day=1) - timedelta(days=1), 'day'),
+            ('two years by week', today - timedelta(days=365), today + timedelta(days=365), 'week'),
+            ('two years by day', today - timedelta(days=365), today + timedelta(days=365), 'day'),
+        ]
+        with transaction.atomic():
+            user = seed_user(options['tasks'], due_days=365)
+            self.stdout.write(f"Seeded {options['tasks']} tasks due over two years")
+            calendar_view = TaskViewSet.as_view({'get': 'calendar'})
+            
+            for label, start, end, bucket in ranges:
+                def grouped():
+                    request = APIRequestFactory().get('/api/tasks/calendar/', {
+                        'from': start.isoformat(), 'to': end.isoformat(), 'bucket': bucket, 'tz': options['tz'],
+                    })
+                    force_authenticate(request, user=user)
+                    response = calendar_view(request)
+                    assert response.status_code == 200, response.data
+                    return {entry['date']: entry['total'] for entry in response.data['buckets']}
+                
+                def in_python():
+                    return self.bucket_in_python(user, start, end, bucket, tz)
+                
+                assert grouped() == in_python(), 'calendar counts differ from Python-side bucketing'
+                grouped_timings = time_runs(grouped, options['repeat'])
+                python_timings = time_runs(in_python, options['repeat'])
+                speedup = statistics.median(python_timings) / statistics.median(grouped_timings)
+                self.stdout.write(f'{label}:')
+                self.stdout.write(f'  calendar endpoint: {summary(grouped_timings)}')
+                self.stdout.write(f'  fetch and bucket in Python: {summary(python_timings)} ({speedup:.1f}x)')
+            transaction.set_rollback(True)
+    
+    @staticmethod
+    def bucket_in_python(user, start, end, bucket, tz):
+        rows = Task.objects.filter(
+            user=user,
+            due_date__gte=datetime.combine(start, time.min, tzinfo=tz),
+            due_date__lt=datetime.combine(end + timedelta(days=1), time.min, tzinfo=tz),
+        ).values_list('due_date', 'status', 'priority')
+        counts = Counter()
+        for due_date, _status, _priority in rows:
+            day = due_date.astimezone(tz).date()
+            if bucket == 'week':
+                day -= timedelta(days=day.weekday())
+            counts[day] += 1
+        return dict(counts)
@@ -0,0 +1,67 @@
+"""
+Compare the orjson-backed JSON renderer and parser with DRF's stdlib ones on task pages.
+"""
+
+import io
+import statistics
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from taskmanager_project.fastjson import FastJSONParser, FastJSONRenderer, orjson
+from tasks_api.benchmarking import seed_user, summary, time_runs
+from tasks_api.models import Task
+from tasks_api.serializers import TaskReadSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        'Time rendering and parsing task list payloads with JSONRenderer/JSONParser and '
+        'FastJSONRenderer/FastJSONParser, on a seeded user that is rolled back afterwards'
+    )
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=[20, 100, 1000], help='Tasks per payload')
+        parser.add_argument('--repeat', type=int, default=200, help='Timed runs per variant')
+    
+    def handle(self, *args, **options):
+        if orjson is None:
+            self.stdout.write(self.style.WARNING('orjson is not installed: the fast classes fall back to the stdlib'))
+        with transaction.atomic():
+            user = seed_user(max(options['sizes']))
+            rows = list(
+                Task.objects.filter(user=user).order_by('-created_at', '-id').values(*TaskReadSerializer.columns)
+            )
+            transaction.set_rollback(True)
+        context = {'encoding': 'utf-8'}
+        for size in options['sizes']:
+            # A list page as the API returns it
+            data = {
+                'count': len(rows), 'next': None, 'previous': None,
+                'results': TaskReadSerializer(rows[:size]).data,
+            }
+            body = JSONRenderer().render(data)
+            assert FastJSONRenderer().render(data) == body
+            self.stdout.write(f'{size} tasks ({len(body) / 1024:.1f} kB):')
+            self.compare(
+                'render',
+                lambda: JSONRenderer().render(data),
+                lambda: FastJSONRenderer().render(data),
+                options['repeat'],
+            )
+            self.compare(
+                'parse',
+                lambda: JSONParser().parse(io.BytesIO(body), parser_context=context),
+                lambda: FastJSONParser().parse(io.BytesIO(body), parser_context=context),
+                options['repeat'],
+            )
+    
+    def compare(self, label, stdlib, fast, repeat):
+        stdlib_timings = time_runs(stdlib, repeat)
+        fast_timings = time_runs(fast, repeat)
+        speedup = statistics.median(stdlib_timings) / statistics.median(fast_timings)
+        self.stdout.write(f'  {label}:')
+        self.stdout.write(f'    stdlib: {summary(stdlib_timings)}')
+        self.stdout.write(f'    orjson: {summary(fast_timings)} ({speedup:.1f}x)')
@@ -0,0 +1,88 @@
+"""
+Compare the full-text task search with the icontains search it replaced.
+"""
+
+import statistics
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from rest_framework import filters
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from tasks_api.benchmarking import seed_user, summary, time_runs
+from tasks_api.filters import TaskFilterBackend, TaskOrderingFilter
+from tasks_api.models import Task
+from tasks_api.views import TaskViewSet
+
+WORDS = (
+    'report', 'invoice', 'meeting', 'review', 'deploy', 'backup', 'client', 'budget', 'design', 'release',
+    'migration', 'dentist', 'groceries', 'payment', 'contract', 'training', 'survey', 'holiday', 'printer', 'server',
+)
+# Added to one task in RARE_EVERY
+RARE_WORD = 'quarterly'
+RARE_EVERY = 1000
+
+
+class IcontainsSearchViewSet(TaskViewSet):
+    """The task list with DRF's substring SearchFilter, as before full-text search"""
+    filter_backends = [TaskFilterBackend, filters.SearchFilter, TaskOrderingFilter]
+
+
+class Command(BaseCommand):
+    help = (
+        'Time GET /api/tasks/?search= pages with the full-text TaskSearchFilter against the icontains '
+        'SearchFilter, on a seeded user with random words in its tasks that is rolled back afterwards'
+    )
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--tasks', type=int, default=100000, help='Tasks to seed for the benchmark user')
+        parser.add_argument('--repeat', type=int, default=20, help='Timed runs per variant')
+        parser.add_argument('--terms', nargs='+', default=['report', RARE_WORD, 'rev', 'client budget'],
+                            help='Search terms to time')
+    
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError('Full-text task search requires PostgreSQL')
+        with transaction.atomic():
+            user = seed_user(options['tasks'])
+            self.add_words(user)
+            self.stdout.write(f"Seeded {options['tasks']} tasks")
+            views = {
+                'TaskSearchFilter': TaskViewSet.as_view({'get': 'list'}),
+                'icontains SearchFilter': IcontainsSearchViewSet.as_view({'get': 'list'}),
+            }
+            for term in options['terms']:
+                self.stdout.write(f'search={term!r}:')
+                timings = {}
+                for label, view in views.items():
+                    def run(view=view):
+                        request = APIRequestFactory().get('/api/tasks/', {'search': term})
+                        force_authenticate(request, user=user)
+                        response = view(request)
+                        assert response.status_code == 200, response.status_code
+                        return response.data['count']
+                    
+                    count = run()
+                    timings[label] = time_runs(run, options['repeat'])
+                    self.stdout.write(f'  {label}: {count} matches, {summary(timings[label])}')
+                fulltext, icontains = (statistics.median(timings[label]) for label in views)
+                self.stdout.write(f'  full-text search {icontains / fulltext:.1f}x faster')
+            transaction.set_rollback(True)
+    
+    @staticmethod
+    def add_words(user):
+        """Give the seeded tasks three random words in the title and two in the description"""
+        table = connection.ops.quote_name(Task._meta.db_table)
+        pick = f'words[1 + floor(random() * {len(WORDS)})::int]'
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"UPDATE {table} SET title = {pick} || ' ' || {pick} || ' ' || {pick}, "
+                f"description = CASE WHEN description = '' THEN '' ELSE {pick} || ' ' || {pick} END "
+                f"FROM (SELECT %s::text[] AS words) AS vocabulary WHERE user_id = %s",
+                [list(WORDS), user.id]
+            )
+            cursor.execute(
+                f"UPDATE {table} SET title = title || ' ' || %s WHERE user_id = %s AND id %% %s = 0",
+                [RARE_WORD, user.id, RARE_EVERY]
+            )
+            cursor.execute(f'ANALYZE {table}')
@@ -0,0 +1,57 @@
+"""
+Compare the model serializer with the values()-based read serializer for task lists.
+"""
+
+import statistics
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from taskmanager_project.fastjson import dumps
+from tasks_api.benchmarking import seed_user, summary, time_runs
+from tasks_api.models import Task
+from tasks_api.serializers import TaskReadSerializer, TaskSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        'Time fetching, serializing and rendering task pages with TaskSerializer (model instances) '
+        'and TaskReadSerializer (values rows), on a seeded user that is rolled back afterwards'
+    )
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=[20, 100, 1000], help='Rows per page')
+        parser.add_argument('--repeat', type=int, default=50, help='Timed runs per variant')
+    
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            user = seed_user(max(options['sizes']))
+            queryset = Task.objects.filter(user=user).order_by('-created_at', '-id')
+            for size in options['sizes']:
+                page = queryset[:size]
+                instances = list(page)
+                rows = list(page.values(*TaskReadSerializer.columns))
+                now = timezone.now()
+                self.stdout.write(f'{size} rows:')
+                self.compare(
+                    'query, serialize and render',
+                    lambda: dumps(TaskSerializer(list(page), many=True).data),
+                    lambda: dumps(TaskReadSerializer(list(page.values(*TaskReadSerializer.columns)), now=now).data),
+                    options['repeat'],
+                )
+                self.compare(
+                    'serialize and render only',
+                    lambda: dumps(TaskSerializer(instances, many=True).data),
+                    lambda: dumps(TaskReadSerializer(rows, now=now).data),
+                    options['repeat'],
+                )
+            transaction.set_rollback(True)
+    
+    def compare(self, label, model_serializer, read_serializer, repeat):
+        model_timings = time_runs(model_serializer, repeat)
+        read_timings = time_runs(read_serializer, repeat)
+        speedup = statistics.median(model_timings) / statistics.median(read_timings)
+        self.stdout.write(f'  {label}:')
+        self.stdout.write(f'    TaskSerializer: {summary(model_timings)}')
+        self.stdout.write(f'    TaskReadSerializer: {summary(read_timings)} ({speedup:.1f}x)')
@@ -0,0 +1,75 @@
+"""
+Compare the counter-backed task stats with live aggregation over the task rows.
+"""
+
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from tasks_api.benchmarking import seed_user, summary, time_runs
+from tasks_api.models import Task
+from tasks_api.views import TaskViewSet
+
+
+class Command(BaseCommand):
+    help = (
+        'Time GET /api/tasks/stats/ (counter row plus open-task due dates) against live aggregation '
+        'over every task of a user, on a seeded user that is rolled back afterwards'
+    )
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--tasks', type=int, default=100000, help='Tasks to seed for the benchmark user')
+        parser.add_argument('--repeat', type=int, default=20, help='Timed runs per variant')
+    
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            user = seed_user(options['tasks'])
+            self.stdout.write(f"Seeded {options['tasks']} tasks")
+            stats_view = TaskViewSet.as_view({'get': 'stats'})
+            
+            def counter_stats():
+                request = APIRequestFactory().get('/api/tasks/stats/')
+                force_authenticate(request, user=user)
+                response = stats_view(request)
+                assert response.status_code == 200, response.status_code
+            
+            self.report('counters', counter_stats, options['repeat'])
+            self.report('live aggregation', lambda: self.live_stats(user), options['repeat'])
+            
+            tasks = list(Task.objects.filter(user=user).order_by('?')[:options['repeat'] + 1])
+            
+            def save_with_counters():
+                task = tasks.pop()
+                task.status = 'completed' if task.status != 'completed' else 'pending'
+                task.save(update_fields=['status', 'updated_at'])
+            
+            self.report('status change (save)', save_with_counters, options['repeat'])
+            transaction.set_rollback(True)
+    
+    @staticmethod
+    def live_stats(user):
+        """The stats queries before counters: one conditional aggregate and one grouped breakdown"""
+        user_tasks = Task.objects.filter(user=user)
+        open_tasks = Q(status__in=['pending', 'in_progress'])
+        today = timezone.now().date()
+        week_start = today - timedelta(days=today.weekday())
+        user_tasks.aggregate(
+            total_tasks=Count('id'),
+            completed_tasks=Count('id', filter=Q(status='completed')),
+            pending_tasks=Count('id', filter=Q(status='pending')),
+            in_progress_tasks=Count('id', filter=Q(status='in_progress')),
+            cancelled_tasks=Count('id', filter=Q(status='cancelled')),
+            overdue_tasks=Count('id', filter=open_tasks & Q(due_date__lt=timezone.now())),
+            due_today=Count('id', filter=open_tasks & Q(due_date__date=today)),
+            due_this_week=Count(
+                'id', filter=open_tasks & Q(due_date__date__range=[week_start, week_start + timedelta(days=6)])
+            ),
+        )
+        list(user_tasks.order_by().values('category', 'priority').annotate(count=Count('id')))
+    
+    def report(self, label, run, repeat):
+        self.stdout.write(f'{label}: {summary(time_runs(run, repeat))}')
@@ -0,0 +1,42 @@
+"""
+Drop deleted-task tombstones past their retention window.
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from tasks_api.models import TaskCounter, TaskTombstone
+
+
+class Command(BaseCommand):
+    help = 'Delete task tombstones older than TASK_TOMBSTONE_RETENTION_DAYS and advance sync horizons'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=settings.TASK_TOMBSTONE_RETENTION_DAYS,
+                            help='Retention window in days')
+    
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options['days'])
+        horizons = TaskTombstone.objects.filter(deleted_at__lt=cutoff).values('user_id').annotate(
+            horizon=Max('change_seq')
+        ).order_by()
+        
+        users = removed = 0
+        for row in horizons.iterator():
+            with transaction.atomic():
+                # Sync tokens at or below the horizon can no longer see every deletion
+                TaskCounter.objects.filter(
+                    user_id=row['user_id'], sync_horizon__lt=row['horizon']
+                ).update(sync_horizon=row['horizon'])
+                deleted, _ = TaskTombstone.objects.filter(
+                    user_id=row['user_id'], change_seq__lte=row['horizon']
+                ).delete()
+            users += 1
+            removed += deleted
+        
+        self.stdout.write(self.style.SUCCESS(f'Removed {removed} tombstones for {users} users'))
@@ -0,0 +1,44 @@
+"""
+Import tasks for a user from a CSV or NDJSON file.
+"""
+
+import json
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks_api.importer import IMPORT_FORMATS, TaskImporter, open_text
+
+
+class Command(BaseCommand):
+    help = 'Stream tasks from a CSV or NDJSON file into a user account'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='File to import')
+        parser.add_argument('--user', required=True, help='Username that will own the tasks')
+        parser.add_argument('--format', dest='file_format', choices=IMPORT_FORMATS,
+                            help='Input format (defaults to the file extension)')
+        parser.add_argument('--batch-size', type=int, help='Rows per insert batch')
+    
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(username=options['user'])
+        except User.DoesNotExist:
+            raise CommandError(f"User '{options['user']}' does not exist")
+        
+        file_format = options['file_format'] or options['path'].rsplit('.', 1)[-1].lower()
+        if file_format not in IMPORT_FORMATS:
+            raise CommandError(f"Cannot tell the format of '{options['path']}', pass --format")
+        
+        with open(options['path'], 'rb') as stream:
+            result = TaskImporter(user, batch_size=options['batch_size']).run(open_text(stream), file_format)
+        
+        for error in result['errors']:
+            self.stderr.write(f"row {error['row']}: {json.dumps(error['errors'], ensure_ascii=False)}")
+        summary = (
+            f"Imported {result['imported']} tasks, {result['failed']} rows failed "
+            f"({result['rows_per_second']} rows/s)"
+        )
+        if 'error' in result:
+            raise CommandError(f"{result['error']}. {summary}")
+        self.stdout.write(self.style.SUCCESS(summary))
@@ -0,0 +1,162 @@
+"""
+Load test for the task event stream: many idle SSE connections on a running ASGI server.
+"""
+
+import asyncio
+import http.client
+import json
+import statistics
+import time
+from urllib.parse import urlsplit
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework_simplejwt.tokens import AccessToken
+
+
+def server_rss_kb(pid):
+    """Resident memory of a local process in kB (Linux), or None"""
+    if pid is None:
+        return None
+    try:
+        with open(f'/proc/{pid}/status') as status:
+            for line in status:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1])
+    except OSError:
+        return None
+    return None
+
+
+class EventStream:
+    """One SSE connection, recording when each `created` event arrives"""
+    
+    def __init__(self):
+        self.received = []
+        self.heartbeats = 0
+        self.error = None
+        self.reader = self.writer = None
+    
+    async def open(self, host, port, path):
+        self.reader, self.writer = await asyncio.open_connection(host, port)
+        self.writer.write(
+            f'GET {path} HTTP/1.1\r\nHost: {host}\r\nAccept: text/event-stream\r\n\r\n'.encode()
+        )
+        await self.writer.drain()
+        status_line = await self.reader.readline()
+        if b' 200 ' not in status_line:
+            raise ConnectionError(status_line.decode(errors='replace').strip())
+    
+    async def listen(self):
+        try:
+            while True:
+                line = await self.reader.readline()
+                if not line:
+                    break
+                if line.startswith(b'event: created'):
+                    self.received.append(time.perf_counter())
+                elif line.startswith(b': ping'):
+                    self.heartbeats += 1
+        except (ConnectionError, asyncio.CancelledError) as error:
+            self.error = error
+    
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+class Command(BaseCommand):
+    help = (
+        'Open many idle Server-Sent Events streams against a running ASGI server, then report '
+        'the server memory per stream and how fast one task write reaches every stream'
+    )
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://127.0.0.1:8000', help='Server base URL')
+        parser.add_argument('--user', required=True, help='Username whose task events are streamed')
+        parser.add_argument('--connections', type=int, default=500, help='Streams to open')
+        parser.add_argument('--duration', type=float, default=30, help='Seconds to keep the streams idle')
+        parser.add_argument('--server-pid', type=int,
+                            help='PID of a local server process, to sample its memory (Linux)')
+    
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(username=options['user'])
+        except User.DoesNotExist:
+            raise CommandError(f"User '{options['user']}' does not exist")
+        url = urlsplit(options['url'])
+        self.host, self.port = url.hostname, url.port or 80
+        self.token = str(AccessToken.for_user(user))
+        asyncio.run(self.run(options))
+    
+    async def run(self, options):
+        pid = options['server_pid']
+        rss_before = server_rss_kb(pid)
+        
+        streams = [EventStream() for _ in range(options['connections'])]
+        started = time.perf_counter()
+        path = f'/api/tasks/events/?token={self.token}'
+        results = await asyncio.gather(
+            *(stream.open(self.host, self.port, path) for stream in streams), return_exceptions=True
+        )
+        failed = [result for result in results if isinstance(result, Exception)]
+        streams = [stream for stream, result in zip(streams, results) if not isinstance(result, Exception)]
+        self.stdout.write(
+            f'Opened {len(streams)} streams in {time.perf_counter() - started:.2f}s, {len(failed)} failed'
+            + (f' (first error: {failed[0]!r})' if failed else '')
+        )
+        listeners = [asyncio.create_task(stream.listen()) for stream in streams]
+        
+        # Memory while idle: it should level off once the streams are open
+        samples = []
+        idle_until = time.perf_counter() + options['duration']
+        while time.perf_counter() < idle_until:
+            samples.append(server_rss_kb(pid))
+            await asyncio.sleep(min(1.0, max(idle_until - time.perf_counter(), 0)))
+        
+        # One write, fanned out to every stream
+        published = time.perf_counter()
+        created = await asyncio.to_thread(
+            self.api_post, '/api/tasks/bulk/', {'create': [{'title': 'Event load test'}]}
+        )
+        await asyncio.sleep(2)
+        latencies = sorted((stream.received[0] - published) * 1000 for stream in streams if stream.received)
+        
+        for stream in streams:
+            stream.close()
+        for listener in listeners:
+            listener.cancel()
+        await asyncio.gather(*listeners, return_exceptions=True)
+        task_ids = [item['id'] for item in created.get('create', []) if 'id' in item]
+        if task_ids:
+            await asyncio.to_thread(self.api_post, '/api/tasks/bulk/', {'delete': task_ids})
+        
+        if rss_before is not None and samples and samples[-1] is not None:
+            per_stream = (samples[-1] - rss_before) / len(streams) if streams else 0
+            self.stdout.write(
+                f'Server memory: {rss_before / 1024:.1f} MB before, {samples[0] / 1024:.1f} MB after opening, '
+                f'{samples[-1] / 1024:.1f} MB after {options["duration"]:.0f}s idle '
+                f'(~{per_stream:.1f} kB per stream)'
+            )
+        self.stdout.write(f'Heartbeats received: {sum(stream.heartbeats for stream in streams)}')
+        if latencies:
+            self.stdout.write(
+                f'Write delivered to {len(latencies)}/{len(streams)} streams: '
+                f'median {statistics.median(latencies):.1f} ms, max {latencies[-1]:.1f} ms'
+            )
+        else:
+            self.stdout.write('Write delivered to no stream')
+    
+    def api_post(self, path, data):
+        connection = http.client.HTTPConnection(self.host, self.port, timeout=30)
+        try:
+            connection.request('POST', path, body=json.dumps(data), headers={
+                'Authorization': f'Bearer {self.token}', 'Content-Type': 'application/json',
+            })
+            response = connection.getresponse()
+            body = response.read()
+            if response.status >= 400:
+                raise CommandError(f'POST {path} failed with {response.status}')
+            return json.loads(body or b'{}')
+        finally:
+            connection.close()
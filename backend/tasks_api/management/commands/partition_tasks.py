@@ -0,0 +1,113 @@
+"""
+Maintain the monthly partitions of the task table (PostgreSQL).
+"""
+
+from datetime import date
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from tasks_api import partitioning, tracking
+from tasks_api.models import ArchivedTask, TaskCounter
+
+
+class Command(BaseCommand):
+    help = ('Create the task table partitions for the coming TASK_PARTITION_MONTHS_AHEAD months; '
+            'optionally partition an existing table or archive old months by detaching their partitions')
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--months-ahead', type=int, default=settings.TASK_PARTITION_MONTHS_AHEAD,
+                            help='Months after the current one to create partitions for')
+        parser.add_argument('--convert', action='store_true',
+                            help='Partition the task table if it is not partitioned yet (copies every task)')
+        parser.add_argument('--archive-before', type=self.parse_month, metavar='YYYY-MM',
+                            help='Move the months before this one to the archive table and detach their partitions')
+        parser.add_argument('--keep-detached', action='store_true',
+                            help='Keep detached partitions as standalone tables instead of dropping them')
+        parser.add_argument('--list', action='store_true', help='List the monthly partitions')
+    
+    @staticmethod
+    def parse_month(value):
+        try:
+            return date.fromisoformat(f'{value}-01')
+        except ValueError:
+            raise CommandError(f"Invalid month '{value}', expected YYYY-MM")
+    
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError('Task table partitioning requires PostgreSQL')
+        if not settings.TASK_PARTITIONING:
+            raise CommandError('Task table partitioning is disabled (TASK_PARTITIONING)')
+        
+        if not partitioning.is_partitioned(connection):
+            if not options['convert']:
+                raise CommandError('The task table is not partitioned yet; run with --convert to partition it')
+            with transaction.atomic():
+                partitioning.partition_table(connection, options['months_ahead'])
+            self.stdout.write('Partitioned the task table')
+        
+        current = partitioning.month_start(date.today())
+        with transaction.atomic():
+            created = partitioning.create_partitions(
+                connection, current, partitioning.add_months(current, options['months_ahead'])
+            )
+        for name in created:
+            self.stdout.write(f'Created {name}')
+        
+        if options['archive_before']:
+            if options['archive_before'] > current:
+                raise CommandError('--archive-before cannot be later than the current month')
+            self.archive_months(options['archive_before'], drop=not options['keep_detached'])
+        
+        if options['list']:
+            for month, name in partitioning.partitions(connection).items():
+                self.stdout.write(f'{month:%Y-%m}  {name}')
+        
+        stray = partitioning.default_partition_rows(connection)
+        if stray:
+            self.stdout.write(self.style.WARNING(
+                f'{stray} tasks are in {partitioning.DEFAULT_PARTITION}: open tasks of archived months, '
+                f'and tasks of months without a partition yet, which move out when it is created'
+            ))
+        self.stdout.write(self.style.SUCCESS(f'Created {len(created)} partitions'))
+    
+    def archive_months(self, before, drop):
+        for month, name in partitioning.partitions(connection).items():
+            if month >= before:
+                break
+            archived, kept = self.archive_partition(name, drop)
+            message = f'{month:%Y-%m}: archived {archived} tasks and detached {name}'
+            if kept:
+                message += f', {kept} open tasks stay in {partitioning.DEFAULT_PARTITION}'
+            self.stdout.write(message)
+    
+    def archive_partition(self, name, drop):
+        """
+        Detach a month's partition and copy its tasks to the archive table in
+        one transaction. Tasks that are not completed or cancelled yet stay
+        live: they move back into the task table, where the DEFAULT partition
+        now covers their month. Returns the (archived, kept) task counts.
+        """
+        qn = connection.ops.quote_name
+        columns = [ArchivedTask._meta.get_field(field).column for field in ArchivedTask.copied_fields()]
+        column_list = ', '.join(qn(column) for column in columns)
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f'SELECT DISTINCT user_id FROM {qn(name)}')
+            user_ids = sorted(user_id for user_id, in cursor.fetchall())
+            # Take the users' counter locks first, in id order, like every task write
+            # does, so no write into the partition is in flight while it is moved
+            list(TaskCounter.objects.select_for_update().filter(user_id__in=user_ids).order_by('user_id').values_list('pk'))
+            partitioning.detach_partition(connection, name, drop=False)
+            kept = partitioning.restore_rows(
+                connection, name, 'status NOT IN %s', [ArchivedTask.ARCHIVABLE_STATUSES]
+            )
+            cursor.execute(
+                f'INSERT INTO {qn(ArchivedTask._meta.db_table)} ({column_list}, archived_at) '
+                f'SELECT {column_list}, now() FROM {qn(name)}'
+            )
+            archived = cursor.rowcount
+            tracking.track_partition_archived(user_ids)
+            if drop:
+                cursor.execute(f'DROP TABLE {qn(name)}')
+        return archived, kept
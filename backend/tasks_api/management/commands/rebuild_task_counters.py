@@ -0,0 +1,57 @@
+"""
+Rebuild or verify per-user task counters from Task rows.
+"""
+
+from django.core.management.base import BaseCommand
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import F
+
+from tasks_api.models import TaskCounter
+
+
+class Command(BaseCommand):
+    help = 'Rebuild (or, with --verify, only check) per-user TaskCounter rows from live and archived task rows'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--user', action='append', dest='users', default=[],
+                            help='Username to process (repeatable); defaults to all users')
+        parser.add_argument('--verify', action='store_true',
+                            help='Report drifted counters without changing them')
+    
+    def handle(self, *args, **options):
+        users = User.objects.order_by('id')
+        if options['users']:
+            users = users.filter(username__in=options['users'])
+        
+        columns = TaskCounter.counter_columns()
+        checked = drifted = 0
+        for user_id, username in users.values_list('id', 'username').iterator():
+            checked += 1
+            with transaction.atomic():
+                # Lock the counter row so concurrent writes queue behind the rebuild
+                counter = TaskCounter.objects.select_for_update().filter(user_id=user_id).first()
+                expected = TaskCounter.compute_for(user_id)
+                current = {column: getattr(counter, column) for column in columns} if counter else None
+                if current == expected:
+                    continue
+                
+                drifted += 1
+                if current is None:
+                    self.stdout.write(f'{username}: counter row missing')
+                else:
+                    diff = ', '.join(
+                        f'{column} {current[column]} -> {expected[column]}'
+                        for column in columns if current[column] != expected[column]
+                    )
+                    self.stdout.write(f'{username}: {diff}')
+                
+                if not options['verify']:
+                    if counter is None:
+                        TaskCounter.objects.create(user_id=user_id, **expected)
+                    else:
+                        # Bump the version so cached responses are revalidated
+                        TaskCounter.objects.filter(user_id=user_id).update(version=F('version') + 1, **expected)
+        
+        action = 'found' if options['verify'] else 'repaired'
+        self.stdout.write(self.style.SUCCESS(f'Checked {checked} users, {action} {drifted} drifted counters'))
@@ -0,0 +1,80 @@
+"""
+Backfill, rebuild or verify per-user daily task rollups from Task rows.
+"""
+
+from django.core.management.base import BaseCommand
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import F
+
+from tasks_api.models import TaskCounter, TaskDailyRollup
+
+
+class Command(BaseCommand):
+    help = 'Rebuild (or, with --verify, only check) per-user TaskDailyRollup rows from live and archived task rows'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--user', action='append', dest='users', default=[],
+                            help='Username to process (repeatable); defaults to all users')
+        parser.add_argument('--verify', action='store_true',
+                            help='Report drifted rollups without changing them')
+    
+    def handle(self, *args, **options):
+        users = User.objects.order_by('id')
+        if options['users']:
+            users = users.filter(username__in=options['users'])
+        
+        checked = drifted = 0
+        for user_id, username in users.values_list('id', 'username').iterator():
+            checked += 1
+            with transaction.atomic():
+                # Lock the counter row so concurrent writes queue behind the rebuild
+                TaskCounter.next_change_seq(user_id)
+                expected = TaskDailyRollup.compute_for(user_id)
+                current = {
+                    rollup.day: rollup for rollup in TaskDailyRollup.objects.filter(user_id=user_id)
+                }
+                changed_days = sorted(
+                    day for day in expected.keys() | current.keys()
+                    if day not in current or day not in expected or self.values_of(current[day]) != expected[day]
+                )
+                # Days whose tasks are all gone are only reported when they still count something
+                changed_days = [
+                    day for day in changed_days
+                    if day in expected or current[day].created or current[day].completed
+                ]
+                if not changed_days:
+                    continue
+                
+                drifted += 1
+                self.stdout.write(f"{username}: {len(changed_days)} drifted days "
+                                  f"({changed_days[0]} .. {changed_days[-1]})")
+                
+                if not options['verify']:
+                    TaskDailyRollup.objects.filter(user_id=user_id).exclude(day__in=list(expected)).delete()
+                    new, changed = [], []
+                    for day, values in expected.items():
+                        rollup = current.get(day)
+                        if rollup is None:
+                            new.append(TaskDailyRollup(user_id=user_id, day=day, **values))
+                        elif self.values_of(rollup) != values:
+                            for field, value in values.items():
+                                setattr(rollup, field, value)
+                            changed.append(rollup)
+                    TaskDailyRollup.objects.bulk_create(new, batch_size=1000)
+                    TaskDailyRollup.objects.bulk_update(
+                        changed, ['created', 'completed', 'completion_histogram'], batch_size=1000
+                    )
+                    # Bump the version so cached responses are revalidated
+                    TaskCounter.objects.filter(user_id=user_id).update(version=F('version') + 1)
+        
+        action = 'found' if options['verify'] else 'repaired'
+        self.stdout.write(self.style.SUCCESS(f'Checked {checked} users, {action} {drifted} users with drifted rollups'))
+    
+    @staticmethod
+    def values_of(rollup):
+        return {
+            'created': rollup.created,
+            'completed': rollup.completed,
+            'completion_histogram': rollup.completion_histogram,
+        }
@@ -0,0 +1,67 @@
+# Generated by Django 4.2.7 on 2026-10-18 01:22
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def build_counters(apps, schema_editor):
+    """Create a counter row for every existing user from their Task rows"""
+    User = apps.get_model(*settings.AUTH_USER_MODEL.split('.'))
+    Task = apps.get_model('tasks_api', 'Task')
+    TaskCounter = apps.get_model('tasks_api', 'TaskCounter')
+    
+    counters = {user_id: {'total': 0} for user_id in User.objects.values_list('id', flat=True)}
+    rows = Task.objects.order_by().values('user_id', 'status', 'category', 'priority').annotate(
+        count=models.Count('id')
+    )
+    for row in rows:
+        values = counters[row['user_id']]
+        values['total'] += row['count']
+        for field in ('status', 'category', 'priority'):
+            column = f"{field}_{row[field]}"
+            values[column] = values.get(column, 0) + row['count']
+    TaskCounter.objects.bulk_create(
+        [TaskCounter(user_id=user_id, **values) for user_id, values in counters.items()],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('tasks_api', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskCounter',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='task_counter', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('total', models.IntegerField(default=0)),
+                ('status_pending', models.IntegerField(default=0)),
+                ('status_in_progress', models.IntegerField(default=0)),
+                ('status_completed', models.IntegerField(default=0)),
+                ('status_cancelled', models.IntegerField(default=0)),
+                ('category_work', models.IntegerField(default=0)),
+                ('category_personal', models.IntegerField(default=0)),
+                ('category_shopping', models.IntegerField(default=0)),
+                ('category_health', models.IntegerField(default=0)),
+                ('category_education', models.IntegerField(default=0)),
+                ('category_finance', models.IntegerField(default=0)),
+                ('category_travel', models.IntegerField(default=0)),
+                ('category_other', models.IntegerField(default=0)),
+                ('priority_low', models.IntegerField(default=0)),
+                ('priority_medium', models.IntegerField(default=0)),
+                ('priority_high', models.IntegerField(default=0)),
+                ('priority_urgent', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Görev Sayacı',
+                'verbose_name_plural': 'Görev Sayaçları',
+            },
+        ),
+        migrations.RunPython(build_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 4.2.7 on 2026-10-18 01:23
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+from tasks_api.migration_operations import AddIndexConcurrently, DropForeignKeyIndexConcurrently
+
+
+class Migration(migrations.Migration):
+    # Concurrent index builds cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('tasks_api', '0002_taskcounter'),
+    ]
+    
+    operations = [
+        AddIndexConcurrently(
+            model_name='task',
+            index=models.Index(fields=['user', 'created_at', 'id'], name='task_user_created_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='task',
+            index=models.Index(fields=['user', 'updated_at'], name='task_user_updated_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='task',
+            index=models.Index(fields=['user', 'due_date'], name='task_user_due_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='task',
+            index=models.Index(fields=['user', 'title'], name='task_user_title_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='task',
+            index=models.Index(fields=['user', 'status', 'created_at'], name='task_user_status_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='task',
+            index=models.Index(fields=['user', 'priority', 'created_at'], name='task_user_priority_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='task',
+            index=models.Index(fields=['user', 'category', 'created_at'], name='task_user_category_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='task',
+            index=models.Index(condition=models.Q(('due_date__isnull', False), ('status__in', ['pending', 'in_progress'])), fields=['user', 'due_date'], name='task_open_due_idx'),
+        ),
+        DropForeignKeyIndexConcurrently(
+            model_name='task',
+            name='user',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='tasks', to=settings.AUTH_USER_MODEL, verbose_name='Kullanıcı'),
+        ),
+    ]
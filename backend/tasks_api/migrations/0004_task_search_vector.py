@@ -0,0 +1,46 @@
+from django.db import migrations
+
+
+# Adding a STORED generated column rewrites the whole task table under an
+# ACCESS EXCLUSIVE lock: reads and writes of tasks wait until every row is
+# rewritten, so on a large table apply this migration in a maintenance
+# window. The GIN index is built afterwards with CREATE INDEX CONCURRENTLY,
+# outside that lock.
+SEARCH_VECTOR_SQL = """
+ALTER TABLE tasks_api_task ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+    setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+    setweight(to_tsvector('simple', coalesce(description, '')), 'B')
+) STORED
+"""
+
+SEARCH_VECTOR_INDEX_SQL = 'CREATE INDEX CONCURRENTLY IF NOT EXISTS task_search_vector_idx ON tasks_api_task USING GIN (search_vector)'
+
+DROP_SEARCH_VECTOR_INDEX_SQL = 'DROP INDEX CONCURRENTLY IF EXISTS task_search_vector_idx'
+
+DROP_SEARCH_VECTOR_SQL = 'ALTER TABLE tasks_api_task DROP COLUMN IF EXISTS search_vector'
+
+
+def add_search_vector(apps, schema_editor):
+    """PostgreSQL only: other databases keep the icontains search"""
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(SEARCH_VECTOR_SQL)
+        schema_editor.execute(SEARCH_VECTOR_INDEX_SQL)
+
+
+def drop_search_vector(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(DROP_SEARCH_VECTOR_INDEX_SQL)
+        schema_editor.execute(DROP_SEARCH_VECTOR_SQL)
+
+
+class Migration(migrations.Migration):
+    # Each statement commits on its own: the column is in place before the concurrent index build
+    atomic = False
+
+    dependencies = [
+        ('tasks_api', '0003_task_indexes'),
+    ]
+    
+    operations = [
+        migrations.RunPython(add_search_vector, drop_search_vector),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-18 01:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks_api', '0004_task_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='taskcounter',
+            name='version',
+            field=models.BigIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 4.2.7 on 2026-10-18 01:41
+
+from django.db import migrations, models, transaction
+
+from tasks_api.migration_operations import AddIndexConcurrently
+
+
+PRIORITY_RANKS = {'low': 1, 'medium': 2, 'high': 3, 'urgent': 4}
+
+# Tasks per backfill UPDATE; each batch commits on its own, so row locks are
+# held briefly and the table is not rewritten in one transaction
+BATCH_SIZE = 10000
+
+
+def fill_priority_rank(apps, schema_editor):
+    """Set priority_rank from priority on existing tasks, one id range at a time"""
+    Task = apps.get_model('tasks_api', 'Task')
+    bounds = Task.objects.aggregate(first=models.Min('id'), last=models.Max('id'))
+    if bounds['first'] is None:
+        return
+    rank = models.Case(
+        *[models.When(priority=priority, then=models.Value(rank)) for priority, rank in PRIORITY_RANKS.items()],
+        default=models.F('priority_rank'),
+        output_field=models.PositiveSmallIntegerField(),
+    )
+    for start in range(bounds['first'], bounds['last'] + 1, BATCH_SIZE):
+        with transaction.atomic(using=schema_editor.connection.alias):
+            Task.objects.filter(id__gte=start, id__lt=start + BATCH_SIZE).alias(rank=rank).exclude(
+                priority_rank=models.F('rank')
+            ).update(priority_rank=rank)
+
+
+class Migration(migrations.Migration):
+    # The backfill commits per batch and the index is built concurrently
+    atomic = False
+
+    dependencies = [
+        ('tasks_api', '0006_task_sync'),
+    ]
+    
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='priority_rank',
+            field=models.PositiveSmallIntegerField(default=2, editable=False, verbose_name='Öncelik Sırası'),
+        ),
+        migrations.RunPython(fill_priority_rank, migrations.RunPython.noop),
+        AddIndexConcurrently(
+            model_name='task',
+            index=models.Index(fields=['user', 'priority_rank', 'id'], name='task_user_prank_idx'),
+        ),
+    ]
@@ -0,0 +1,80 @@
+# Generated by Django 4.2.7 on 2026-10-18 01:45
+
+from django.conf import settings
+from django.db import migrations, models
+import bisect
+import django.db.models.deletion
+from django.utils import timezone
+
+
+DURATION_BUCKETS = (1, 4, 12, 24, 48, 72, 168, 336, 720)
+
+
+def fill_completed_at(apps, schema_editor):
+    """Completed tasks have no completion time yet; their last update is the best estimate"""
+    Task = apps.get_model('tasks_api', 'Task')
+    Task.objects.filter(status='completed', completed_at__isnull=True).update(completed_at=models.F('updated_at'))
+
+
+def build_rollups(apps, schema_editor):
+    """Create daily rollup rows for every user from their Task rows"""
+    Task = apps.get_model('tasks_api', 'Task')
+    TaskDailyRollup = apps.get_model('tasks_api', 'TaskDailyRollup')
+    tz = timezone.get_default_timezone()
+    
+    rollups = {}
+    
+    def entry(user_id, value):
+        key = (user_id, timezone.localdate(value, tz))
+        if key not in rollups:
+            rollups[key] = TaskDailyRollup(
+                user_id=key[0], day=key[1], completion_histogram=[0] * (len(DURATION_BUCKETS) + 1)
+            )
+        return rollups[key]
+    
+    rows = Task.objects.order_by().values_list('user_id', 'created_at', 'completed_at')
+    for user_id, created_at, completed_at in rows.iterator(chunk_size=5000):
+        entry(user_id, created_at).created += 1
+        if completed_at is not None:
+            rollup = entry(user_id, completed_at)
+            rollup.completed += 1
+            hours = (completed_at - created_at).total_seconds() / 3600
+            rollup.completion_histogram[bisect.bisect_left(DURATION_BUCKETS, hours)] += 1
+    TaskDailyRollup.objects.bulk_create(rollups.values(), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('tasks_api', '0007_task_priority_rank'),
+    ]
+    
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='completed_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='Tamamlanma Tarihi'),
+        ),
+        migrations.RunPython(fill_completed_at, migrations.RunPython.noop),
+        migrations.CreateModel(
+            name='TaskDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('created', models.IntegerField(default=0)),
+                ('completed', models.IntegerField(default=0)),
+                ('completion_histogram', models.JSONField(default=list)),
+                ('user', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='task_rollups', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Günlük Görev Özeti',
+                'verbose_name_plural': 'Günlük Görev Özetleri',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='taskdailyrollup',
+            constraint=models.UniqueConstraint(fields=('user', 'day'), name='rollup_user_day_uniq'),
+        ),
+        migrations.RunPython(build_rollups, migrations.RunPython.noop),
+    ]
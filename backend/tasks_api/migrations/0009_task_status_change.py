@@ -0,0 +1,33 @@
+# Generated by Django 4.2.7 on 2026-10-18 01:47
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('tasks_api', '0008_task_rollups'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskStatusChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('task_id', models.BigIntegerField()),
+                ('from_status', models.CharField(choices=[('pending', 'Bekleyen'), ('in_progress', 'Devam Ediyor'), ('completed', 'Tamamlandı'), ('cancelled', 'İptal Edildi')], max_length=20)),
+                ('to_status', models.CharField(choices=[('pending', 'Bekleyen'), ('in_progress', 'Devam Ediyor'), ('completed', 'Tamamlandı'), ('cancelled', 'İptal Edildi')], max_length=20)),
+                ('changed_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('user', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='task_status_changes', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Görev Durum Değişikliği',
+                'verbose_name_plural': 'Görev Durum Değişiklikleri',
+                'indexes': [models.Index(fields=['task_id', 'changed_at'], name='status_change_task_idx'), models.Index(fields=['user', 'changed_at'], name='status_change_user_idx')],
+            },
+        ),
+    ]
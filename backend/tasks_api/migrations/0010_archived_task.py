@@ -0,0 +1,67 @@
+# Generated by Django 4.2.7 on 2026-10-18 01:52
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+# Same generated column as tasks_api_task (0004) so search covers archived
+# tasks; no GIN index, archived rows are only searched within one user's
+SEARCH_VECTOR_SQL = """
+ALTER TABLE tasks_api_archivedtask ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+    setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+    setweight(to_tsvector('simple', coalesce(description, '')), 'B')
+) STORED;
+"""
+
+DROP_SEARCH_VECTOR_SQL = """
+ALTER TABLE tasks_api_archivedtask DROP COLUMN IF EXISTS search_vector;
+"""
+
+
+def add_search_vector(apps, schema_editor):
+    """PostgreSQL only: other databases keep the icontains search"""
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(SEARCH_VECTOR_SQL)
+
+
+def drop_search_vector(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(DROP_SEARCH_VECTOR_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('tasks_api', '0009_task_status_change'),
+    ]
+    
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedTask',
+            fields=[
+                ('title', models.CharField(max_length=200, verbose_name='Başlık')),
+                ('description', models.TextField(blank=True, null=True, verbose_name='Açıklama')),
+                ('category', models.CharField(choices=[('work', 'İş'), ('personal', 'Kişisel'), ('shopping', 'Alışveriş'), ('health', 'Sağlık'), ('education', 'Eğitim'), ('finance', 'Finans'), ('travel', 'Seyahat'), ('other', 'Diğer')], default='other', max_length=20, verbose_name='Kategori')),
+                ('status', models.CharField(choices=[('pending', 'Bekleyen'), ('in_progress', 'Devam Ediyor'), ('completed', 'Tamamlandı'), ('cancelled', 'İptal Edildi')], default='pending', max_length=20, verbose_name='Durum')),
+                ('priority', models.CharField(choices=[('low', 'Düşük'), ('medium', 'Orta'), ('high', 'Yüksek'), ('urgent', 'Acil')], default='medium', max_length=10, verbose_name='Öncelik')),
+                ('priority_rank', models.PositiveSmallIntegerField(default=2, editable=False, verbose_name='Öncelik Sırası')),
+                ('due_date', models.DateTimeField(blank=True, null=True, verbose_name='Bitiş Tarihi')),
+                ('completed_at', models.DateTimeField(blank=True, editable=False, null=True, verbose_name='Tamamlanma Tarihi')),
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(verbose_name='Oluşturulma Tarihi')),
+                ('updated_at', models.DateTimeField(verbose_name='Güncellenme Tarihi')),
+                ('archived_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Arşivlenme Tarihi')),
+                ('user', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='archived_tasks', to=settings.AUTH_USER_MODEL, verbose_name='Kullanıcı')),
+            ],
+            options={
+                'verbose_name': 'Arşivlenmiş Görev',
+                'verbose_name_plural': 'Arşivlenmiş Görevler',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['user', 'created_at', 'id'], name='archived_user_created_idx')],
+            },
+        ),
+        migrations.RunPython(add_search_vector, drop_search_vector),
+    ]
@@ -0,0 +1,32 @@
+from django.conf import settings
+from django.db import migrations
+
+from tasks_api import partitioning
+
+
+def partition_tasks(apps, schema_editor):
+    """
+    PostgreSQL with TASK_PARTITIONING only. Enabling the setting later is
+    done with `manage.py partition_tasks --convert`.
+    """
+    connection = schema_editor.connection
+    if connection.vendor == 'postgresql' and settings.TASK_PARTITIONING \
+            and not partitioning.is_partitioned(connection):
+        partitioning.partition_table(connection, settings.TASK_PARTITION_MONTHS_AHEAD)
+
+
+def unpartition_tasks(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == 'postgresql' and partitioning.is_partitioned(connection):
+        partitioning.unpartition_table(connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks_api', '0010_archived_task'),
+    ]
+    
+    operations = [
+        migrations.RunPython(partition_tasks, unpartition_tasks),
+    ]
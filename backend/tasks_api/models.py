@@ -2,11 +2,17 @@
 Task model for the task management application.
 """
 
-from django.db import models
+import bisect
+import itertools
+
+from django.db import models, transaction
 from django.contrib.auth.models import User
 from django.utils import timezone
 
-class Task(models.Model):
+class AbstractTask(models.Model):
+    """
+    Fields shared by live tasks (Task) and archived ones (ArchivedTask).
+    """
     STATUS_CHOICES = [
         ('pending', 'Bekleyen'),
         ('in_progress', 'Devam Ediyor'),
@@ -20,6 +26,8 @@ class Task(models.Model):
         ('high', 'Yüksek'),
         ('urgent', 'Acil'),
     ]
+    # Numeric urgency of each priority, stored in priority_rank for ordering
+    PRIORITY_RANKS = {value: rank for rank, (value, _label) in enumerate(PRIORITY_CHOICES, 1)}
     
     CATEGORY_CHOICES = [
         ('work', 'İş'),
@@ -37,15 +45,16 @@ class Task(models.Model):
     category = models.CharField(max_length=20, choices=CATEGORY_CHOICES, default='other', verbose_name='Kategori')
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending', verbose_name='Durum')
     priority = models.CharField(max_length=10, choices=PRIORITY_CHOICES, default='medium', verbose_name='Öncelik')
+    # PRIORITY_RANKS[priority], kept in sync on every write so ordering=priority sorts by urgency
+    priority_rank = models.PositiveSmallIntegerField(default=2, editable=False, verbose_name='Öncelik Sırası')
     due_date = models.DateTimeField(blank=True, null=True, verbose_name='Bitiş Tarihi')
     created_at = models.DateTimeField(auto_now_add=True, verbose_name='Oluşturulma Tarihi')
     updated_at = models.DateTimeField(auto_now=True, verbose_name='Güncellenme Tarihi')
-    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='tasks', verbose_name='Kullanıcı')
+    # When the task last became completed; cleared when it is reopened
+    completed_at = models.DateTimeField(blank=True, null=True, editable=False, verbose_name='Tamamlanma Tarihi')
     
     class Meta:
-        ordering = ['-created_at']
-        verbose_name = 'Görev'
-        verbose_name_plural = 'Görevler'
+        abstract = True
     
     def __str__(self):
         return self.title
@@ -64,3 +73,360 @@ class Task(models.Model):
             delta = self.due_date - timezone.now()
             return delta.days
         return None
+
+
+class Task(AbstractTask):
+    # With TASK_PARTITIONING the table is range partitioned on created_at by
+    # month, with a (id, created_at) primary key (see tasks_api.partitioning)
+    # Per-user change sequence of the last write (see TaskCounter.version)
+    change_seq = models.BigIntegerField(default=0, editable=False)
+    # Covered by the composite indexes below, all of which lead with user
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='tasks', verbose_name='Kullanıcı', db_index=False)
+    
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = 'Görev'
+        verbose_name_plural = 'Görevler'
+        indexes = [
+            # User-scoped list ordering (and keyset pagination tiebreak on id)
+            models.Index(fields=['user', 'created_at', 'id'], name='task_user_created_idx'),
+            models.Index(fields=['user', 'updated_at'], name='task_user_updated_idx'),
+            models.Index(fields=['user', 'due_date'], name='task_user_due_idx'),
+            models.Index(fields=['user', 'title'], name='task_user_title_idx'),
+            # User-scoped filters combined with the default ordering
+            models.Index(fields=['user', 'status', 'created_at'], name='task_user_status_idx'),
+            models.Index(fields=['user', 'priority', 'created_at'], name='task_user_priority_idx'),
+            # ordering=priority (by urgency) and its keyset pagination
+            models.Index(fields=['user', 'priority_rank', 'id'], name='task_user_prank_idx'),
+            models.Index(fields=['user', 'category', 'created_at'], name='task_user_category_idx'),
+            # Delta sync: rows changed after a sync token
+            models.Index(fields=['user', 'change_seq'], name='task_user_seq_idx'),
+            # Open tasks with a due date: overdue and due-soon queries
+            models.Index(
+                fields=['user', 'due_date'],
+                name='task_open_due_idx',
+                condition=models.Q(status__in=['pending', 'in_progress'], due_date__isnull=False),
+            ),
+        ]
+    
+    def save(self, *args, **kwargs):
+        # Keep the row write and its counter bookkeeping (signals) in one transaction
+        with transaction.atomic():
+            self.change_seq = self.lock_owner_counters()
+            update_fields = kwargs.get('update_fields')
+            if update_fields is None:
+                self.set_derived_fields()
+            else:
+                update_fields = {*update_fields, 'change_seq'}
+                if update_fields & {'priority', 'status'}:
+                    self.set_derived_fields()
+                    update_fields |= {'priority_rank', 'completed_at'}
+                kwargs['update_fields'] = update_fields
+            super().save(*args, **kwargs)
+    
+    def lock_owner_counters(self):
+        """
+        Lock the counter row of the task's user and, when the save moves the
+        task to another user, of its stored user too, in user id order.
+        Remembers {user_id: change sequence} for the signals and returns the
+        sequence of the task's user.
+        """
+        stored_user_id = None
+        if not self._state.adding and self.pk is not None:
+            stored_user_id = Task.objects.filter(pk=self.pk).values_list('user_id', flat=True).first()
+        self._change_seqs = {
+            user_id: TaskCounter.next_change_seq(user_id)
+            for user_id in sorted({self.user_id, stored_user_id} - {None})
+        }
+        return self._change_seqs[self.user_id]
+    
+    def set_derived_fields(self, now=None):
+        """
+        Recompute priority_rank and completed_at from priority and status.
+        Called by save(); bulk write paths call it for each task themselves.
+        """
+        self.priority_rank = self.PRIORITY_RANKS[self.priority]
+        if self.status != 'completed':
+            self.completed_at = None
+        elif self.completed_at is None:
+            self.completed_at = now or timezone.now()
+
+
+
+class ArchivedTask(AbstractTask):
+    """
+    A completed or cancelled task moved out of the Task table by the
+    archive_tasks command, keeping the id it had while live. Archived
+    tasks are read-only; they still count in the user's TaskCounter and
+    daily rollups, so archiving leaves statistics unchanged.
+    """
+    # Only tasks in these statuses are archived
+    ARCHIVABLE_STATUSES = ('completed', 'cancelled')
+    
+    id = models.BigIntegerField(primary_key=True)
+    # Copied from the live row rather than set on save
+    created_at = models.DateTimeField(verbose_name='Oluşturulma Tarihi')
+    updated_at = models.DateTimeField(verbose_name='Güncellenme Tarihi')
+    archived_at = models.DateTimeField(default=timezone.now, verbose_name='Arşivlenme Tarihi')
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name='archived_tasks', verbose_name='Kullanıcı', db_index=False
+    )
+    
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = 'Arşivlenmiş Görev'
+        verbose_name_plural = 'Arşivlenmiş Görevler'
+        indexes = [
+            # include_archived listings; other filters narrow the user's rows
+            models.Index(fields=['user', 'created_at', 'id'], name='archived_user_created_idx'),
+        ]
+    
+    @classmethod
+    def from_task(cls, row, archived_at=None):
+        """Archive copy of a task from its `.values(*copied_fields())` row"""
+        return cls(archived_at=archived_at or timezone.now(), **{field: row[field] for field in cls.copied_fields()})
+    
+    @classmethod
+    def copied_fields(cls):
+        """Columns carried over from the live Task row"""
+        return [field.attname for field in cls._meta.concrete_fields if field.name != 'archived_at']
+
+
+class TaskCounter(models.Model):
+    """
+    Per-user task counters, maintained incrementally on every Task write
+    so that task statistics can be served from a single primary-key read.
+    """
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='task_counter')
+    total = models.IntegerField(default=0)
+    
+    status_pending = models.IntegerField(default=0)
+    status_in_progress = models.IntegerField(default=0)
+    status_completed = models.IntegerField(default=0)
+    status_cancelled = models.IntegerField(default=0)
+    
+    category_work = models.IntegerField(default=0)
+    category_personal = models.IntegerField(default=0)
+    category_shopping = models.IntegerField(default=0)
+    category_health = models.IntegerField(default=0)
+    category_education = models.IntegerField(default=0)
+    category_finance = models.IntegerField(default=0)
+    category_travel = models.IntegerField(default=0)
+    category_other = models.IntegerField(default=0)
+    
+    priority_low = models.IntegerField(default=0)
+    priority_medium = models.IntegerField(default=0)
+    priority_high = models.IntegerField(default=0)
+    priority_urgent = models.IntegerField(default=0)
+    
+    # Bumped on every write to the user's tasks; drives conditional GETs and
+    # is the change sequence stamped on Task.change_seq for delta sync
+    version = models.BigIntegerField(default=0)
+    # Sync tokens below this were compacted away with their tombstones
+    sync_horizon = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    TRACKED_FIELDS = ('status', 'category', 'priority')
+    
+    class Meta:
+        verbose_name = 'Görev Sayacı'
+        verbose_name_plural = 'Görev Sayaçları'
+    
+    def __str__(self):
+        return f"{self.user_id}'s Task Counter"
+    
+    @staticmethod
+    def column_for(field, value):
+        """Return the counter column for a tracked field value"""
+        return f'{field}_{value}'
+    
+    @classmethod
+    def counter_columns(cls):
+        """All counter columns, including the total"""
+        columns = ['total']
+        for field in cls.TRACKED_FIELDS:
+            for value, _label in Task._meta.get_field(field).choices:
+                columns.append(cls.column_for(field, value))
+        return columns
+    
+    @classmethod
+    def compute_for(cls, user_id):
+        """
+        Compute counter values for a user from Task and ArchivedTask rows.
+        """
+        values = dict.fromkeys(cls.counter_columns(), 0)
+        for model in (Task, ArchivedTask):
+            rows = model.objects.filter(user_id=user_id).order_by().values(*cls.TRACKED_FIELDS).annotate(
+                count=models.Count('id')
+            )
+            for row in rows:
+                values['total'] += row['count']
+                for field in cls.TRACKED_FIELDS:
+                    values[cls.column_for(field, row[field])] += row['count']
+        return values
+    
+    @classmethod
+    def get_for_user(cls, user_id):
+        """
+        Return the user's counter row, building it from task rows if it is missing.
+        """
+        counter = cls.objects.filter(user_id=user_id).first()
+        if counter is None:
+            counter, _created = cls.objects.get_or_create(user_id=user_id, defaults=cls.compute_for(user_id))
+        return counter
+    
+    @classmethod
+    def next_change_seq(cls, user_id):
+        """
+        Lock the user's counter row and return the change sequence for the
+        current write. Must run inside a transaction; the lock serializes a
+        user's writes so sequence order matches commit order.
+        """
+        version = cls.objects.select_for_update().filter(user_id=user_id).values_list('version', flat=True).first()
+        if version is None:
+            cls.get_for_user(user_id)
+            version = cls.objects.select_for_update().filter(user_id=user_id).values_list('version', flat=True).get()
+        return version + 1
+    
+    def breakdown(self, field):
+        """Non-empty counts for a tracked field, largest first"""
+        counts = [
+            {field: value, 'count': getattr(self, self.column_for(field, value))}
+            for value, _label in Task._meta.get_field(field).choices
+        ]
+        return sorted((item for item in counts if item['count']), key=lambda item: -item['count'])
+
+
+class TaskTombstone(models.Model):
+    """
+    Marker for a deleted task, so delta sync clients learn about deletions.
+    Compacted after TASK_TOMBSTONE_RETENTION_DAYS.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='task_tombstones', db_index=False)
+    task_id = models.BigIntegerField()
+    change_seq = models.BigIntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        verbose_name = 'Silinen Görev'
+        verbose_name_plural = 'Silinen Görevler'
+        indexes = [
+            models.Index(fields=['user', 'change_seq'], name='tombstone_user_seq_idx'),
+            models.Index(fields=['deleted_at'], name='tombstone_deleted_at_idx'),
+        ]
+    
+    def __str__(self):
+        return f"Task {self.task_id} deleted at {self.change_seq}"
+
+
+class TaskStatusChange(models.Model):
+    """
+    Append-only log of task status transitions, for timelines, cycle times
+    and reopen counts. Written in one batch per write operation by
+    tracking. Rows refer to tasks by id (no foreign key), so the history
+    outlives the task row.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='task_status_changes', db_index=False)
+    task_id = models.BigIntegerField()
+    from_status = models.CharField(max_length=20, choices=Task.STATUS_CHOICES)
+    to_status = models.CharField(max_length=20, choices=Task.STATUS_CHOICES)
+    changed_at = models.DateTimeField(default=timezone.now)
+    
+    class Meta:
+        verbose_name = 'Görev Durum Değişikliği'
+        verbose_name_plural = 'Görev Durum Değişiklikleri'
+        indexes = [
+            # One task's timeline
+            models.Index(fields=['task_id', 'changed_at'], name='status_change_task_idx'),
+            # A user's transitions in a time range
+            models.Index(fields=['user', 'changed_at'], name='status_change_user_idx'),
+        ]
+    
+    def __str__(self):
+        return f"Task {self.task_id}: {self.from_status} -> {self.to_status}"
+
+class TaskDailyRollup(models.Model):
+    """
+    Per-user, per-day task throughput: how many of the user's tasks were
+    created and completed on the day (in TIME_ZONE), and a histogram of the
+    completed ones' time to complete. Maintained incrementally on every Task
+    write (see tracking) so trend queries read one row per day.
+    """
+    # Upper bounds, in hours, of the time-to-complete histogram buckets; the
+    # histogram has one more, open-ended bucket for anything longer
+    DURATION_BUCKETS = (1, 4, 12, 24, 48, 72, 168, 336, 720)
+    
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='task_rollups', db_index=False)
+    day = models.DateField()
+    created = models.IntegerField(default=0)
+    completed = models.IntegerField(default=0)
+    # Completed-task counts per DURATION_BUCKETS bucket
+    completion_histogram = models.JSONField(default=list)
+    
+    class Meta:
+        verbose_name = 'Günlük Görev Özeti'
+        verbose_name_plural = 'Günlük Görev Özetleri'
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'day'], name='rollup_user_day_uniq'),
+        ]
+    
+    def __str__(self):
+        return f"{self.user_id}'s tasks on {self.day}"
+    
+    @staticmethod
+    def day_of(value):
+        """The rollup day of a timestamp"""
+        return timezone.localdate(value, timezone.get_default_timezone())
+    
+    @classmethod
+    def duration_bucket(cls, created_at, completed_at):
+        """Histogram bucket index for a task's time to complete"""
+        hours = (completed_at - created_at).total_seconds() / 3600
+        return bisect.bisect_left(cls.DURATION_BUCKETS, hours)
+    
+    @classmethod
+    def empty_histogram(cls):
+        return [0] * (len(cls.DURATION_BUCKETS) + 1)
+    
+    @classmethod
+    def compute_for(cls, user_id):
+        """
+        Compute {day: {created, completed, completion_histogram}} for a user
+        from Task and ArchivedTask rows.
+        """
+        days = {}
+        
+        def entry(day):
+            if day not in days:
+                days[day] = {'created': 0, 'completed': 0, 'completion_histogram': cls.empty_histogram()}
+            return days[day]
+        
+        live = Task.objects.filter(user_id=user_id).order_by().values_list('created_at', 'completed_at')
+        archived = ArchivedTask.objects.filter(user_id=user_id).order_by().values_list('created_at', 'completed_at')
+        for created_at, completed_at in itertools.chain(live.iterator(chunk_size=5000), archived.iterator(chunk_size=5000)):
+            entry(cls.day_of(created_at))['created'] += 1
+            if completed_at is not None:
+                values = entry(cls.day_of(completed_at))
+                values['completed'] += 1
+                values['completion_histogram'][cls.duration_bucket(created_at, completed_at)] += 1
+        return days
+    
+    @classmethod
+    def median_hours(cls, histogram):
+        """
+        Approximate median time to complete, in hours, interpolated within
+        the histogram bucket holding the median; None without completions.
+        """
+        total = sum(histogram)
+        if not total:
+            return None
+        remaining = total / 2
+        lower = 0
+        for index, count in enumerate(histogram):
+            if index == len(cls.DURATION_BUCKETS):
+                return float(lower)
+            upper = cls.DURATION_BUCKETS[index]
+            if count and remaining <= count:
+                return round(lower + (upper - lower) * remaining / count, 1)
+            remaining -= count
+            lower = upper
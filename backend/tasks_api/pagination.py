@@ -0,0 +1,186 @@
+"""
+Task pagination classes.
+"""
+
+import base64
+import json
+from collections import OrderedDict
+
+from django.core.exceptions import ValidationError
+from django.db import connections
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class TaskKeysetPagination(BasePagination):
+    """
+    Keyset (cursor) pagination on (ordering field, id).
+    
+    Each page is fetched with a range predicate on the ordering field and the
+    primary key instead of OFFSET, and no COUNT query is run, so deep pages
+    cost the same as the first one. Cursors are opaque base64 tokens that
+    also record the ordering they were issued for. NULL values of nullable
+    ordering fields (e.g. due_date) always sort after the non-NULL ones.
+    """
+    mode_query_param = 'pagination'
+    mode_query_value = 'cursor'
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor'
+    page_size = api_settings.PAGE_SIZE
+    default_ordering = '-created_at'
+    
+    @classmethod
+    def is_requested(cls, request):
+        """Whether the client opted in to cursor pagination"""
+        params = request.query_params
+        return params.get(cls.mode_query_param) == cls.mode_query_value or cls.cursor_query_param in params
+    
+    def paginate_queryset(self, queryset, request, view=None):
+        return self.paginate_querysets([queryset], request, view)
+    
+    def paginate_querysets(self, querysets, request, view=None):
+        """
+        Paginate one queryset, or several `.values()` querysets with the same
+        columns and ordering (e.g. live and archived tasks) as one UNION ALL,
+        each part narrowed by the cursor position before they are combined.
+        """
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        queryset = querysets[0]
+        self.ordering = self.get_ordering(queryset)
+        
+        field_name = self.ordering.lstrip('-')
+        descending = self.ordering.startswith('-')
+        self.field_name = field_name
+        self.nullable = field_name != 'id' and queryset.model._meta.get_field(field_name).null
+        
+        cursor = self.decode_cursor(request, queryset.model)
+        reverse = bool(cursor and cursor['reverse'])
+        
+        if cursor:
+            position = self.get_position_filter(field_name, descending, reverse, cursor)
+            querysets = [part.filter(position) for part in querysets]
+        order_terms = self.get_order_terms(field_name, descending, reverse)
+        if len(querysets) > 1:
+            if connections[queryset.db].features.supports_slicing_ordering_in_compound:
+                # Each part reads at most a page in index order, so only those rows are merged
+                querysets = [part.order_by(*order_terms)[:self.page_size + 1] for part in querysets]
+            else:
+                querysets = [part.order_by() for part in querysets]
+            queryset = querysets[0].union(*querysets[1:], all=True)
+        else:
+            queryset = querysets[0]
+        queryset = queryset.order_by(*order_terms)
+        
+        rows = list(queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, cursor is not None
+        
+        self.first_position = self.get_position(rows[0]) if rows else None
+        self.last_position = self.get_position(rows[-1]) if rows else None
+        return rows
+    
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+    
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True},
+                'previous': {'type': 'string', 'nullable': True},
+                'results': schema,
+            },
+        }
+    
+    def get_ordering(self, queryset):
+        """The single field the page is keyed on, e.g. '-created_at'"""
+        ordering = queryset.query.order_by or queryset.model._meta.ordering or [self.default_ordering]
+        ordering = ordering[0]
+        if not isinstance(ordering, str):
+            return self.default_ordering
+        return ordering
+    
+    def get_order_terms(self, field_name, descending, reverse):
+        backwards = descending != reverse
+        nulls = {'nulls_first': True} if reverse else {'nulls_last': True}
+        if not self.nullable:
+            nulls = {}
+        field = F(field_name).desc(**nulls) if backwards else F(field_name).asc(**nulls)
+        pk = F('id').desc() if backwards else F('id').asc()
+        return [field, pk]
+    
+    def get_position_filter(self, field_name, descending, reverse, cursor):
+        """
+        Rows strictly after the cursor position in the current direction.
+        
+        The leading bound on the ordering field alone keeps the predicate
+        usable as an index range condition.
+        """
+        value, pk = cursor['value'], cursor['id']
+        backwards = descending != reverse
+        cmp = 'lt' if backwards else 'gt'
+        cmp_or_equal = 'lte' if backwards else 'gte'
+        
+        if value is None:
+            tail = Q(**{f'{field_name}__isnull': True, f'id__{cmp}': pk})
+            # Going forwards NULLs come last; going backwards every non-NULL row follows
+            return Q(**{f'{field_name}__isnull': False}) | tail if reverse else tail
+        
+        after = Q(**{f'{field_name}__{cmp_or_equal}': value}) & (
+            Q(**{f'{field_name}__{cmp}': value}) | Q(**{f'id__{cmp}': pk})
+        )
+        if self.nullable and not reverse:
+            after |= Q(**{f'{field_name}__isnull': True})
+        return after
+    
+    def get_position(self, row):
+        if isinstance(row, dict):
+            return row[self.field_name], row['id']
+        return getattr(row, self.field_name), row.id
+    
+    def get_next_link(self):
+        if not self.has_next or self.last_position is None:
+            return None
+        return self.encode_cursor(self.last_position, reverse=False)
+    
+    def get_previous_link(self):
+        if not self.has_previous or self.first_position is None:
+            return None
+        return self.encode_cursor(self.first_position, reverse=True)
+    
+    def encode_cursor(self, position, reverse):
+        value, pk = position
+        if hasattr(value, 'isoformat'):
+            value = value.isoformat()
+        payload = {'o': self.ordering, 'v': value, 'i': pk, 'r': int(reverse)}
+        token = base64.urlsafe_b64encode(json.dumps(payload, separators=(',', ':')).encode()).decode()
+        return replace_query_param(self.base_url, self.cursor_query_param, token)
+    
+    def decode_cursor(self, request, model):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(token.encode()).decode())
+            if payload['o'] != self.ordering:
+                raise ValueError('cursor issued for a different ordering')
+            value = payload['v']
+            if value is not None:
+                value = model._meta.get_field(self.field_name).to_python(value)
+            return {'value': value, 'id': int(payload['i']), 'reverse': bool(payload['r'])}
+        except (TypeError, ValueError, KeyError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
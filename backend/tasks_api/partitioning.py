@@ -0,0 +1,231 @@
+"""
+Monthly range partitioning of the Task table by created_at (PostgreSQL).
+
+With TASK_PARTITIONING enabled, tasks_api_task is a partitioned table with
+one partition per calendar month (UTC) and a DEFAULT partition catching
+rows no monthly partition covers. Unique constraints on a partitioned
+table must include the partition key, so the primary key becomes
+(id, created_at); ids still come from the table's single identity
+sequence. Nothing references tasks by foreign key (status history and
+tombstones store plain ids), so no constraint elsewhere depends on it.
+
+Queries bounded on created_at (keyset cursor pages, the created_after /
+created_before filters) only scan the partitions in range. Whole months
+leave the table by detaching their partition instead of mass DELETEs.
+Partitions are created ahead of time by the partition_tasks command; rows
+that land in the DEFAULT partition meanwhile are moved out when their
+month's partition is created. Tasks still open when their month is
+archived also stay live in the DEFAULT partition.
+"""
+
+import re
+from datetime import date, datetime, timezone as dt_timezone
+
+TABLE = 'tasks_api_task'
+DEFAULT_PARTITION = f'{TABLE}_default'
+PARTITION_RE = re.compile(rf'^{TABLE}_p(\d{{4}})_(\d{{2}})$')
+
+
+def month_start(value):
+    return date(value.year, value.month, 1)
+
+
+def add_months(month, months):
+    """First day of the month `months` away from `month`"""
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month):
+    return f'{TABLE}_p{month.year:04d}_{month.month:02d}'
+
+
+def month_bounds(month):
+    """[start, end) of a month's partition, as UTC timestamps"""
+    start = datetime(month.year, month.month, 1, tzinfo=dt_timezone.utc)
+    end_month = add_months(month, 1)
+    return start, datetime(end_month.year, end_month.month, 1, tzinfo=dt_timezone.utc)
+
+
+def is_partitioned(connection):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s))', [TABLE]
+        )
+        return cursor.fetchone()[0]
+
+
+def partitions(connection):
+    """{month: partition name} of the attached monthly partitions, oldest first"""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid '
+            'WHERE i.inhparent = to_regclass(%s)', [TABLE]
+        )
+        names = [name for name, in cursor.fetchall()]
+    months = {}
+    for name in names:
+        match = PARTITION_RE.match(name)
+        if match:
+            months[date(int(match[1]), int(match[2]), 1)] = name
+    return dict(sorted(months.items()))
+
+
+def create_partitions(connection, first, last):
+    """
+    Create the missing monthly partitions from `first` to `last` (inclusive)
+    and return their names. Rows of those months already in the DEFAULT
+    partition are moved into the new partition.
+    """
+    qn = connection.ops.quote_name
+    existing = partitions(connection)
+    created = []
+    month = month_start(first)
+    with connection.cursor() as cursor:
+        while month <= last:
+            if month not in existing:
+                name = partition_name(month)
+                start, end = month_bounds(month)
+                cursor.execute(
+                    f'SELECT EXISTS (SELECT 1 FROM {qn(DEFAULT_PARTITION)} WHERE created_at >= %s AND created_at < %s)',
+                    [start, end]
+                )
+                if cursor.fetchone()[0]:
+                    _move_from_default(connection, cursor, name, start, end)
+                else:
+                    cursor.execute(
+                        f'CREATE TABLE {qn(name)} PARTITION OF {qn(TABLE)} FOR VALUES FROM (%s) TO (%s)', [start, end]
+                    )
+                created.append(name)
+            month = add_months(month, 1)
+    return created
+
+
+def _move_from_default(connection, cursor, name, start, end):
+    """Build a month's partition from its rows in the DEFAULT partition, then attach it"""
+    qn = connection.ops.quote_name
+    columns = ', '.join(qn(column) for column in _insertable_columns(cursor, TABLE))
+    cursor.execute(
+        f'CREATE TABLE {qn(name)} (LIKE {qn(TABLE)} INCLUDING DEFAULTS INCLUDING GENERATED INCLUDING CONSTRAINTS)'
+    )
+    cursor.execute(
+        f'WITH moved AS (DELETE FROM {qn(DEFAULT_PARTITION)} WHERE created_at >= %s AND created_at < %s '
+        f'RETURNING {columns}) INSERT INTO {qn(name)} ({columns}) SELECT {columns} FROM moved',
+        [start, end]
+    )
+    cursor.execute(f'ALTER TABLE {qn(TABLE)} ATTACH PARTITION {qn(name)} FOR VALUES FROM (%s) TO (%s)', [start, end])
+
+
+def detach_partition(connection, name, drop=True):
+    """Detach a monthly partition from the task table and, by default, drop it"""
+    qn = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        cursor.execute(f'ALTER TABLE {qn(TABLE)} DETACH PARTITION {qn(name)}')
+        if drop:
+            cursor.execute(f'DROP TABLE {qn(name)}')
+
+
+def restore_rows(connection, table, condition, params=()):
+    """
+    Move the rows of a detached partition matching `condition` back into the
+    task table, where they land in the DEFAULT partition; returns their count.
+    """
+    qn = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        columns = ', '.join(qn(column) for column in _insertable_columns(cursor, table))
+        cursor.execute(
+            f'WITH moved AS (DELETE FROM {qn(table)} WHERE {condition} RETURNING {columns}) '
+            f'INSERT INTO {qn(TABLE)} ({columns}) SELECT {columns} FROM moved',
+            params
+        )
+        return cursor.rowcount
+
+
+def default_partition_rows(connection):
+    with connection.cursor() as cursor:
+        cursor.execute(f'SELECT count(*) FROM {connection.ops.quote_name(DEFAULT_PARTITION)}')
+        return cursor.fetchone()[0]
+
+
+def partition_table(connection, months_ahead, today=None):
+    """
+    Rebuild the task table as a partitioned table, with monthly partitions
+    from its oldest task up to `months_ahead` months after the current one.
+    Copies every row; writes to the table wait until it is done.
+    """
+    current = month_start(today or date.today())
+    _rebuild(connection, partitioned=True, last=add_months(current, months_ahead), current=current)
+
+
+def unpartition_table(connection):
+    """Rebuild the task table as a plain table (reverts partition_table)"""
+    _rebuild(connection, partitioned=False)
+
+
+def _rebuild(connection, partitioned, last=None, current=None):
+    qn = connection.ops.quote_name
+    new = f'{TABLE}_rebuild'
+    with connection.cursor() as cursor:
+        # Reads go on while the rows are copied; writes wait for the new table
+        cursor.execute(f'LOCK TABLE {qn(TABLE)} IN EXCLUSIVE MODE')
+        columns = ', '.join(qn(column) for column in _insertable_columns(cursor, TABLE))
+        cursor.execute(
+            "SELECT conname, contype, pg_get_constraintdef(oid) FROM pg_constraint "
+            "WHERE conrelid = to_regclass(%s) AND contype IN ('p', 'f') ORDER BY contype DESC, conname", [TABLE]
+        )
+        constraints = cursor.fetchall()
+        cursor.execute(
+            'SELECT indexname, indexdef FROM pg_indexes WHERE schemaname = current_schema() AND tablename = %s '
+            'ORDER BY indexname', [TABLE]
+        )
+        # Constraint indexes come back with their constraints
+        indexes = [
+            definition.replace(' ON ONLY ', ' ON ', 1)
+            for name, definition in cursor.fetchall()
+            if name not in {constraint_name for constraint_name, _kind, _definition in constraints}
+        ]
+        
+        partition_by = ' PARTITION BY RANGE (created_at)' if partitioned else ''
+        cursor.execute(
+            f'CREATE TABLE {qn(new)} (LIKE {qn(TABLE)} INCLUDING DEFAULTS INCLUDING GENERATED INCLUDING IDENTITY '
+            f'INCLUDING CONSTRAINTS INCLUDING STORAGE){partition_by}'
+        )
+        if partitioned:
+            cursor.execute(f'SELECT min(created_at) FROM {qn(TABLE)}')
+            oldest = cursor.fetchone()[0]
+            month = month_start(oldest.astimezone(dt_timezone.utc)) if oldest else current
+            while month <= last:
+                start, end = month_bounds(month)
+                cursor.execute(
+                    f'CREATE TABLE {qn(partition_name(month))} PARTITION OF {qn(new)} FOR VALUES FROM (%s) TO (%s)',
+                    [start, end]
+                )
+                month = add_months(month, 1)
+            cursor.execute(f'CREATE TABLE {qn(DEFAULT_PARTITION)} PARTITION OF {qn(new)} DEFAULT')
+        
+        cursor.execute(f'INSERT INTO {qn(new)} ({columns}) SELECT {columns} FROM {qn(TABLE)}')
+        # Never hand out the id of a deleted task again (tombstones and history refer to it)
+        cursor.execute("SELECT nextval(pg_get_serial_sequence(%s, 'id'))", [TABLE])
+        next_id = cursor.fetchone()[0]
+        
+        cursor.execute(f'DROP TABLE {qn(TABLE)}')
+        cursor.execute(f'ALTER TABLE {qn(new)} RENAME TO {qn(TABLE)}')
+        cursor.execute("SELECT pg_get_serial_sequence(%s, 'id')", [TABLE])
+        cursor.execute(f'ALTER SEQUENCE {cursor.fetchone()[0]} RENAME TO {qn(TABLE + "_id_seq")}')
+        cursor.execute(f'ALTER TABLE {qn(TABLE)} ALTER COLUMN id RESTART WITH %s', [next_id])
+        for name, kind, definition in constraints:
+            if kind == 'p':
+                definition = 'PRIMARY KEY (id, created_at)' if partitioned else 'PRIMARY KEY (id)'
+            cursor.execute(f'ALTER TABLE {qn(TABLE)} ADD CONSTRAINT {qn(name)} {definition}')
+        for definition in indexes:
+            cursor.execute(definition)
+        cursor.execute(f'ANALYZE {qn(TABLE)}')
+
+
+def _insertable_columns(cursor, table):
+    """Column names of a table, minus generated columns"""
+    cursor.execute(
+        "SELECT attname FROM pg_attribute WHERE attrelid = to_regclass(%s) AND attnum > 0 "
+        "AND NOT attisdropped AND attgenerated = '' ORDER BY attnum", [table]
+    )
+    return [name for name, in cursor.fetchall()]
@@ -0,0 +1,30 @@
+"""
+Task renderers.
+
+The export formats are streamed by the view itself; these renderers only
+make `?format=ndjson|csv` and the matching Accept headers negotiable, and
+render the responses that are not streamed (errors) as JSON.
+"""
+
+from rest_framework.renderers import BaseRenderer
+
+from taskmanager_project.fastjson import dumps
+
+
+class StreamedFormatRenderer(BaseRenderer):
+    charset = 'utf-8'
+    
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return dumps(data)
+
+
+class NDJSONRenderer(StreamedFormatRenderer):
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+
+
+class CSVRenderer(StreamedFormatRenderer):
+    media_type = 'text/csv'
+    format = 'csv'
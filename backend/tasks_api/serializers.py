@@ -2,7 +2,8 @@
 Task serializers for API.
 """
 
-from rest_framework import serializers
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
 from django.utils import timezone
 from datetime import timedelta
 from .models import Task
@@ -20,6 +21,14 @@ class TaskSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['created_at', 'updated_at']
     
+    def __init__(self, *args, **kwargs):
+        # Optional sparse fieldset: only these fields are rendered
+        fields = kwargs.pop('fields', None)
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+    
     def create(self, validated_data):
         """Create a new task for the authenticated user"""
         validated_data['user'] = self.context['request'].user
@@ -32,6 +41,9 @@ class TaskCreateSerializer(serializers.ModelSerializer):
     
     def validate_due_date(self, value):
         """Validate that due_date is at least 30 minutes from now"""
+        if value is None:
+            return value
+        
         now = timezone.now()
         min_due_date = now + timedelta(minutes=30)
         
@@ -47,3 +59,84 @@ class TaskCreateSerializer(serializers.ModelSerializer):
         """Create a new task for the authenticated user"""
         validated_data['user'] = self.context['request'].user
         return super().create(validated_data)
+
+class TaskReadSerializer:
+    """
+    Fast read-only path with the same output as TaskSerializer.
+    
+    Works on `.values(*TaskReadSerializer.columns)` rows instead of model
+    instances, evaluates is_overdue / days_until_due against a single `now`
+    and resolves the output timezone once for the whole request.
+    """
+    columns = ['id', 'title', 'description', 'category', 'status', 'priority', 'due_date', 'created_at', 'updated_at']
+    # Columns the computed fields are derived from
+    computed_columns = {
+        'is_overdue': ['due_date', 'status'],
+        'days_until_due': ['due_date'],
+    }
+    
+    def __init__(self, rows, now=None, fields=None):
+        self.rows = rows
+        self.now = now or timezone.now()
+        self.fields = fields
+        self.datetime_field = serializers.DateTimeField()
+        self.timezone = self.datetime_field.default_timezone()
+        self.iso_format = api_settings.DATETIME_FORMAT == ISO_8601
+    
+    def format_datetime(self, value):
+        """DateTimeField.to_representation with the timezone resolved up front"""
+        if value is None:
+            return None
+        if not self.iso_format:
+            return self.datetime_field.to_representation(value)
+        if self.timezone is not None and timezone.is_aware(value):
+            value = value.astimezone(self.timezone)
+        value = value.isoformat()
+        if value.endswith('+00:00'):
+            value = value[:-6] + 'Z'
+        return value
+    
+    @classmethod
+    def columns_for(cls, fields=None):
+        """The columns to fetch for a (sparse) list of output fields"""
+        if fields is None:
+            return list(cls.columns)
+        needed = set()
+        for name in fields:
+            needed.update(cls.computed_columns.get(name, [name]))
+        return [column for column in cls.columns if column in needed]
+    
+    def get_value(self, row, name):
+        if name == 'is_overdue':
+            due_date = row['due_date']
+            return self.now > due_date if due_date and row['status'] != 'completed' else False
+        if name == 'days_until_due':
+            due_date = row['due_date']
+            return (due_date - self.now).days if due_date else None
+        if name in ('due_date', 'created_at', 'updated_at'):
+            return self.format_datetime(row[name])
+        return row[name]
+    
+    def to_representation(self, row):
+        if self.fields is not None:
+            return {name: self.get_value(row, name) for name in self.fields}
+        
+        now = self.now
+        due_date = row['due_date']
+        return {
+            'id': row['id'],
+            'title': row['title'],
+            'description': row['description'],
+            'category': row['category'],
+            'status': row['status'],
+            'priority': row['priority'],
+            'due_date': self.format_datetime(due_date),
+            'created_at': self.format_datetime(row['created_at']),
+            'updated_at': self.format_datetime(row['updated_at']),
+            'is_overdue': now > due_date if due_date and row['status'] != 'completed' else False,
+            'days_until_due': (due_date - now).days if due_date else None,
+        }
+    
+    @property
+    def data(self):
+        return [self.to_representation(row) for row in self.rows]
@@ -0,0 +1,92 @@
+"""
+Task signals for keeping derived data in sync with single-object writes.
+"""
+
+from django.db.models.signals import pre_save, post_save, pre_delete, post_delete
+from django.dispatch import receiver
+from django.contrib.auth.models import User
+from .models import Task, TaskCounter
+from . import tracking
+
+
+def _load_tracked_state(instance):
+    """
+    Read and lock the stored tracked values of a task (None when the row is
+    gone). Called once TaskCounter.next_change_seq holds the user's counter
+    lock, so no other write of the user can change them before this one
+    commits; values remembered when the instance was loaded may be stale.
+    """
+    stored = Task.objects.select_for_update().filter(pk=instance.pk).values(*tracking.STATE_FIELDS).first()
+    instance._tracked_state = tracking.task_state(stored) if stored else None
+
+
+def _deleting_users(origin):
+    """Whether a delete cascades from deleting users (an instance or a queryset)"""
+    return getattr(origin, 'model', type(origin)) is User
+
+
+@receiver(pre_save, sender=Task)
+def load_task_state_before_save(sender, instance, **kwargs):
+    """
+    Make sure the previous tracked values are known before an update.
+    """
+    if not instance._state.adding and instance.pk and not tracking.signals_muted():
+        _load_tracked_state(instance)
+
+
+@receiver(pre_delete, sender=Task)
+def load_task_state_before_delete(sender, instance, **kwargs):
+    """
+    Make sure the tracked values are known before the row is gone, and
+    allocate the change sequence for its tombstone while the lock is taken.
+    """
+    if not tracking.signals_muted() and not _deleting_users(kwargs.get('origin')):
+        instance._delete_seq = TaskCounter.next_change_seq(instance.user_id)
+        _load_tracked_state(instance)
+
+
+@receiver(post_save, sender=Task)
+def track_task_save(sender, instance, created, **kwargs):
+    """
+    Update counters when a task is created or saved.
+    """
+    if tracking.signals_muted():
+        return
+    after = tracking.task_state(instance)
+    if created:
+        tracking.track_created(instance.user_id, [after], instance.change_seq)
+    else:
+        before = getattr(instance, '_tracked_state', None) or after
+        previous_seq = getattr(instance, '_change_seqs', {}).get(before['user_id'])
+        if before['user_id'] != after['user_id'] and previous_seq is not None:
+            # Moved to another user (admin): a delete for the previous owner,
+            # whose sync clients get a tombstone, and a create for the new one
+            tracking.track_deleted(before['user_id'], {instance.pk: before}, previous_seq)
+            tracking.track_created(instance.user_id, [after], instance.change_seq)
+        else:
+            tracking.track_updated(instance.user_id, [(before, after)], instance.change_seq)
+    instance._tracked_state = after
+
+
+@receiver(post_delete, sender=Task)
+def track_task_delete(sender, instance, **kwargs):
+    """
+    Update counters and leave a tombstone when a task is deleted.
+    """
+    if tracking.signals_muted() or _deleting_users(kwargs.get('origin')):
+        # Deleting the user removes its counters and tombstones as well
+        return
+    state = getattr(instance, '_tracked_state', None)
+    if state is None:
+        # Already deleted by a concurrent write, which did the bookkeeping
+        return
+    tracking.track_deleted(instance.user_id, {instance.pk: state}, instance._delete_seq)
+
+
+@receiver(post_save, sender=User)
+def create_task_counter(sender, instance, created, **kwargs):
+    """
+    Create an empty TaskCounter when User is created.
+    """
+    if created:
+        TaskCounter.objects.get_or_create(user=instance)
@@ -0,0 +1,123 @@
+"""
+Tests for the archive_tasks command and include_archived listings.
+"""
+
+import json
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.test import APIClient
+
+from tasks_api.models import ArchivedTask, Task, TaskCounter, TaskTombstone
+from tasks_api.pagination import TaskKeysetPagination
+from tasks_api.tests.test_counters import CounterAssertions
+
+
+class ArchiveTests(CounterAssertions, TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user('alice', password='x')
+        self.other = User.objects.create_user('bob', password='x')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        for n in range(9):
+            task = Task.objects.create(user=self.user, title=f'task {n % 3}', priority='high' if n % 2 else 'low')
+            task.status = ['completed', 'cancelled', 'pending'][n % 3]
+            task.save()
+        Task.objects.create(user=self.other, title='not mine', status='completed')
+        # Every finished task is stale except the newest completed one
+        old = timezone.now() - timedelta(days=400)
+        Task.objects.exclude(pk=Task.objects.filter(user=self.user, status='completed').latest('id').pk).update(
+            updated_at=old
+        )
+    
+    def archive(self, **options):
+        call_command('archive_tasks', stdout=StringIO(), **options)
+    
+    def test_moves_stale_finished_tasks_in_chunks(self):
+        expected = set(
+            Task.objects.filter(user=self.user, status__in=ArchivedTask.ARCHIVABLE_STATUSES)
+            .exclude(updated_at__gte=timezone.now() - timedelta(days=1)).values_list('id', flat=True)
+        )
+        self.assertEqual(len(expected), 5)
+        self.archive(batch_size=2, users=['alice'])
+        
+        self.assertEqual(set(ArchivedTask.objects.values_list('id', flat=True)), expected)
+        self.assertFalse(Task.objects.filter(id__in=expected).exists())
+        self.assertEqual(Task.objects.filter(user=self.user).count(), 4)
+        self.assertTrue(Task.objects.filter(user=self.other).exists())
+        # One tombstone per task, one change_seq per chunk of two
+        tombstones = TaskTombstone.objects.filter(user=self.user)
+        self.assertEqual(sorted(tombstones.values_list('task_id', flat=True)), sorted(expected))
+        seqs = tombstones.values_list('change_seq', flat=True)
+        self.assertEqual(len(set(seqs)), 3)
+        self.assertEqual(TaskCounter.objects.get(user=self.user).version, max(seqs))
+    
+    def test_rerun_and_dry_run(self):
+        output = StringIO()
+        call_command('archive_tasks', dry_run=True, stdout=output)
+        self.assertIn('Would archive 6 tasks for 2 users', output.getvalue())
+        self.assertFalse(ArchivedTask.objects.exists())
+        self.archive()
+        self.archive()
+        self.assertEqual(ArchivedTask.objects.count(), 6)
+        self.assertEqual(TaskTombstone.objects.count(), 6)
+    
+    def test_counters_and_rollups_unchanged(self):
+        counter = TaskCounter.compute_for(self.user.pk)
+        self.archive(batch_size=2)
+        self.assertEqual(TaskCounter.compute_for(self.user.pk), counter)
+        self.assert_counter_matches_rows(self.user)
+        self.assert_rollups_match_rows(self.user)
+        self.assertEqual(self.client.get('/api/tasks/stats/').data['total_tasks'], 9)
+    
+    def expected_order(self, *ordering):
+        rows = [
+            *Task.objects.filter(user=self.user).values('id', 'title', 'created_at'),
+            *ArchivedTask.objects.filter(user=self.user).values('id', 'title', 'created_at'),
+        ]
+        for field in reversed(ordering):
+            rows.sort(key=lambda row: row[field.lstrip('-')], reverse=field.startswith('-'))
+        return [row['id'] for row in rows]
+    
+    def walk(self, url):
+        ids, response = [], self.client.get(url)
+        while True:
+            self.assertEqual(response.status_code, 200)
+            ids += [task['id'] for task in response.data['results']]
+            if not response.data['next']:
+                return ids
+            response = self.client.get(response.data['next'])
+    
+    @mock.patch.object(TaskKeysetPagination, 'page_size', 3)
+    @mock.patch.object(PageNumberPagination, 'page_size', 3)
+    def test_include_archived_list(self):
+        self.archive()
+        live = self.walk('/api/tasks/')
+        self.assertEqual(len(live), 4)
+        for url, ordering in [
+            ('/api/tasks/?include_archived=true', ('-created_at', '-id')),
+            ('/api/tasks/?include_archived=true&ordering=title', ('title', 'id')),
+            ('/api/tasks/?include_archived=1&pagination=cursor', ('-created_at', '-id')),
+            ('/api/tasks/?include_archived=1&pagination=cursor&ordering=-title', ('-title', '-id')),
+        ]:
+            with self.subTest(url=url):
+                self.assertEqual(self.walk(url), self.expected_order(*ordering))
+        # Filters apply to the archived rows too
+        response = self.client.get('/api/tasks/?include_archived=true&status=cancelled')
+        self.assertEqual(response.data['count'], 3)
+        self.assertEqual({task['status'] for task in response.data['results']}, {'cancelled'})
+    
+    def test_include_archived_export(self):
+        self.archive()
+        response = self.client.get('/api/tasks/export/?include_archived=true&fields=id')
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual([json.loads(line)['id'] for line in lines], self.expected_order('-created_at', '-id'))
+        response = self.client.get('/api/tasks/export/?fields=id')
+        self.assertEqual(len(b''.join(response.streaming_content).decode().splitlines()), 4)
@@ -0,0 +1,57 @@
+"""
+Tests for the bulk create/update/delete endpoint.
+"""
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from tasks_api.models import Task, TaskCounter
+
+
+class BulkTests(TestCase):
+    url = '/api/tasks/bulk/'
+    
+    def setUp(self):
+        self.user = User.objects.create_user('alice', password='x')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.tasks = [Task.objects.create(user=self.user, title=f'task {n}') for n in range(3)]
+    
+    def post(self, data):
+        return self.client.post(self.url, data, format='json')
+    
+    def test_mixed_request(self):
+        response = self.post({
+            'create': [{'title': 'new'}, {'title': ''}],
+            'update': [{'id': self.tasks[0].pk, 'status': 'completed'}, {'id': 0, 'status': 'completed'}],
+            'delete': [self.tasks[1].pk],
+        })
+        self.assertEqual(response.status_code, 207)
+        self.assertIn('id', response.data['create'][0])
+        self.assertIn('errors', response.data['create'][1])
+        self.assertEqual(response.data['update'][1]['errors'], 'Not found')
+        self.assertEqual(response.data['delete'], [{'id': self.tasks[1].pk}])
+        counter = TaskCounter.objects.get(user=self.user)
+        self.assertEqual((counter.total, counter.status_pending, counter.status_completed), (3, 2, 1))
+    
+    def test_invalid_ids_are_reported_per_item(self):
+        response = self.post({
+            'update': [{'id': [1], 'title': 'x'}, {'id': True}, 'not an object'],
+            'delete': [[1], {'id': 1}, 'x', self.tasks[2].pk],
+        })
+        self.assertEqual(response.status_code, 207)
+        self.assertTrue(all('errors' in result for result in response.data['update']))
+        self.assertTrue(all('errors' in result for result in response.data['delete'][:3]))
+        self.assertEqual(response.data['delete'][3], {'id': self.tasks[2].pk})
+        self.assertEqual(Task.objects.filter(user=self.user).count(), 2)
+    
+    def test_update_of_deleted_task(self):
+        pk = self.tasks[0].pk
+        response = self.post({'update': [{'id': pk, 'title': 'x'}], 'delete': [pk]})
+        self.assertEqual(response.data['update'][0]['errors'], 'Task is also listed for deletion')
+        self.assertFalse(Task.objects.filter(pk=pk).exists())
+    
+    def test_non_object_body(self):
+        self.assertEqual(self.post([{'create': []}]).status_code, 400)
+        self.assertEqual(self.post({'delete': 1}).status_code, 400)
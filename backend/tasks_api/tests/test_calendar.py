@@ -0,0 +1,95 @@
+"""
+Tests for the calendar endpoint.
+"""
+
+from datetime import datetime, timezone as dt_timezone
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from tasks_api.models import Task
+
+
+class CalendarTests(TestCase):
+    url = '/api/tasks/calendar/'
+    march = {'from': '2024-03-01', 'to': '2024-03-31'}
+    
+    def setUp(self):
+        self.user = User.objects.create_user('alice', password='x')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        for title, due_date, task_status, priority in [
+            ('late evening', datetime(2024, 3, 4, 21, 30), 'pending', 'high'),
+            ('noon', datetime(2024, 3, 4, 12, 0), 'completed', 'low'),
+            ('small hours', datetime(2024, 3, 11, 2, 0), 'pending', 'low'),
+            ('month end', datetime(2024, 3, 31, 23, 0), 'in_progress', 'medium'),
+        ]:
+            Task.objects.create(
+                user=self.user,
+                title=title,
+                status=task_status,
+                priority=priority,
+                due_date=due_date.replace(tzinfo=dt_timezone.utc),
+            )
+        Task.objects.create(user=self.user, title='no due date')
+        Task.objects.create(
+            user=User.objects.create_user('bob'),
+            title='not mine',
+            due_date=datetime(2024, 3, 4, 12, 0, tzinfo=dt_timezone.utc),
+        )
+    
+    def totals(self, **params):
+        response = self.client.get(self.url, {**self.march, **params})
+        self.assertEqual(response.status_code, 200, response.content)
+        return {entry['date']: entry['total'] for entry in response.json()['buckets']}
+    
+    def test_days_cut_in_timezone(self):
+        self.assertEqual(self.totals(tz='Europe/Istanbul'), {
+            '2024-03-04': 1,
+            '2024-03-05': 1,
+            '2024-03-11': 1,
+        })
+        self.assertEqual(self.totals(tz='America/New_York'), {
+            '2024-03-04': 2,
+            '2024-03-10': 1,
+            '2024-03-31': 1,
+        })
+    
+    def test_defaults_to_server_timezone(self):
+        response = self.client.get(self.url, self.march)
+        self.assertEqual(response.json()['tz'], 'Europe/Istanbul')
+        self.assertEqual(self.totals(), self.totals(tz='Europe/Istanbul'))
+    
+    def test_week_buckets_start_on_monday(self):
+        self.assertEqual(self.totals(bucket='week', tz='Europe/Istanbul'), {
+            '2024-03-04': 2,
+            '2024-03-11': 1,
+        })
+        self.assertEqual(self.totals(bucket='week', tz='America/New_York'), {
+            '2024-03-04': 3,
+            '2024-03-25': 1,
+        })
+    
+    def test_breakdowns(self):
+        response = self.client.get(self.url, {**self.march, 'tz': 'America/New_York'})
+        first = response.json()['buckets'][0]
+        self.assertEqual(first, {
+            'date': '2024-03-04',
+            'total': 2,
+            'status': {'pending': 1, 'completed': 1},
+            'priority': {'high': 1, 'low': 1},
+        })
+    
+    def test_invalid_parameters(self):
+        for params in [
+            {'bucket': 'month'},
+            {'tz': 'Mars/Olympus_Mons'},
+            {'from': '2024-03-31', 'to': '2024-03-01'},
+            {'from': 'March'},
+            {'from': '2020-01-01', 'to': '2024-03-31'},
+        ]:
+            with self.subTest(params=params):
+                response = self.client.get(self.url, params)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('error', response.json())
@@ -0,0 +1,106 @@
+"""
+Tests for the per-user task counters kept by the write bookkeeping.
+"""
+
+import threading
+from unittest import skipUnless
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+
+from tasks_api.models import Task, TaskCounter, TaskDailyRollup
+
+
+class CounterAssertions:
+
+    def assert_counter_matches_rows(self, user):
+        counter = TaskCounter.objects.get(user=user)
+        expected = TaskCounter.compute_for(user.pk)
+        self.assertEqual({column: getattr(counter, column) for column in expected}, expected)
+    
+    def assert_rollups_match_rows(self, user):
+        # Days emptied again by later writes keep a row of zeros
+        stored = {
+            rollup.day: {
+                'created': rollup.created, 'completed': rollup.completed,
+                'completion_histogram': rollup.completion_histogram,
+            }
+            for rollup in TaskDailyRollup.objects.filter(user=user)
+            if rollup.created or rollup.completed or any(rollup.completion_histogram)
+        }
+        self.assertEqual(stored, TaskDailyRollup.compute_for(user.pk))
+
+
+class CounterTests(CounterAssertions, TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user('alice', password='x')
+    
+    def test_create_update_delete(self):
+        task = Task.objects.create(user=self.user, title='task', priority='high')
+        task.status = 'completed'
+        task.save()
+        Task.objects.create(user=self.user, title='other', category='work')
+        task.delete()
+        self.assert_counter_matches_rows(self.user)
+        self.assertEqual(TaskCounter.objects.get(user=self.user).total, 1)
+    
+    def test_stale_instances(self):
+        task = Task.objects.create(user=self.user, title='task')
+        first, second = Task.objects.get(pk=task.pk), Task.objects.get(pk=task.pk)
+        first.status = 'completed'
+        first.save(update_fields=['status', 'updated_at'])
+        # Loaded as pending, but the stored status is completed by now
+        second.status = 'cancelled'
+        second.save(update_fields=['status', 'updated_at'])
+        self.assert_counter_matches_rows(self.user)
+    
+    def test_deferred_fields(self):
+        task = Task.objects.create(user=self.user, title='task')
+        deferred = Task.objects.only('id', 'user').get(pk=task.pk)
+        deferred.status = 'in_progress'
+        deferred.save(update_fields=['status'])
+        self.assert_counter_matches_rows(self.user)
+    
+    def test_stale_delete(self):
+        task = Task.objects.create(user=self.user, title='task')
+        Task.objects.create(user=self.user, title='other')
+        stale = Task.objects.get(pk=task.pk)
+        task.delete()
+        stale.delete()
+        self.assert_counter_matches_rows(self.user)
+        self.assertEqual(TaskCounter.objects.get(user=self.user).total, 1)
+
+
+@skipUnless(connection.vendor == 'postgresql', 'needs concurrent transactions')
+class ConcurrentCounterTests(CounterAssertions, TransactionTestCase):
+
+    def test_concurrent_status_changes(self):
+        user = User.objects.create_user('alice', password='x')
+        tasks = [Task.objects.create(user=user, title=f'task {n}') for n in range(5)]
+        statuses = ['completed', 'cancelled', 'in_progress', 'pending']
+        barrier = threading.Barrier(len(statuses))
+        errors = []
+        
+        def change_status(new_status):
+            try:
+                # Every thread loads the same states before any of them writes
+                loaded = list(Task.objects.filter(pk__in=[task.pk for task in tasks]))
+                barrier.wait()
+                for task in loaded:
+                    task.status = new_status
+                    task.save(update_fields=['status', 'updated_at'])
+            except Exception as error:
+                errors.append(error)
+            finally:
+                connection.close()
+        
+        threads = [threading.Thread(target=change_status, args=(new_status,)) for new_status in statuses]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        self.assertEqual(errors, [])
+        self.assert_counter_matches_rows(user)
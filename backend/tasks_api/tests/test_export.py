@@ -0,0 +1,41 @@
+"""
+Tests for the streamed NDJSON/CSV task export.
+"""
+
+import json
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from tasks_api.models import Task
+
+
+class ExportTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user('alice', password='x')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.tasks = [Task.objects.create(user=self.user, title=f'task {n}') for n in range(3)]
+    
+    def test_ndjson_and_csv(self):
+        response = self.client.get('/api/tasks/export/?fields=id,title')
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        # Newest first, like the list
+        self.assertEqual([json.loads(line)['id'] for line in lines], [task.pk for task in reversed(self.tasks)])
+        response = self.client.get('/api/tasks/export/?format=csv&fields=id,title')
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0], 'id,title')
+        self.assertEqual(len(lines), 4)
+    
+    def test_errors_are_rendered_as_json(self):
+        for url in ('/api/tasks/export/?fields=bogus', '/api/tasks/export/?format=csv&fields=bogus',
+                    '/api/tasks/overdue/?format=csv&fields=bogus'):
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 400, url)
+            self.assertIn('fields', json.loads(response.content), url)
+        self.client.force_authenticate(None)
+        response = self.client.get('/api/tasks/export/?format=csv')
+        self.assertEqual(response.status_code, 401)
+        self.assertIn('detail', json.loads(response.content))
@@ -0,0 +1,65 @@
+"""
+Parity tests for the orjson-backed JSON renderer and parser.
+"""
+
+import io
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from taskmanager_project.fastjson import FastJSONParser, FastJSONRenderer
+from tasks_api.models import Task
+from tasks_api.serializers import TaskReadSerializer
+
+
+class FastJSONTests(TestCase):
+
+    def setUp(self):
+        user = User.objects.create_user('alice', password='x')
+        now = timezone.now()
+        for n in range(20):
+            Task.objects.create(
+                user=user, title=f'Görev {n} — “alıntı”   ✓', description='satır\nsonu' if n % 2 else '',
+                due_date=now + timedelta(days=n - 10) if n % 3 else None,
+            )
+        rows = Task.objects.filter(user=user).values(*TaskReadSerializer.columns)
+        self.payload = {
+            'count': 20, 'next': 'http://testserver/api/tasks/?page=2', 'previous': None,
+            'results': TaskReadSerializer(rows).data,
+        }
+    
+    def test_renders_the_same_bytes(self):
+        for data in (
+            self.payload,
+            {'error': gettext_lazy('Görev bulunamadı'), 'ratio': Decimal('1.50'), 'at': timezone.now()},
+            [], None,
+        ):
+            self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data), data)
+        # Indented output (browsable/explicit indent) goes through the stdlib path too
+        context = {'indent': 2}
+        self.assertEqual(
+            FastJSONRenderer().render(self.payload, 'application/json', context),
+            JSONRenderer().render(self.payload, 'application/json', context),
+        )
+    
+    def test_parses_the_same_data(self):
+        body = JSONRenderer().render(self.payload)
+        context = {'encoding': 'utf-8'}
+        self.assertEqual(
+            FastJSONParser().parse(io.BytesIO(body), parser_context=context),
+            JSONParser().parse(io.BytesIO(body), parser_context=context),
+        )
+        for malformed in (b'{"title": ', b'[1, 2,]'):
+            messages = []
+            for parser in (FastJSONParser(), JSONParser()):
+                with self.assertRaises(ParseError) as raised:
+                    parser.parse(io.BytesIO(malformed), parser_context=context)
+                messages.append(str(raised.exception))
+            self.assertEqual(messages[0], messages[1])
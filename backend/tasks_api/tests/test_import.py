@@ -0,0 +1,51 @@
+"""
+Tests for the task import endpoint.
+"""
+
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from tasks_api.models import Task, TaskCounter
+
+
+class ImportTests(TestCase):
+    url = '/api/tasks/import/'
+    
+    def setUp(self):
+        self.user = User.objects.create_user('alice', password='x')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+    
+    def upload(self, name, content):
+        return self.client.post(self.url, {'file': SimpleUploadedFile(name, content)}, format='multipart')
+    
+    def test_csv(self):
+        response = self.upload('tasks.csv', b'title,priority\nfirst,high\n,low\nsecond,\n')
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual((response.data['imported'], response.data['failed']), (2, 1))
+        self.assertEqual(response.data['errors'][0]['row'], 2)
+        self.assertEqual(TaskCounter.objects.get(user=self.user).total, 2)
+    
+    def test_undecodable_and_nul_rows_are_reported(self):
+        for name, content in (
+            ('tasks.csv', b'title\nfirst\nbad \xff\xfe bytes\nnul \x00 byte\nlast\n'),
+            ('tasks.ndjson', b'{"title": "first"}\n{"title": "bad \xff"}\n{"title": "nul \\u0000"}\n{"title": "last"}\n'),
+        ):
+            Task.objects.all().delete()
+            response = self.upload(name, content)
+            self.assertEqual(response.status_code, 207, name)
+            self.assertEqual((response.data['imported'], response.data['failed']), (2, 2), name)
+            self.assertEqual([error['row'] for error in response.data['errors']], [2, 3], name)
+            self.assertEqual(sorted(Task.objects.values_list('title', flat=True)), ['first', 'last'], name)
+    
+    @override_settings(TASK_IMPORT_BATCH_SIZE=2)
+    def test_malformed_csv_reports_progress(self):
+        # A field over csv.field_size_limit() stops the reader
+        content = b'title\none\ntwo\nthree\n"' + b'x' * 200000 + b'"\nfive\n'
+        response = self.upload('tasks.csv', content)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['imported'], 3)
+        self.assertIn('Row 4', response.data['error'])
+        self.assertEqual(Task.objects.filter(user=self.user).count(), 3)
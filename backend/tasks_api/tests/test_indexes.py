@@ -0,0 +1,88 @@
+"""
+Query plan tests: the list, filter and sync queries of the API are served by the task indexes.
+"""
+
+from datetime import timedelta
+from unittest import skipUnless
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from tasks_api import partitioning
+from tasks_api.models import Task, TaskCounter
+
+
+class PlanAssertions:
+
+    def explain(self, url):
+        """EXPLAIN output for the task query a request runs"""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, url)
+        table = connection.ops.quote_name(Task._meta.db_table)
+        selects = [
+            query['sql'] for query in queries.captured_queries
+            if query['sql'].startswith('SELECT') and f'FROM {table}' in query['sql']
+        ]
+        self.assertTrue(selects, url)
+        with connection.cursor() as cursor:
+            # With sequential scans priced out, the plan shows which index can serve the query
+            cursor.execute('SET LOCAL enable_seqscan = off')
+            cursor.execute('EXPLAIN ' + selects[-1])
+            return '\n'.join(row[0] for row in cursor.fetchall())
+
+
+@skipUnless(connection.vendor == 'postgresql', 'PostgreSQL query plans')
+class TaskIndexTests(PlanAssertions, TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('alice', password='x')
+        other = User.objects.create_user('bob', password='x')
+        now = timezone.now()
+        Task.objects.bulk_create([
+            Task(
+                user=cls.user if n % 2 else other,
+                title=f'task {n}',
+                status=['pending', 'in_progress', 'completed'][n % 3],
+                priority=['low', 'medium', 'high', 'urgent'][n % 4],
+                priority_rank=n % 4,
+                due_date=now + timedelta(days=n % 30 - 15) if n % 5 else None,
+                change_seq=n,
+            )
+            for n in range(2000)
+        ])
+        TaskCounter.objects.filter(user=cls.user).update(version=2000)
+        with connection.cursor() as cursor:
+            cursor.execute(f'ANALYZE {connection.ops.quote_name(Task._meta.db_table)}')
+    
+    def setUp(self):
+        if partitioning.is_partitioned(connection):
+            self.skipTest('partition indexes carry per-partition names')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+    
+    def assert_uses_index(self, url, index):
+        plan = self.explain(url)
+        self.assertIn(index, plan, f'{url}\n{plan}')
+    
+    def test_list(self):
+        self.assert_uses_index('/api/tasks/?pagination=cursor', 'task_user_created_idx')
+        self.assert_uses_index('/api/tasks/?pagination=cursor&ordering=due_date', 'task_user_due_idx')
+        self.assert_uses_index('/api/tasks/?pagination=cursor&ordering=priority', 'task_user_prank_idx')
+        self.assert_uses_index('/api/tasks/?pagination=cursor&ordering=title', 'task_user_title_idx')
+    
+    def test_filters(self):
+        self.assert_uses_index('/api/tasks/?pagination=cursor&status=pending', 'task_user_status_idx')
+        self.assert_uses_index('/api/tasks/?pagination=cursor&priority=high', 'task_user_priority_idx')
+        self.assert_uses_index('/api/tasks/?pagination=cursor&category=work', 'task_user_category_idx')
+    
+    def test_overdue(self):
+        self.assert_uses_index('/api/tasks/overdue/?pagination=cursor&ordering=due_date', 'task_open_due_idx')
+    
+    def test_changes(self):
+        self.assert_uses_index('/api/tasks/changes/?since=1990', 'task_user_seq_idx')
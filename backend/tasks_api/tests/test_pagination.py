@@ -0,0 +1,85 @@
+"""
+Tests for keyset (cursor) pagination of the task list.
+"""
+
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from tasks_api.models import Task
+from tasks_api.pagination import TaskKeysetPagination
+
+
+@mock.patch.object(TaskKeysetPagination, 'page_size', 3)
+class KeysetPaginationTests(TestCase):
+    url = '/api/tasks/?pagination=cursor'
+    
+    def setUp(self):
+        self.user = User.objects.create_user('alice', password='x')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        now = timezone.now()
+        for n in range(11):
+            Task.objects.create(
+                user=self.user,
+                title=f'task {n % 4}',
+                priority=['low', 'medium', 'high', 'urgent'][n % 4],
+                due_date=now + timedelta(days=n % 3) if n % 4 else None,
+            )
+        # Ties on the ordering field are broken by id
+        Task.objects.filter(id__in=Task.objects.order_by('id').values('id')[:5]).update(created_at=now)
+    
+    def walk(self, url):
+        """Every page forwards, then back again through the previous links"""
+        pages, response = [], self.client.get(url)
+        while True:
+            self.assertEqual(response.status_code, 200)
+            pages.append([task['id'] for task in response.data['results']])
+            if not response.data['next']:
+                break
+            response = self.client.get(response.data['next'])
+        backwards = [pages[-1]]
+        while response.data['previous']:
+            response = self.client.get(response.data['previous'])
+            backwards.insert(0, [task['id'] for task in response.data['results']])
+        return pages, backwards
+    
+    def expected(self, field, descending):
+        rows = list(Task.objects.values_list(field, 'id'))
+        present = sorted((row for row in rows if row[0] is not None), reverse=descending)
+        # NULLs sort last in either direction, by id
+        missing = sorted((row for row in rows if row[0] is None), reverse=descending)
+        return [pk for _value, pk in present + missing]
+    
+    def test_orderings(self):
+        for ordering, field in (
+            ('-created_at', 'created_at'), ('created_at', 'created_at'), ('title', 'title'),
+            ('-due_date', 'due_date'), ('due_date', 'due_date'), ('priority', 'priority_rank'),
+        ):
+            pages, backwards = self.walk(f'{self.url}&ordering={ordering}&fields=id')
+            ids = [pk for page in pages for pk in page]
+            self.assertEqual(ids, self.expected(field, ordering.startswith('-')), ordering)
+            self.assertEqual(pages, backwards, ordering)
+    
+    def test_rows_added_while_paging(self):
+        first = self.client.get(f'{self.url}&ordering=-created_at')
+        seen = [task['id'] for task in first.data['results']]
+        # Newer than every listed task, so it belongs before the cursor
+        Task.objects.create(user=self.user, title='new')
+        response = self.client.get(first.data['next'])
+        while True:
+            seen += [task['id'] for task in response.data['results']]
+            if not response.data['next']:
+                break
+            response = self.client.get(response.data['next'])
+        self.assertEqual(len(seen), len(set(seen)))
+        self.assertEqual(len(seen), 11)
+    
+    def test_invalid_cursors(self):
+        cursor = self.client.get(self.url).data['next'].split('cursor=')[1]
+        self.assertEqual(self.client.get(f'{self.url}&cursor=not-a-cursor').status_code, 404)
+        self.assertEqual(self.client.get(f'{self.url}&ordering=title&cursor={cursor}').status_code, 404)
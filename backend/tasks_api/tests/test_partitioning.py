@@ -0,0 +1,91 @@
+"""
+Tests for the monthly task table partitions: partition pruning and archiving months.
+"""
+
+from datetime import date, datetime, timezone as dt_timezone
+from io import StringIO
+from unittest import skipUnless
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from tasks_api import partitioning
+from tasks_api.models import ArchivedTask, Task
+from tasks_api.tests.test_counters import CounterAssertions
+from tasks_api.tests.test_indexes import PlanAssertions
+
+
+@skipUnless(connection.vendor == 'postgresql', 'PostgreSQL partitioning')
+@override_settings(TASK_PARTITIONING=True)
+class PartitionTests(CounterAssertions, PlanAssertions, TestCase):
+
+    def setUp(self):
+        if partitioning.is_partitioned(connection):
+            self.skipTest('the task table is partitioned already')
+        self.user = User.objects.create_user('alice', password='x')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        current = partitioning.month_start(date.today())
+        # Three past months and the current one, oldest first
+        self.months = [partitioning.add_months(current, offset) for offset in (-3, -2, -1, 0)]
+        self.tasks = {}
+        for month in self.months:
+            for status in ('pending', 'completed', 'cancelled'):
+                task = Task.objects.create(user=self.user, title=f'{month:%Y-%m} {status}', status=status)
+                created_at = datetime(month.year, month.month, 10, tzinfo=dt_timezone.utc)
+                Task.objects.filter(pk=task.pk).update(created_at=created_at)
+                self.tasks[month, status] = task.pk
+        # The DDL rolls back with the test transaction; the table cannot be
+        # dropped with deferred foreign key checks of its rows pending
+        with connection.cursor() as cursor:
+            cursor.execute('SET CONSTRAINTS ALL IMMEDIATE')
+        partitioning.partition_table(connection, 1)
+    
+    def names(self, months):
+        return [partitioning.partition_name(month) for month in months]
+    
+    def assert_scans(self, url, months):
+        plan = self.explain(url)
+        for name in self.names(self.months):
+            if name in self.names(months):
+                self.assertIn(name, plan, f'{url}\n{plan}')
+            else:
+                self.assertNotIn(name, plan, f'{url}\n{plan}')
+        return plan
+    
+    def test_created_range_scans_its_months(self):
+        start, _end = partitioning.month_bounds(self.months[1])
+        _start, end = partitioning.month_bounds(self.months[2])
+        query = f'created_after={start.isoformat()}&created_before={end.isoformat()}'.replace('+', '%2B')
+        plan = self.assert_scans(f'/api/tasks/?pagination=cursor&{query}', self.months[1:3])
+        # The months in range are all partitioned, so the DEFAULT partition is pruned too
+        self.assertNotIn(partitioning.DEFAULT_PARTITION, plan)
+        self.assert_scans(f'/api/tasks/?pagination=cursor&{query}&status=pending', self.months[1:3])
+    
+    def test_unbounded_query_scans_every_month(self):
+        self.assert_scans('/api/tasks/?pagination=cursor', self.months)
+    
+    def test_archive_keeps_open_tasks_live(self):
+        before = self.months[2]
+        output = StringIO()
+        call_command('partition_tasks', '--archive-before', f'{before:%Y-%m}', stdout=output)
+        
+        archived = {self.tasks[month, status] for month in self.months[:2] for status in ('completed', 'cancelled')}
+        kept = {self.tasks[month, 'pending'] for month in self.months[:2]}
+        self.assertEqual(set(ArchivedTask.objects.values_list('id', flat=True)), archived)
+        live = set(Task.objects.values_list('id', flat=True))
+        self.assertTrue(kept <= live)
+        self.assertFalse(archived & live)
+        self.assertEqual(partitioning.default_partition_rows(connection), len(kept))
+        remaining = partitioning.partitions(connection)
+        for name in self.names(self.months[:2]):
+            self.assertNotIn(name, remaining.values())
+        self.assertEqual(output.getvalue().count('1 open tasks stay in'), 2)
+        self.assert_counter_matches_rows(self.user)
+        
+        # The kept tasks stay writable where they are now
+        Task.objects.filter(pk__in=kept).update(status='completed')
+        self.assertEqual(partitioning.default_partition_rows(connection), len(kept))
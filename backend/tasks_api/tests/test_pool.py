@@ -0,0 +1,94 @@
+"""
+Tests for the psycopg2 connection pool behind the pooled PostgreSQL backend.
+"""
+
+import threading
+from unittest import mock, skipUnless
+
+import psycopg2
+from django.db import connection
+from django.test import SimpleTestCase
+
+from taskmanager_project.pooled_postgresql import pool as pool_module
+from taskmanager_project.pooled_postgresql.pool import ConnectionPool, PoolTimeout
+
+
+@skipUnless(connection.vendor == 'postgresql', 'PostgreSQL connections')
+class ConnectionPoolTests(SimpleTestCase):
+    databases = {'default'}
+    
+    def make_pool(self, **options):
+        params = connection.get_connection_params()
+        opened = []
+        
+        def connect():
+            opened.append(psycopg2.connect(**params))
+            return opened[-1]
+        
+        # Close the connections the tests keep checked out too
+        self.addCleanup(lambda: [raw.close() for raw in opened])
+        return ConnectionPool(connect, **options)
+    
+    def test_checkout_times_out_when_full(self):
+        pool = self.make_pool(max_size=1, timeout=0.1)
+        pooled = pool.getconn()
+        with self.assertRaises(PoolTimeout):
+            pool.getconn()
+        self.assertEqual((pool.stats.waits, pool.stats.timeouts), (1, 1))
+        pool.putconn(pooled)
+        self.assertIs(pool.getconn(), pooled)
+    
+    def test_waiting_checkout_gets_returned_connection(self):
+        pool = self.make_pool(max_size=1, timeout=5)
+        pooled = pool.getconn()
+        timer = threading.Timer(0.1, pool.putconn, [pooled])
+        timer.start()
+        self.addCleanup(timer.join)
+        self.assertIs(pool.getconn(), pooled)
+        self.assertEqual(pool.stats.timeouts, 0)
+    
+    def test_closed_connection_is_discarded(self):
+        pool = self.make_pool()
+        pooled = pool.getconn()
+        pooled.connection.close()
+        pool.putconn(pooled)
+        self.assertEqual(pool.snapshot()['size'], 0)
+        self.assertIsNot(pool.getconn(), pooled)
+    
+    def test_broken_connection_is_discarded_on_checkout(self):
+        pool = self.make_pool(check=True)
+        pooled = pool.getconn()
+        backend_pid = pooled.connection.get_backend_pid()
+        pool.putconn(pooled)
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT pg_terminate_backend(%s)', [backend_pid])
+        fresh = pool.getconn()
+        self.assertIsNot(fresh, pooled)
+        self.assertNotEqual(fresh.connection.get_backend_pid(), backend_pid)
+        self.assertEqual(pool.stats.connections_discarded, 1)
+    
+    def test_open_transaction_is_rolled_back_on_return(self):
+        pool = self.make_pool()
+        pooled = pool.getconn()
+        with pooled.connection.cursor() as cursor:
+            cursor.execute('CREATE TEMPORARY TABLE pool_probe (id int)')
+        pool.putconn(pooled)
+        self.assertIs(pool.getconn(), pooled)
+        with pooled.connection.cursor() as cursor:
+            cursor.execute("SELECT to_regclass('pg_temp.pool_probe')")
+            self.assertIsNone(cursor.fetchone()[0])
+    
+    def test_pools_reset_in_forked_process(self):
+        key = ('pool-test', 'fork')
+        
+        def factory():
+            return ConnectionPool(connect=None)
+        
+        self.addCleanup(pool_module._pools.pop, key, None)
+        parent = pool_module.get_pool(key, factory)
+        self.assertIs(pool_module.get_pool(key, factory), parent)
+        with mock.patch.object(pool_module.os, 'getpid', return_value=-1):
+            child = pool_module.get_pool(key, factory)
+        self.assertIsNot(child, parent)
+        # Back in the parent process the pools are reset once more
+        self.assertIsNot(pool_module.get_pool(key, factory), child)
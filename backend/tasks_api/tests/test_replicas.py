@@ -0,0 +1,91 @@
+"""
+Tests for read-replica routing, with a second connection to the test database as the replica.
+"""
+
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connections
+from django.test import TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from taskmanager_project import db_routers
+from taskmanager_project.db_routers import ReplicaLagMonitor, lag_monitor
+from tasks_api.models import Task
+
+REPLICA = 'replica1'
+
+
+class ReplicaRoutingTests(TransactionTestCase):
+    
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # A second connection to the test database stands in for a replica: it
+        # sees the rows the tests commit through the primary connection
+        connections.settings[REPLICA] = dict(connections['default'].settings_dict)
+    
+    @classmethod
+    def tearDownClass(cls):
+        connections[REPLICA].close()
+        del connections[REPLICA]
+        del connections.settings[REPLICA]
+        super().tearDownClass()
+    
+    def setUp(self):
+        cache.clear()
+        lag_monitor.reset()
+        self.user = User.objects.create_user('alice', password='x')
+        Task.objects.create(user=self.user, title='task')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+    
+    def read(self, url, **extra):
+        """(queries on the primary, queries on the replica) that read tasks while serving `url`"""
+        with CaptureQueriesContext(connections['default']) as primary, \
+                CaptureQueriesContext(connections[REPLICA]) as replica:
+            response = self.client.get(url, **extra)
+            self.assertEqual(response.status_code, 200, url)
+            if response.streaming:
+                b''.join(response.streaming_content)
+        table = connections['default'].ops.quote_name(Task._meta.db_table)
+        
+        def task_reads(queries):
+            return [query['sql'] for query in queries.captured_queries if f'FROM {table}' in query['sql']]
+        
+        return task_reads(primary), task_reads(replica)
+    
+    def test_safe_reads_use_the_replica(self):
+        primary, replica = self.read('/api/tasks/')
+        self.assertEqual(primary, [])
+        self.assertTrue(replica)
+    
+    def test_write_pins_the_user_to_the_primary(self):
+        response = self.client.post('/api/tasks/', {'title': 'new'}, format='json')
+        self.assertEqual(response.status_code, 201)
+        primary, replica = self.read('/api/tasks/')
+        self.assertTrue(primary)
+        self.assertEqual(replica, [])
+    
+    def test_streamed_exports_read_from_the_replica(self):
+        for url in ('/api/tasks/export/', '/api/tasks/export/?format=csv', '/api/tasks/overdue/?format=csv'):
+            primary, replica = self.read(url)
+            self.assertEqual(primary, [], url)
+            self.assertTrue(replica, url)
+            self.assertIsNone(db_routers._state.get())
+    
+    def test_lagging_replica_is_skipped(self):
+        with mock.patch.object(ReplicaLagMonitor, 'lag', return_value=60.0), \
+                self.assertLogs(db_routers.logger, 'WARNING'):
+            primary, replica = self.read('/api/tasks/')
+        self.assertTrue(primary)
+        self.assertEqual(replica, [])
+    
+    def test_replica_not_streaming_is_skipped(self):
+        with mock.patch.object(ReplicaLagMonitor, 'lag', return_value=None), \
+                self.assertLogs(db_routers.logger, 'WARNING'):
+            primary, replica = self.read('/api/tasks/')
+        self.assertTrue(primary)
+        self.assertEqual(replica, [])
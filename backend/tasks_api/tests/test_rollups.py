@@ -0,0 +1,183 @@
+"""
+Tests for the daily rollups kept by the write bookkeeping and the
+analytics endpoint served from them.
+"""
+
+from datetime import datetime, timedelta, timezone as dt_timezone
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase, TestCase
+from rest_framework.test import APIClient
+
+from tasks_api.models import Task, TaskDailyRollup
+from tasks_api.tests.test_counters import CounterAssertions
+
+
+def at(moment):
+    """Run writes as if it were `moment` (created_at, completed_at, ...)"""
+    return mock.patch('django.utils.timezone.now', return_value=moment)
+
+
+class RollupWriteTests(CounterAssertions, TestCase):
+    now = datetime(2024, 3, 6, 9, 0, tzinfo=dt_timezone.utc)
+    
+    def setUp(self):
+        self.user = User.objects.create_user('alice', password='x')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        with at(self.now - timedelta(days=3)):
+            self.tasks = [Task.objects.create(user=self.user, title=f'task {n}') for n in range(3)]
+        with at(self.now - timedelta(days=2, hours=20)):
+            self.tasks[0].status = 'completed'
+            self.tasks[0].save()
+    
+    def assert_matches_rows(self):
+        self.assert_counter_matches_rows(self.user)
+        self.assert_rollups_match_rows(self.user)
+    
+    def test_signal_writes(self):
+        with at(self.now):
+            task = Task.objects.get(pk=self.tasks[1].pk)
+            task.status = 'completed'
+            task.save()
+            self.tasks[0].status = 'pending'
+            self.tasks[0].save()
+            self.tasks[2].title = 'renamed'
+            self.tasks[2].save()
+            Task.objects.create(user=self.user, title='new')
+        self.assert_matches_rows()
+        with at(self.now + timedelta(days=1)):
+            self.tasks[0].status = 'completed'
+            self.tasks[0].save()
+            task.delete()
+        self.assert_matches_rows()
+    
+    def test_bulk(self):
+        with at(self.now):
+            response = self.client.post('/api/tasks/bulk/', {
+                'create': [{'title': 'new'}, {'title': 'other'}],
+                'update': [
+                    {'id': self.tasks[1].pk, 'status': 'completed'},
+                    {'id': self.tasks[0].pk, 'status': 'pending'},
+                ],
+                'delete': [self.tasks[2].pk],
+            }, format='json')
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assert_matches_rows()
+    
+    def test_transition(self):
+        ids = [task.pk for task in self.tasks]
+        with at(self.now):
+            response = self.client.post('/api/tasks/transition/', {'status': 'completed', 'ids': ids}, format='json')
+        self.assertEqual(response.data['updated'], 2)
+        self.assert_matches_rows()
+        with at(self.now + timedelta(hours=1)):
+            self.client.post('/api/tasks/transition/', {'status': 'cancelled', 'ids': ids[:2]}, format='json')
+        self.assert_matches_rows()
+    
+    def test_import(self):
+        with at(self.now):
+            response = self.client.post('/api/tasks/import/', {
+                'file': SimpleUploadedFile('tasks.csv', b'title,priority\nfirst,high\nsecond,low\n'),
+            }, format='multipart')
+        self.assertEqual(response.data['imported'], 2)
+        with at(self.now + timedelta(days=1)):
+            self.client.post('/api/tasks/transition/?priority=high', {'status': 'completed'}, format='json')
+        self.assert_matches_rows()
+    
+    def test_delete(self):
+        with at(self.now):
+            self.client.patch(f'/api/tasks/{self.tasks[1].pk}/mark_completed/')
+            response = self.client.delete(f'/api/tasks/{self.tasks[0].pk}/')
+        self.assertEqual(response.status_code, 204)
+        self.assert_matches_rows()
+        Task.objects.filter(user=self.user).delete()
+        self.assert_matches_rows()
+        self.assertFalse(TaskDailyRollup.compute_for(self.user.pk))
+
+
+class MedianHoursTests(SimpleTestCase):
+
+    def histogram(self, **counts):
+        histogram = TaskDailyRollup.empty_histogram()
+        for bucket, count in counts.items():
+            histogram[int(bucket.lstrip('b'))] = count
+        return histogram
+    
+    def test_no_completions(self):
+        self.assertIsNone(TaskDailyRollup.median_hours(self.histogram()))
+    
+    def test_interpolated_within_bucket(self):
+        self.assertEqual(TaskDailyRollup.median_hours(self.histogram(b0=2)), 0.5)
+        # 1-4 hours: halfway through the two tasks in it
+        self.assertEqual(TaskDailyRollup.median_hours(self.histogram(b1=4)), 2.5)
+        # The middle of three tasks is the one in the 24-48 hour bucket
+        self.assertEqual(TaskDailyRollup.median_hours(self.histogram(b1=1, b4=1, b6=1)), 36.0)
+        self.assertEqual(TaskDailyRollup.median_hours(self.histogram(b0=1, b3=1)), 1.0)
+    
+    def test_open_ended_bucket(self):
+        self.assertEqual(TaskDailyRollup.median_hours(self.histogram(b0=1, b9=3)), 720.0)
+
+
+class AnalyticsTests(TestCase):
+    url = '/api/tasks/analytics/'
+    
+    def setUp(self):
+        self.user = User.objects.create_user('alice', password='x')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        # (created, completed) in UTC; days are cut in Europe/Istanbul
+        for created, completed in [
+            (datetime(2024, 3, 4, 9), datetime(2024, 3, 4, 11)),
+            (datetime(2024, 3, 4, 9), datetime(2024, 3, 6, 9)),
+            (datetime(2024, 3, 5, 9), None),
+            (datetime(2024, 2, 28, 9), datetime(2024, 3, 5, 9)),
+        ]:
+            with at(created.replace(tzinfo=dt_timezone.utc)):
+                task = Task.objects.create(user=self.user, title='task')
+            if completed:
+                with at(completed.replace(tzinfo=dt_timezone.utc)):
+                    task.status = 'completed'
+                    task.save()
+        with at(datetime(2024, 3, 4, 9, tzinfo=dt_timezone.utc)):
+            Task.objects.create(user=User.objects.create_user('bob'), title='not mine')
+    
+    def get(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+    
+    def test_days(self):
+        data = self.get(period='day', **{'from': '2024-03-04', 'to': '2024-03-06'})
+        self.assertEqual(data['series'], [
+            {'start': '2024-03-04', 'created': 2, 'completed': 1, 'median_hours': 2.5},
+            {'start': '2024-03-05', 'created': 1, 'completed': 1, 'median_hours': 120.0},
+            {'start': '2024-03-06', 'created': 0, 'completed': 1, 'median_hours': 36.0},
+        ])
+        self.assertEqual(data['summary'], {'created': 3, 'completed': 3, 'median_hours': 36.0})
+        self.assertEqual(
+            [bucket['count'] for bucket in data['completion_histogram']], [0, 1, 0, 0, 1, 0, 1, 0, 0, 0]
+        )
+        self.assertIsNone(data['completion_histogram'][-1]['max_hours'])
+    
+    def test_weeks_and_months(self):
+        data = self.get(period='week', **{'from': '2024-02-26', 'to': '2024-03-10'})
+        self.assertEqual(
+            [(entry['start'], entry['created'], entry['completed']) for entry in data['series']],
+            [('2024-02-26', 1, 0), ('2024-03-04', 3, 3)],
+        )
+        data = self.get(**{'from': '2024-02-01', 'to': '2024-03-31'})
+        self.assertEqual(data['period'], 'month')
+        self.assertEqual(
+            [(entry['start'], entry['created'], entry['completed']) for entry in data['series']],
+            [('2024-02-01', 1, 0), ('2024-03-01', 3, 3)],
+        )
+    
+    def test_invalid_parameters(self):
+        for params in [{'period': 'year'}, {'from': '2024-03-06', 'to': '2024-03-04'}, {'to': 'tomorrow'}]:
+            with self.subTest(params=params):
+                response = self.client.get(self.url, params)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('error', response.json())
@@ -0,0 +1,57 @@
+"""
+Tests for the task search filter: full-text word-prefix search on PostgreSQL, icontains elsewhere.
+"""
+
+from unittest import skipUnless
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from tasks_api.models import Task
+
+
+class SearchTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user('alice', password='x')
+        other = User.objects.create_user('bob', password='x')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.tasks = {
+            title: Task.objects.create(user=self.user, title=title, description=description)
+            for title, description in (
+                ('Write quarterly report', 'the report is due on Friday'),
+                ('Reporting dashboard', 'numbers for the quarterly review'),
+                ('Buy milk', 'and bread'),
+                ('C++ notes', ''),
+            )
+        }
+        Task.objects.create(user=other, title='Report of someone else')
+    
+    def search(self, term, **params):
+        response = self.client.get('/api/tasks/', {'search': term, **params})
+        self.assertEqual(response.status_code, 200)
+        return [task['title'] for task in response.data['results']]
+    
+    def test_matches_title_and_description_words(self):
+        self.assertEqual(set(self.search('rep')), {'Write quarterly report', 'Reporting dashboard'})
+        self.assertEqual(self.search('bread'), ['Buy milk'])
+        self.assertEqual(set(self.search('quarterly report')), {'Write quarterly report', 'Reporting dashboard'})
+        self.assertEqual(self.search('milk dashboard'), [])
+    
+    def test_terms_without_words_fall_back_to_substrings(self):
+        self.assertEqual(self.search('++'), ['C++ notes'])
+        self.assertEqual(self.search('-'), [])
+    
+    @skipUnless(connection.vendor == 'postgresql', 'PostgreSQL full-text search')
+    def test_full_text_search(self):
+        # Terms match the start of words, not any substring
+        self.assertEqual(self.search('port'), [])
+        # Ranked by relevance unless an ordering is requested (newest first otherwise)
+        self.assertEqual(self.search('REPORT'), ['Write quarterly report', 'Reporting dashboard'])
+        self.assertEqual(self.search('report', ordering='-created_at'), ['Reporting dashboard', 'Write quarterly report'])
+        # Quotes and tsquery operators in terms are only word separators
+        self.assertEqual(self.search("milk' | 'bread"), ['Buy milk'])
+        self.assertEqual(self.search('!milk'), ['Buy milk'])
@@ -0,0 +1,40 @@
+"""
+Tests for the values()-based task read serializer.
+"""
+
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.utils import timezone
+
+from tasks_api.models import Task
+from tasks_api.serializers import TaskReadSerializer, TaskSerializer
+
+
+class TaskReadSerializerTests(TestCase):
+
+    def setUp(self):
+        user = User.objects.create_user('alice', password='x')
+        now = timezone.now()
+        for n, due_date in enumerate([None, now - timedelta(days=3, hours=2), now + timedelta(days=2, hours=5)]):
+            for task_status in ('pending', 'completed'):
+                Task.objects.create(user=user, title=f'task {n}', status=task_status, due_date=due_date)
+        self.queryset = Task.objects.order_by('id')
+    
+    def test_same_output_as_model_serializer(self):
+        now = timezone.now()
+        with mock.patch('django.utils.timezone.now', return_value=now):
+            expected = TaskSerializer(self.queryset, many=True).data
+        rows = self.queryset.values(*TaskReadSerializer.columns)
+        self.assertEqual(TaskReadSerializer(rows, now=now).data, [dict(item) for item in expected])
+    
+    def test_sparse_fields(self):
+        now = timezone.now()
+        fields = ['id', 'is_overdue', 'created_at']
+        with mock.patch('django.utils.timezone.now', return_value=now):
+            expected = TaskSerializer(self.queryset, many=True, fields=fields).data
+        rows = self.queryset.values(*TaskReadSerializer.columns_for(fields))
+        self.assertEqual(TaskReadSerializer(rows, now=now, fields=fields).data, [dict(item) for item in expected])
+        self.assertEqual(TaskReadSerializer.columns_for(fields), ['id', 'status', 'due_date', 'created_at'])
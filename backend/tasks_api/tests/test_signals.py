@@ -0,0 +1,85 @@
+"""
+Tests for the signal bookkeeping of single-object task writes.
+"""
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from tasks_api.models import Task, TaskCounter, TaskDailyRollup, TaskTombstone
+from tasks_api.tests.test_counters import CounterAssertions
+
+
+class UserDeletionTests(TestCase):
+    """Deleting users cascades to their tasks without per-task bookkeeping"""
+    
+    def setUp(self):
+        self.user = User.objects.create_user('alice', password='x')
+        self.other = User.objects.create_user('bob', password='x')
+        for user in (self.user, self.other):
+            Task.objects.create(user=user, title='first')
+            Task.objects.create(user=user, title='second', status='completed')
+    
+    def assert_user_gone(self, user_id):
+        # Deferred foreign keys are only checked at commit, which TestCase never reaches
+        connection.check_constraints()
+        self.assertFalse(Task.objects.filter(user_id=user_id).exists())
+        self.assertFalse(TaskTombstone.objects.filter(user_id=user_id).exists())
+        self.assertFalse(TaskDailyRollup.objects.filter(user_id=user_id).exists())
+        self.assertFalse(TaskCounter.objects.filter(user_id=user_id).exists())
+    
+    def test_instance_delete(self):
+        user_id = self.user.pk
+        self.user.delete()
+        self.assert_user_gone(user_id)
+    
+    def test_queryset_delete(self):
+        # What the admin's "delete selected users" action runs
+        User.objects.filter(pk=self.user.pk).delete()
+        self.assert_user_gone(self.user.pk)
+        self.assertEqual(TaskCounter.objects.get(user=self.other).total, 2)
+    
+    def test_delete_all_users(self):
+        User.objects.all().delete()
+        self.assert_user_gone(self.user.pk)
+        self.assert_user_gone(self.other.pk)
+    
+    def test_task_queryset_delete_still_tracked(self):
+        Task.objects.filter(user=self.user, title='first').delete()
+        counter = TaskCounter.objects.get(user=self.user)
+        self.assertEqual(counter.total, 1)
+        self.assertEqual(TaskTombstone.objects.filter(user=self.user).count(), 1)
+
+
+class OwnerChangeTests(CounterAssertions, TestCase):
+    """Moving a task to another user (the admin change form) moves its bookkeeping too"""
+    
+    def setUp(self):
+        self.user = User.objects.create_user('alice', password='x')
+        self.other = User.objects.create_user('bob', password='x')
+        self.task = Task.objects.create(user=self.user, title='task', status='completed')
+        Task.objects.create(user=self.user, title='kept')
+    
+    def test_reassign(self):
+        task = Task.objects.get(pk=self.task.pk)
+        task.user = self.other
+        with CaptureQueriesContext(connection) as queries:
+            task.save()
+        for user in (self.user, self.other):
+            self.assert_counter_matches_rows(user)
+            self.assert_rollups_match_rows(user)
+        self.assertEqual(TaskCounter.objects.get(user=self.other).total, 1)
+        tombstone = TaskTombstone.objects.get(user=self.user)
+        self.assertEqual(tombstone.task_id, task.pk)
+        self.assertEqual(tombstone.change_seq, TaskCounter.objects.get(user=self.user).version)
+        self.assertEqual(task.change_seq, TaskCounter.objects.get(user=self.other).version)
+        locks = [
+            query['sql'] for query in queries.captured_queries
+            if 'FOR UPDATE' in query['sql'] and TaskCounter._meta.db_table in query['sql']
+        ]
+        if locks:
+            # Both counter rows, in user id order
+            self.assertEqual(len(locks), 2)
+            self.assertIn(f'"user_id" = {self.user.pk} ', locks[0])
+            self.assertIn(f'"user_id" = {self.other.pk} ', locks[1])
@@ -0,0 +1,55 @@
+"""
+Tests for the task statistics endpoint.
+"""
+
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from tasks_api.models import Task
+
+
+class StatsTests(TestCase):
+    url = '/api/tasks/stats/'
+    
+    def setUp(self):
+        self.user = User.objects.create_user('alice', password='x')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        now = timezone.now()
+        for n in range(10):
+            Task.objects.create(
+                user=self.user,
+                title=f'task {n}',
+                status=['pending', 'in_progress', 'completed'][n % 3],
+                priority='high' if n < 4 else 'low',
+                due_date=now - timedelta(days=1) if n % 2 else None,
+            )
+    
+    def test_query_count_does_not_grow_with_tasks(self):
+        with self.assertNumQueries(2):
+            first = self.client.get(self.url)
+        Task.objects.bulk_create([Task(user=self.user, title=f'more {n}') for n in range(50)])
+        with self.assertNumQueries(2):
+            self.client.get(self.url)
+        self.assertEqual(first.status_code, 200)
+    
+    def test_values(self):
+        data = self.client.get(self.url).data
+        self.assertEqual(data['total_tasks'], 10)
+        self.assertEqual(
+            (data['pending_tasks'], data['in_progress_tasks'], data['completed_tasks']), (4, 3, 3)
+        )
+        # Odd-numbered tasks are a day overdue; task 5 is completed and does not count
+        self.assertEqual(data['overdue_tasks'], 4)
+        self.assertEqual(data['completion_rate'], 30.0)
+        self.assertEqual(data['priority_stats'], [{'priority': 'low', 'count': 6}, {'priority': 'high', 'count': 4}])
+    
+    def test_revalidation_is_one_query(self):
+        etag = self.client.get(self.url)['ETag']
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
@@ -0,0 +1,75 @@
+"""
+Tests for the paged delta sync endpoint.
+"""
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from tasks_api.models import Task, TaskCounter
+
+
+@override_settings(TASK_SYNC_PAGE_SIZE=2)
+class SyncTests(TestCase):
+    url = '/api/tasks/changes/'
+    
+    def setUp(self):
+        self.user = User.objects.create_user('alice', password='x')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.tasks = [Task.objects.create(user=self.user, title=f'task {n}') for n in range(5)]
+    
+    def sync(self, since=None, during=None):
+        """Follow the pages of one sync: (token, task ids, deleted ids, pages)"""
+        response = self.client.get(self.url, {} if since is None else {'since': since})
+        token, tasks, deleted, pages = response.data['token'], [], [], 0
+        while True:
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.data['token'], token)
+            tasks += [task['id'] for task in response.data['tasks']]
+            deleted += response.data['deleted']
+            pages += 1
+            if not response.data['next']:
+                return token, tasks, deleted, pages
+            if during is not None:
+                during()
+                during = None
+            response = self.client.get(response.data['next'])
+    
+    def test_full_sync_pages(self):
+        token, tasks, deleted, pages = self.sync()
+        self.assertEqual(tasks, [task.pk for task in self.tasks])
+        self.assertEqual((deleted, pages), ([], 3))
+        self.assertEqual(token, str(TaskCounter.objects.get(user=self.user).version))
+    
+    def test_delta_pages_changes_and_deletions(self):
+        token, *_ = self.sync()
+        for task in self.tasks[:3]:
+            task.title += ' edited'
+            task.save()
+        deleted_ids = [task.pk for task in self.tasks[3:]]
+        Task.objects.filter(pk__in=deleted_ids).delete()
+        new_token, tasks, deleted, pages = self.sync(token)
+        self.assertEqual(tasks, [task.pk for task in self.tasks[:3]])
+        self.assertEqual(sorted(deleted), deleted_ids)
+        self.assertEqual(pages, 2)
+        self.assertEqual(self.sync(new_token)[1:], ([], [], 1))
+    
+    def test_writes_while_paging_wait_for_the_next_sync(self):
+        def edit():
+            # One task already sent, one not yet
+            for task in (self.tasks[0], self.tasks[4]):
+                task.title += ' edited'
+                task.save()
+        
+        token, tasks, _deleted, _pages = self.sync(during=edit)
+        self.assertEqual(tasks, [task.pk for task in self.tasks[:4]])
+        self.assertEqual(self.sync(token)[1], [self.tasks[0].pk, self.tasks[4].pk])
+    
+    def test_invalid_and_expired(self):
+        self.assertEqual(self.client.get(self.url, {'since': 'x'}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {'cursor': 'not-a-cursor'}).status_code, 400)
+        next_url = self.client.get(self.url, {'since': 0}).data['next']
+        TaskCounter.objects.filter(user=self.user).update(sync_horizon=3)
+        self.assertEqual(self.client.get(self.url, {'since': 0}).status_code, 410)
+        self.assertEqual(self.client.get(next_url).status_code, 410)
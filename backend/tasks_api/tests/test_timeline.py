@@ -0,0 +1,41 @@
+"""
+Tests for the task timeline endpoint.
+"""
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from tasks_api.models import Task
+
+
+class TimelineTests(TestCase):
+
+    def setUp(self):
+        user = User.objects.create_user('alice', password='x')
+        self.client = APIClient()
+        self.client.force_authenticate(user)
+        self.task = Task.objects.create(user=user, title='task')
+    
+    def test_transitions(self):
+        self.client.patch(f'/api/tasks/{self.task.pk}/mark_in_progress/')
+        self.client.patch(f'/api/tasks/{self.task.pk}/mark_completed/')
+        self.task.status = 'pending'
+        self.task.save()
+        data = self.client.get(f'/api/tasks/{self.task.pk}/timeline/').data
+        self.assertEqual(
+            [(transition['from'], transition['to']) for transition in data['transitions']],
+            [('pending', 'in_progress'), ('in_progress', 'completed'), ('completed', 'pending')],
+        )
+        self.assertEqual(data['reopened'], 1)
+        self.assertEqual(set(data['time_in_status']), {'pending', 'in_progress', 'completed'})
+    
+    def test_datetimes_match_other_endpoints(self):
+        self.client.patch(f'/api/tasks/{self.task.pk}/mark_completed/')
+        detail = self.client.get(f'/api/tasks/{self.task.pk}/').data
+        timeline = self.client.get(f'/api/tasks/{self.task.pk}/timeline/').data
+        self.assertEqual(timeline['created_at'], detail['created_at'])
+        self.assertIsInstance(timeline['completed_at'], str)
+        # TIME_ZONE offset, not UTC 'Z'
+        self.assertEqual(timeline['transitions'][0]['at'][-6:], detail['updated_at'][-6:])
+        self.assertFalse(timeline['transitions'][0]['at'].endswith('Z'))
@@ -0,0 +1,57 @@
+"""
+Tests for the bulk status transition endpoint.
+"""
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from tasks_api.models import Task, TaskCounter
+
+
+class TransitionTests(TestCase):
+    url = '/api/tasks/transition/'
+    
+    def setUp(self):
+        self.user = User.objects.create_user('alice', password='x')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.tasks = [Task.objects.create(user=self.user, title=f'task {n}') for n in range(3)]
+    
+    def test_blank_filters_select_nothing(self):
+        for query in ('?search=', '?search=%20', '?status=&priority=', '?ordering=title'):
+            response = self.client.post(self.url + query, {'status': 'cancelled'}, format='json')
+            self.assertEqual(response.status_code, 400, query)
+        self.assertFalse(Task.objects.filter(status='cancelled').exists())
+    
+    def test_filter_selects_tasks(self):
+        Task.objects.filter(pk=self.tasks[0].pk).update(priority='high')
+        response = self.client.post(self.url + '?priority=high', {'status': 'cancelled'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['ids'], [self.tasks[0].pk])
+        counter = TaskCounter.objects.get(user=self.user)
+        self.assertEqual((counter.status_pending, counter.status_cancelled), (2, 1))
+    
+    def test_non_object_body(self):
+        response = self.client.post(self.url, [{'status': 'cancelled'}], format='json')
+        self.assertEqual(response.status_code, 400)
+    
+    def test_invalid_ids(self):
+        # true == 1, so a boolean would otherwise select task 1
+        for ids in ([True], [self.tasks[0].pk, False], ['1'], [1.0], self.tasks[0].pk):
+            response = self.client.post(self.url, {'status': 'cancelled', 'ids': ids}, format='json')
+            self.assertEqual(response.status_code, 400, ids)
+        self.assertFalse(Task.objects.filter(status='cancelled').exists())
+    
+    def test_counter_locked_before_tasks(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(
+                self.url, {'status': 'completed', 'ids': [task.pk for task in self.tasks]}, format='json'
+            )
+        self.assertEqual(response.data['updated'], 3)
+        locks = [query['sql'] for query in queries.captured_queries if 'FOR UPDATE' in query['sql']]
+        if not locks:
+            self.skipTest(f'{connection.vendor} does not lock rows')
+        self.assertIn(TaskCounter._meta.db_table, locks[0])
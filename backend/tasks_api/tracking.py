@@ -0,0 +1,232 @@
+"""
+Bookkeeping for Task writes.
+
+Every write path (model signals for single-object saves, explicit calls
+from bulk paths) funnels through these functions so derived data such as
+the per-user counters and daily rollups stays in step with the Task table.
+All of them run inside the write's transaction, after the user's counter
+row was locked by TaskCounter.next_change_seq, so a user's bookkeeping
+updates never interleave.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import TaskCounter, TaskDailyRollup, TaskStatusChange, TaskTombstone
+from .events import publish_task_event
+
+
+_signals_muted = ContextVar('task_tracking_signals_muted', default=False)
+
+
+@contextmanager
+def bulk_tracking():
+    """
+    Mute the per-object signal bookkeeping for bulk write paths, which call
+    the track_* functions once for the whole batch instead.
+    """
+    token = _signals_muted.set(True)
+    try:
+        yield
+    finally:
+        _signals_muted.reset(token)
+
+
+def signals_muted():
+    """Whether single-object signal bookkeeping is currently muted"""
+    return _signals_muted.get()
+
+
+# Task fields the bookkeeping depends on: the owner, counter fields, rollup
+# timestamps and the id the status history refers to
+STATE_FIELDS = ('id', 'user_id') + TaskCounter.TRACKED_FIELDS + ('created_at', 'completed_at')
+
+
+def task_state(task):
+    """Snapshot of the tracked fields of a task (instance or values dict)"""
+    if isinstance(task, dict):
+        return {field: task[field] for field in STATE_FIELDS}
+    return {field: getattr(task, field) for field in STATE_FIELDS}
+
+
+def _add_state(deltas, state, sign):
+    deltas['total'] = deltas.get('total', 0) + sign
+    for field in TaskCounter.TRACKED_FIELDS:
+        column = TaskCounter.column_for(field, state[field])
+        deltas[column] = deltas.get(column, 0) + sign
+
+
+def _add_rollup(rollups, state, sign):
+    """Add (or, with sign -1, remove) a task's created/completed contribution"""
+    created_at, completed_at = state['created_at'], state['completed_at']
+    _rollup_delta(rollups, TaskDailyRollup.day_of(created_at))['created'] += sign
+    if completed_at is not None:
+        delta = _rollup_delta(rollups, TaskDailyRollup.day_of(completed_at))
+        delta['completed'] += sign
+        bucket = TaskDailyRollup.duration_bucket(created_at, completed_at)
+        delta['histogram'][bucket] = delta['histogram'].get(bucket, 0) + sign
+
+
+def _rollup_delta(rollups, day):
+    if day not in rollups:
+        rollups[day] = {'created': 0, 'completed': 0, 'histogram': {}}
+    return rollups[day]
+
+
+def _record_rollups(user_id, rollups):
+    """
+    Apply rollup deltas: one read of the affected days, then one bulk
+    insert and/or update.
+    """
+    rollups = {
+        day: delta for day, delta in rollups.items()
+        if delta['created'] or delta['completed'] or any(delta['histogram'].values())
+    }
+    if not rollups:
+        return
+    existing = {
+        rollup.day: rollup
+        for rollup in TaskDailyRollup.objects.filter(user_id=user_id, day__in=list(rollups))
+    }
+    size = len(TaskDailyRollup.empty_histogram())
+    new, changed = [], []
+    for day, delta in rollups.items():
+        rollup = existing.get(day)
+        if rollup is None:
+            rollup = TaskDailyRollup(user_id=user_id, day=day)
+            new.append(rollup)
+        else:
+            changed.append(rollup)
+        histogram = (rollup.completion_histogram or []) + [0] * size
+        histogram = histogram[:size]
+        for bucket, count in delta['histogram'].items():
+            histogram[bucket] += count
+        rollup.created += delta['created']
+        rollup.completed += delta['completed']
+        rollup.completion_histogram = histogram
+    if new:
+        TaskDailyRollup.objects.bulk_create(new, batch_size=1000)
+    if changed:
+        TaskDailyRollup.objects.bulk_update(changed, ['created', 'completed', 'completion_histogram'], batch_size=1000)
+
+
+def _record_status_changes(user_id, changes):
+    """Append the status transitions among (before, after) pairs with one INSERT"""
+    now = timezone.now()
+    transitions = [
+        TaskStatusChange(
+            user_id=user_id, task_id=after['id'],
+            from_status=before['status'], to_status=after['status'], changed_at=now,
+        )
+        for before, after in changes
+        if before['status'] != after['status']
+    ]
+    if transitions:
+        TaskStatusChange.objects.bulk_create(transitions, batch_size=1000)
+
+
+def _record_change(user_id, deltas, seq=None):
+    """
+    Apply counter deltas and advance the user's change version to `seq`
+    (allocated with TaskCounter.next_change_seq) with a single UPDATE of
+    the counter row.
+    """
+    TaskCounter.objects.filter(user_id=user_id).update(
+        version=F('version') + 1 if seq is None else seq,
+        updated_at=timezone.now(),
+        **{column: F(column) + delta for column, delta in deltas.items() if delta}
+    )
+
+
+def _publish_on_commit(user_id, kind, count, seq):
+    """Push a change event to the user's open streams once the write commits"""
+    event = {'event': kind, 'count': count, 'token': None if seq is None else str(seq)}
+    transaction.on_commit(lambda: publish_task_event(user_id, event), robust=True)
+
+
+def track_created(user_id, states, seq=None):
+    """Record newly created tasks for a user"""
+    deltas, rollups = {}, {}
+    for state in states:
+        _add_state(deltas, state, 1)
+        _add_rollup(rollups, state, 1)
+    if deltas:
+        _record_change(user_id, deltas, seq)
+        _record_rollups(user_id, rollups)
+        _publish_on_commit(user_id, 'created', deltas['total'], seq)
+
+
+def track_updated(user_id, changes, seq=None):
+    """Record updated tasks for a user, given (before, after) state pairs"""
+    if not changes:
+        return
+    deltas, rollups = {}, {}
+    for before, after in changes:
+        if before == after:
+            continue
+        _add_state(deltas, before, -1)
+        _add_state(deltas, after, 1)
+        if before['completed_at'] != after['completed_at']:
+            _add_rollup(rollups, before, -1)
+            _add_rollup(rollups, after, 1)
+    _record_change(user_id, deltas, seq)
+    _record_rollups(user_id, rollups)
+    _record_status_changes(user_id, changes)
+    _publish_on_commit(user_id, 'updated', len(changes), seq)
+
+
+def track_deleted(user_id, deleted, seq=None):
+    """
+    Record deleted tasks for a user, given {task_id: state}, and leave a
+    tombstone for each of them.
+    """
+    if not deleted:
+        return
+    if seq is None:
+        seq = TaskCounter.next_change_seq(user_id)
+    deltas, rollups = {}, {}
+    for state in deleted.values():
+        _add_state(deltas, state, -1)
+        _add_rollup(rollups, state, -1)
+    TaskTombstone.objects.bulk_create([
+        TaskTombstone(user_id=user_id, task_id=task_id, change_seq=seq) for task_id in deleted
+    ], batch_size=1000)
+    _record_change(user_id, deltas, seq)
+    _record_rollups(user_id, rollups)
+    _publish_on_commit(user_id, 'deleted', len(deleted), seq)
+
+
+def track_archived(user_id, task_ids, seq=None):
+    """
+    Record tasks moved to the archive. They keep counting in the counters
+    and rollups, but leave the live task set, so delta sync clients get a
+    tombstone for each of them as for a deletion.
+    """
+    if not task_ids:
+        return
+    if seq is None:
+        seq = TaskCounter.next_change_seq(user_id)
+    TaskTombstone.objects.bulk_create([
+        TaskTombstone(user_id=user_id, task_id=task_id, change_seq=seq) for task_id in task_ids
+    ], batch_size=1000)
+    _record_change(user_id, {}, seq)
+    _publish_on_commit(user_id, 'archived', len(task_ids), seq)
+
+
+def track_partition_archived(user_ids):
+    """
+    Record that the finished tasks of whole months were archived by
+    detaching a task table partition. Instead of a tombstone per task, each user's
+    sync horizon moves up to the new version, so delta sync clients holding
+    an older token fall back to a full sync. The caller holds the users'
+    counter row locks.
+    """
+    TaskCounter.objects.filter(user_id__in=user_ids).update(
+        version=F('version') + 1, sync_horizon=F('version') + 1, updated_at=timezone.now()
+    )
+    for user_id, version in TaskCounter.objects.filter(user_id__in=user_ids).values_list('user_id', 'version'):
+        _publish_on_commit(user_id, 'archived', None, version)
@@ -4,11 +4,12 @@ Task API URLs.
 
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import TaskViewSet
+from .views import TaskViewSet, task_events
 
 router = DefaultRouter()
 router.register(r'', TaskViewSet, basename='tasks')
 
 urlpatterns = [
+    path('events/', task_events, name='task-events'),
     path('', include(router.urls)),
 ]
@@ -2,30 +2,140 @@
 Task views for API.
 """
 
-from rest_framework import viewsets, filters, status
+import asyncio
+import base64
+import csv
+import json
+import zoneinfo
+
+from asgiref.sync import sync_to_async
+from rest_framework import viewsets, status
 from rest_framework.decorators import action
+from rest_framework.parsers import MultiPartParser
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Count, Q
+from rest_framework.settings import api_settings
+from rest_framework.exceptions import AuthenticationFailed, ValidationError
+from rest_framework.utils.urls import replace_query_param
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import Count, DateField, Q
+from django.db.models.functions import Trunc
+from django.http import JsonResponse, StreamingHttpResponse
 from django.utils import timezone
-from datetime import timedelta
+from datetime import date, datetime, time, timedelta
 
-from .models import Task
-from .serializers import TaskSerializer, TaskCreateSerializer
+from .models import ArchivedTask, Task, TaskCounter, TaskDailyRollup, TaskStatusChange, TaskTombstone
+from .serializers import TaskSerializer, TaskCreateSerializer, TaskReadSerializer
+from .pagination import TaskKeysetPagination
+from .filters import TaskFilterBackend, TaskFilterSet, TaskSearchFilter, TaskOrderingFilter
+from .conditional import conditional_task_view
+from .events import get_broker
+from .renderers import NDJSONRenderer, CSVRenderer
+from .importer import IMPORT_FORMATS, TaskImporter, open_text
+from taskmanager_project.db_routers import replica_reads
+from taskmanager_project.fastjson import dumps
+from . import tracking
 
+@replica_reads
 class TaskViewSet(viewsets.ModelViewSet):
     serializer_class = TaskSerializer
     permission_classes = [IsAuthenticated]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
-    filterset_fields = ['status', 'priority', 'category']
+    filter_backends = [TaskFilterBackend, TaskSearchFilter, TaskOrderingFilter]
+    filterset_class = TaskFilterSet
     search_fields = ['title', 'description']
-    ordering_fields = ['created_at', 'updated_at', 'due_date', 'priority', 'title']
+    ordering_fields = ['created_at', 'updated_at', 'due_date', 'days_until_due', 'priority', 'title']
     ordering = ['-created_at']
     
     def get_queryset(self):
         """Return tasks for the authenticated user"""
-        return Task.objects.filter(user=self.request.user)
+        queryset = Task.objects.filter(user=self.request.user)
+        if self.action == 'retrieve' and self.get_response_fields() is not None:
+            queryset = queryset.only(*TaskReadSerializer.columns_for(self.get_response_fields()))
+        return queryset
+    
+    def get_archived_queryset(self):
+        """
+        The user's archived tasks, filtered, searched and ordered like the
+        list, when the request asks for them with `?include_archived=true`;
+        None otherwise.
+        """
+        if self.request.query_params.get('include_archived') not in ('true', '1'):
+            return None
+        return self.filter_queryset(ArchivedTask.objects.filter(user=self.request.user))
+    
+    def get_response_fields(self):
+        """
+        Sparse fieldset from `?fields=a,b` or `?exclude=a,b`, in the regular
+        field order; None means every field.
+        """
+        if not hasattr(self, '_response_fields'):
+            params = self.request.query_params
+            available = TaskSerializer.Meta.fields
+            fields = None
+            for param in ('fields', 'exclude'):
+                value = params.get(param)
+                if not value:
+                    continue
+                names = {name.strip() for name in value.split(',') if name.strip()}
+                unknown = names - set(available)
+                if unknown:
+                    raise ValidationError({
+                        param: f"Unknown field(s): {', '.join(sorted(unknown))}. Available: {', '.join(available)}"
+                    })
+                if param == 'fields':
+                    fields = [name for name in available if name in names]
+                else:
+                    fields = [name for name in fields or available if name not in names]
+            self._response_fields = fields
+        return self._response_fields
+    
+    @property
+    def paginator(self):
+        """Use keyset pagination when the client opts in with ?pagination=cursor"""
+        if not hasattr(self, '_paginator') and TaskKeysetPagination.is_requested(self.request):
+            self._paginator = TaskKeysetPagination()
+        return super().paginator
+    
+    def get_task_counter(self):
+        """The user's TaskCounter row, read once per request"""
+        if not hasattr(self, '_task_counter'):
+            self._task_counter = TaskCounter.get_for_user(self.request.user.id)
+        return self._task_counter
+    
+    def read_response(self, queryset, paginate=True, archived=None):
+        """
+        Serialize a task queryset, followed by the `archived` task queryset
+        if one is given, through the fast read path
+        """
+        fields = self.get_response_fields()
+        columns = TaskReadSerializer.columns_for(fields)
+        now = timezone.now()
+        if paginate and isinstance(self.paginator, TaskKeysetPagination):
+            # Keyset cursors are built from the ordering column and id of each row
+            columns += [self.paginator.get_ordering(queryset).lstrip('-'), 'id']
+            querysets = [queryset.values(*columns)]
+            if archived is not None:
+                querysets.append(archived.values(*columns))
+            page = self.paginator.paginate_querysets(querysets, self.request, view=self)
+            return self.get_paginated_response(TaskReadSerializer(page, now=now, fields=fields).data)
+        
+        rows = _task_rows(queryset, columns, archived)
+        page = self.paginate_queryset(rows) if paginate else None
+        if page is not None:
+            return self.get_paginated_response(TaskReadSerializer(page, now=now, fields=fields).data)
+        return Response(TaskReadSerializer(rows, now=now, fields=fields).data)
+    
+    @conditional_task_view
+    def list(self, request, *args, **kwargs):
+        return self.read_response(self.filter_queryset(self.get_queryset()), archived=self.get_archived_queryset())
+    
+    @conditional_task_view
+    def retrieve(self, request, *args, **kwargs):
+        serializer = self.get_serializer(self.get_object(), fields=self.get_response_fields())
+        return Response(serializer.data)
     
     def get_serializer_class(self):
         """Use different serializer for create action"""
@@ -37,93 +147,762 @@ class TaskViewSet(viewsets.ModelViewSet):
         """Set the user when creating a task"""
         serializer.save(user=self.request.user)
     
-    @action(detail=True, methods=['patch'])
-    def mark_completed(self, request, pk=None):
-        """Mark a task as completed"""
+    def _set_status(self, new_status):
+        """Change one task's status, writing only status and updated_at"""
         task = self.get_object()
-        task.status = 'completed'
-        task.save()
+        if task.status != new_status:
+            task.status = new_status
+            task.save(update_fields=['status', 'updated_at'])
         serializer = self.get_serializer(task)
         return Response(serializer.data)
     
+    @action(detail=True, methods=['patch'])
+    def mark_completed(self, request, pk=None):
+        """Mark a task as completed"""
+        return self._set_status('completed')
+    
     @action(detail=True, methods=['patch'])
     def mark_in_progress(self, request, pk=None):
         """Mark a task as in progress"""
+        return self._set_status('in_progress')
+    
+    @action(detail=True, methods=['get'])
+    def timeline(self, request, pk=None):
+        """
+        Status history of a task: its transitions, the time spent in each
+        status (seconds, up to now for the current one) and how often it was
+        reopened after being completed.
+        """
         task = self.get_object()
-        task.status = 'in_progress'
-        task.save()
-        serializer = self.get_serializer(task)
-        return Response(serializer.data)
+        transitions = list(TaskStatusChange.objects.filter(task_id=task.id).order_by('changed_at', 'id').values(
+            'from_status', 'to_status', 'changed_at'
+        ))
+        
+        time_in_status = {}
+        current = transitions[0]['from_status'] if transitions else task.status
+        since = task.created_at
+        for transition in transitions:
+            seconds = (transition['changed_at'] - since).total_seconds()
+            time_in_status[current] = time_in_status.get(current, 0) + max(seconds, 0)
+            current, since = transition['to_status'], transition['changed_at']
+        time_in_status[current] = time_in_status.get(current, 0) + max((timezone.now() - since).total_seconds(), 0)
+        
+        # Rendered in the API's timezone like every other task timestamp
+        format_datetime = TaskReadSerializer([]).format_datetime
+        return Response({
+            'id': task.id,
+            'status': task.status,
+            'created_at': format_datetime(task.created_at),
+            'completed_at': format_datetime(task.completed_at),
+            'transitions': [
+                {
+                    'from': transition['from_status'],
+                    'to': transition['to_status'],
+                    'at': format_datetime(transition['changed_at']),
+                }
+                for transition in transitions
+            ],
+            'time_in_status': {name: round(seconds) for name, seconds in time_in_status.items()},
+            'reopened': sum(
+                1 for transition in transitions
+                if transition['from_status'] == 'completed' and transition['to_status'] != 'completed'
+            ),
+        })
+    
+    def _has_list_filter(self, request):
+        """Whether the query string narrows the task list (blank filters and searches do not)"""
+        params = request.query_params
+        if any(params.get(name, '').strip() for name in self.filterset_class.base_filters):
+            return True
+        return bool(TaskSearchFilter().get_search_terms(request))
+    
+    @action(detail=False, methods=['post'])
+    def transition(self, request):
+        """
+        Move many tasks to a new status with one UPDATE.
+        
+        Body: {"status": ..., "ids": [...], "overdue": true}. Tasks are selected by
+        `ids` and/or the list filters in the query string (status, priority,
+        category, is_overdue, due_within_days, created_after, created_before,
+        search); `overdue` narrows the selection to overdue open tasks.
+        """
+        if not isinstance(request.data, dict):
+            return Response({'error': 'Request body must be a JSON object'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        new_status = request.data.get('status')
+        ids = request.data.get('ids')
+        overdue = request.data.get('overdue') in (True, 'true', '1')
+        
+        if new_status not in dict(Task.STATUS_CHOICES):
+            return Response({
+                'error': f"'status' must be one of: {', '.join(dict(Task.STATUS_CHOICES))}"
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        if ids is not None and not (isinstance(ids, list) and all(_is_task_id(pk) for pk in ids)):
+            return Response({
+                'error': "'ids' must be a list of task ids"
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        if ids is None and not overdue and not self._has_list_filter(request):
+            return Response({
+                'error': "Select tasks with 'ids', 'overdue' or a list filter"
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        queryset = self.filter_queryset(self.get_queryset()).order_by()
+        if ids is not None:
+            queryset = queryset.filter(id__in=ids)
+        if overdue:
+            queryset = queryset.filter(due_date__lt=timezone.now(), status__in=['pending', 'in_progress'])
+        queryset = queryset.exclude(status=new_status)
+        
+        with transaction.atomic(), tracking.bulk_tracking():
+            # The counter row is locked before the task rows, in the order Task.save takes them
+            seq = TaskCounter.next_change_seq(request.user.id)
+            rows = list(queryset.select_for_update().values(*tracking.STATE_FIELDS))
+            task_ids = [row['id'] for row in rows]
+            if task_ids:
+                now = timezone.now()
+                completed_at = now if new_status == 'completed' else None
+                Task.objects.filter(id__in=task_ids).update(
+                    status=new_status, updated_at=now, completed_at=completed_at, change_seq=seq
+                )
+                tracking.track_updated(request.user.id, [
+                    (tracking.task_state(row), tracking.task_state({**row, 'status': new_status, 'completed_at': completed_at}))
+                    for row in rows
+                ], seq)
+        
+        return Response({
+            'status': new_status,
+            'updated': len(task_ids),
+            'ids': task_ids,
+        })
+    
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        """
+        Create, partially update and delete many tasks in one request.
+        
+        Body: {"create": [task, ...], "update": [{"id": ..., field: value}, ...], "delete": [id, ...]}
+        Every item is validated on its own; valid items are written in a single
+        transaction and the response reports a result per item.
+        """
+        if not isinstance(request.data, dict):
+            return Response({'error': 'Request body must be a JSON object'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        creates = request.data.get('create', [])
+        updates = request.data.get('update', [])
+        deletes = request.data.get('delete', [])
+        
+        if not all(isinstance(items, list) for items in (creates, updates, deletes)):
+            return Response({
+                'error': "'create', 'update' and 'delete' must be lists"
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        if len(creates) + len(updates) + len(deletes) > settings.TASK_BULK_MAX_ITEMS:
+            return Response({
+                'error': f'At most {settings.TASK_BULK_MAX_ITEMS} items are allowed per request'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        context = self.get_serializer_context()
+        create_results, new_tasks = [], []
+        for index, item in enumerate(creates):
+            serializer = TaskCreateSerializer(data=item, context=context)
+            if serializer.is_valid():
+                new_tasks.append((index, Task(user=request.user, **serializer.validated_data)))
+                create_results.append({'index': index})
+            else:
+                create_results.append({'index': index, 'errors': serializer.errors})
+        
+        delete_ids = {pk for pk in deletes if _is_task_id(pk)}
+        update_ids = [
+            item['id'] for item in updates
+            if isinstance(item, dict) and _is_task_id(item.get('id')) and item['id'] not in delete_ids
+        ]
+        now = timezone.now()
+        
+        with transaction.atomic(), tracking.bulk_tracking():
+            seq = TaskCounter.next_change_seq(request.user.id)
+            # Before-states are read under the counter lock, so no concurrent write of the user changes them
+            existing = self.get_queryset().select_for_update().in_bulk(update_ids)
+            deleted = {
+                row['id']: row for row in
+                self.get_queryset().select_for_update().filter(id__in=delete_ids).values(*tracking.STATE_FIELDS)
+            }
+            
+            update_results, changes, changed_fields = [], [], set()
+            for item in updates:
+                pk = item.get('id') if isinstance(item, dict) else None
+                if not _is_task_id(pk):
+                    update_results.append({'id': pk, 'errors': "Each update needs an integer 'id'"})
+                    continue
+                if pk in delete_ids:
+                    update_results.append({'id': pk, 'errors': 'Task is also listed for deletion'})
+                    continue
+                task = existing.get(pk)
+                if task is None:
+                    update_results.append({'id': pk, 'errors': 'Not found'})
+                    continue
+                serializer = TaskSerializer(task, data=item, partial=True, context=context)
+                if not serializer.is_valid():
+                    update_results.append({'id': task.id, 'errors': serializer.errors})
+                    continue
+                before = tracking.task_state(task)
+                for field, value in serializer.validated_data.items():
+                    setattr(task, field, value)
+                    changed_fields.add(field)
+                task.updated_at = now
+                changes.append((before, task))
+                update_results.append({'id': task.id})
+            
+            delete_results = [
+                {'id': pk} if _is_task_id(pk) and pk in deleted else
+                {'id': pk, 'errors': 'Not found' if _is_task_id(pk) else 'Task ids must be integers'}
+                for pk in deletes
+            ]
+            
+            if new_tasks:
+                for _index, task in new_tasks:
+                    task.change_seq = seq
+                    task.set_derived_fields(now)
+                created = Task.objects.bulk_create([task for _index, task in new_tasks], batch_size=1000)
+                for (index, _task), task in zip(new_tasks, created):
+                    create_results[index]['id'] = task.id
+                tracking.track_created(request.user.id, [tracking.task_state(task) for task in created], seq)
+            if changes:
+                for _before, task in changes:
+                    task.change_seq = seq
+                    task.set_derived_fields(now)
+                Task.objects.bulk_update(
+                    [task for _before, task in changes],
+                    sorted(changed_fields) + ['updated_at', 'change_seq', 'priority_rank', 'completed_at'],
+                    batch_size=1000
+                )
+                tracking.track_updated(
+                    request.user.id, [(before, tracking.task_state(task)) for before, task in changes], seq
+                )
+            if deleted:
+                Task.objects.filter(id__in=list(deleted)).delete()
+                tracking.track_deleted(
+                    request.user.id, {pk: tracking.task_state(row) for pk, row in deleted.items()}, seq
+                )
+        
+        results = {'create': create_results, 'update': update_results, 'delete': delete_results}
+        has_errors = any('errors' in result for items in results.values() for result in items)
+        return Response(results, status=status.HTTP_207_MULTI_STATUS if has_errors else status.HTTP_200_OK)
     
     @action(detail=False, methods=['get'])
+    @conditional_task_view
     def stats(self, request):
         """Get task statistics for the user"""
-        user_tasks = self.get_queryset()
+        counter = self.get_task_counter()
         
-        total_tasks = user_tasks.count()
-        completed_tasks = user_tasks.filter(status='completed').count()
-        pending_tasks = user_tasks.filter(status='pending').count()
-        in_progress_tasks = user_tasks.filter(status='in_progress').count()
-        cancelled_tasks = user_tasks.filter(status='cancelled').count()
-        
-        # Overdue tasks
-        overdue_tasks = user_tasks.filter(
-            due_date__lt=timezone.now(),
-            status__in=['pending', 'in_progress']
-        ).count()
-        
-        # Tasks due today
+        # Due-date counters depend on the current time, so they are aggregated
+        # live, but only over open tasks that have a due date
         today = timezone.now().date()
-        due_today = user_tasks.filter(
-            due_date__date=today,
-            status__in=['pending', 'in_progress']
-        ).count()
-        
-        # Tasks due this week
         week_start = today - timedelta(days=today.weekday())
         week_end = week_start + timedelta(days=6)
-        due_this_week = user_tasks.filter(
-            due_date__date__range=[week_start, week_end],
+        due_counts = self.get_queryset().filter(
+            due_date__isnull=False,
             status__in=['pending', 'in_progress']
-        ).count()
+        ).aggregate(
+            overdue_tasks=Count('id', filter=Q(due_date__lt=timezone.now())),
+            due_today=Count('id', filter=Q(due_date__date=today)),
+            due_this_week=Count('id', filter=Q(due_date__date__range=[week_start, week_end])),
+        )
         
-        # Category breakdown
-        category_stats = user_tasks.values('category').annotate(
-            count=Count('id')
-        ).order_by('-count')
-        
-        # Priority breakdown
-        priority_stats = user_tasks.values('priority').annotate(
-            count=Count('id')
-        ).order_by('-count')
+        total_tasks = counter.total
+        completed_tasks = counter.status_completed
         
         return Response({
             'total_tasks': total_tasks,
             'completed_tasks': completed_tasks,
-            'pending_tasks': pending_tasks,
-            'in_progress_tasks': in_progress_tasks,
-            'cancelled_tasks': cancelled_tasks,
-            'overdue_tasks': overdue_tasks,
-            'due_today': due_today,
-            'due_this_week': due_this_week,
+            'pending_tasks': counter.status_pending,
+            'in_progress_tasks': counter.status_in_progress,
+            'cancelled_tasks': counter.status_cancelled,
+            **due_counts,
             'completion_rate': round((completed_tasks / total_tasks * 100) if total_tasks > 0 else 0, 2),
-            'category_stats': list(category_stats),
-            'priority_stats': list(priority_stats),
+            'category_stats': counter.breakdown('category'),
+            'priority_stats': counter.breakdown('priority'),
         })
     
     @action(detail=False, methods=['get'])
+    @conditional_task_view
+    def calendar(self, request):
+        """
+        Task counts per due-date bucket, by status and priority, for calendar
+        views.
+        
+        `from` / `to` (YYYY-MM-DD, inclusive; default: the current month)
+        bound the due dates, `bucket` is `day` (default) or `week` (weeks start
+        on Monday) and `tz` is the IANA timezone days are cut in (default: the
+        server's TIME_ZONE). Counts come from one grouped query; only buckets
+        that have tasks are listed.
+        """
+        params = request.query_params
+        bucket = params.get('bucket', 'day')
+        if bucket not in ('day', 'week'):
+            return Response({
+                'error': "'bucket' must be one of: day, week"
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            tz = zoneinfo.ZoneInfo(params['tz']) if params.get('tz') else timezone.get_current_timezone()
+        except (zoneinfo.ZoneInfoNotFoundError, ValueError):
+            return Response({
+                'error': 'Unknown timezone'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        month_start = timezone.localdate(timezone=tz).replace(day=1)
+        try:
+            start, end = _date_range(params, month_start, _month_end(month_start), settings.TASK_CALENDAR_MAX_DAYS)
+        except ValueError as exc:
+            return Response({
+                'error': str(exc)
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        rows = self.get_queryset().filter(
+            due_date__gte=datetime.combine(start, time.min, tzinfo=tz),
+            due_date__lt=datetime.combine(end + timedelta(days=1), time.min, tzinfo=tz),
+        ).annotate(
+            bucket=Trunc('due_date', bucket, output_field=DateField(), tzinfo=tz)
+        ).values('bucket', 'status', 'priority').annotate(
+            count=Count('id')
+        ).order_by('bucket')
+        
+        buckets = {}
+        for row in rows:
+            entry = buckets.get(row['bucket'])
+            if entry is None:
+                entry = buckets[row['bucket']] = {'date': row['bucket'], 'total': 0, 'status': {}, 'priority': {}}
+            entry['total'] += row['count']
+            entry['status'][row['status']] = entry['status'].get(row['status'], 0) + row['count']
+            entry['priority'][row['priority']] = entry['priority'].get(row['priority'], 0) + row['count']
+        
+        return Response({
+            'from': start,
+            'to': end,
+            'bucket': bucket,
+            'tz': str(tz),
+            'buckets': list(buckets.values()),
+        })
+    
+    @action(detail=False, methods=['get'])
+    @conditional_task_view
+    def analytics(self, request):
+        """
+        Throughput trend: tasks created and completed per `period` (day, week
+        or month; default month) and the median time to complete.
+        
+        `from` / `to` (YYYY-MM-DD, inclusive) default to the last 30 days,
+        12 weeks or 12 months. Served from the daily rollup rows (one per
+        day with activity, days cut in TIME_ZONE); medians are interpolated
+        from the time-to-complete histogram, in hours.
+        """
+        params = request.query_params
+        period = params.get('period', 'month')
+        if period not in ANALYTICS_PERIODS:
+            return Response({
+                'error': f"'period' must be one of: {', '.join(ANALYTICS_PERIODS)}"
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        today = timezone.localdate(timezone=timezone.get_default_timezone())
+        default_start = {
+            'day': today - timedelta(days=29),
+            'week': _period_start('week', today) - timedelta(weeks=11),
+            'month': _add_months(today.replace(day=1), -11),
+        }[period]
+        try:
+            start, end = _date_range(params, default_start, today, settings.TASK_ANALYTICS_MAX_DAYS)
+        except ValueError as exc:
+            return Response({
+                'error': str(exc)
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        series = {}
+        bucket_start = _period_start(period, start)
+        while bucket_start <= end:
+            series[bucket_start] = {'start': bucket_start, 'created': 0, 'completed': 0, 'histogram': TaskDailyRollup.empty_histogram()}
+            bucket_start = _next_period(period, bucket_start)
+        
+        total_histogram = TaskDailyRollup.empty_histogram()
+        rollups = TaskDailyRollup.objects.filter(
+            user=request.user, day__range=(start, end)
+        ).values_list('day', 'created', 'completed', 'completion_histogram')
+        for day, created, completed, histogram in rollups:
+            entry = series[_period_start(period, day)]
+            entry['created'] += created
+            entry['completed'] += completed
+            for bucket, count in enumerate(histogram[:len(total_histogram)]):
+                entry['histogram'][bucket] += count
+                total_histogram[bucket] += count
+        
+        for entry in series.values():
+            entry['median_hours'] = TaskDailyRollup.median_hours(entry.pop('histogram'))
+        
+        return Response({
+            'period': period,
+            'from': start,
+            'to': end,
+            'series': list(series.values()),
+            'summary': {
+                'created': sum(entry['created'] for entry in series.values()),
+                'completed': sum(entry['completed'] for entry in series.values()),
+                'median_hours': TaskDailyRollup.median_hours(total_histogram),
+            },
+            'completion_histogram': [
+                {'max_hours': max_hours, 'count': count}
+                for max_hours, count in zip((*TaskDailyRollup.DURATION_BUCKETS, None), total_histogram)
+            ],
+        })
+    
+    def stream_response(self, queryset, filename, archived=None):
+        """
+        Stream a task queryset, followed by the `archived` task queryset if
+        one is given, as NDJSON or CSV, per the accepted renderer.
+        
+        Rows are read through a server-side cursor in chunks, so memory stays
+        flat for any number of tasks.
+        """
+        fields = self.get_response_fields()
+        queryset = _task_rows(queryset, TaskReadSerializer.columns_for(fields), archived)
+        serializer = TaskReadSerializer(None, fields=fields)
+        rows = (
+            serializer.to_representation(row)
+            for row in queryset.iterator(chunk_size=settings.TASK_EXPORT_CHUNK_SIZE)
+        )
+        renderer = self.request.accepted_renderer
+        header = fields or TaskSerializer.Meta.fields
+        content = _stream_csv(rows, header) if renderer.format == 'csv' else _stream_ndjson(rows)
+        response = StreamingHttpResponse(content, content_type=f'{renderer.media_type}; charset=utf-8')
+        response['Content-Disposition'] = f'attachment; filename="{filename}.{renderer.format}"'
+        return response
+    
+    @action(detail=False, methods=['get'], renderer_classes=[NDJSONRenderer, CSVRenderer])
+    def export(self, request):
+        """
+        Stream every task of the user as NDJSON (default) or CSV (`?format=csv`).
+        
+        Honours the list filters, search, ordering, `fields`/`exclude` and
+        `include_archived`.
+        """
+        return self.stream_response(
+            self.filter_queryset(self.get_queryset()), 'tasks', archived=self.get_archived_queryset()
+        )
+    
+    @action(detail=False, methods=['post'], url_path='import', parser_classes=[MultiPartParser])
+    def import_tasks(self, request):
+        """
+        Import tasks from an uploaded CSV or NDJSON file (`file`).
+        
+        The format comes from `file_format` or the file extension. Rows are
+        validated like POST /api/tasks/ and inserted in large batches; the
+        response reports the rows that failed.
+        """
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response({
+                'error': "Upload the tasks as 'file'"
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        file_format = request.data.get('file_format') or upload.name.rsplit('.', 1)[-1].lower()
+        if file_format not in IMPORT_FORMATS:
+            return Response({
+                'error': f"'file_format' must be one of: {', '.join(IMPORT_FORMATS)}"
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        result = TaskImporter(request.user).run(open_text(upload), file_format)
+        if 'error' in result:
+            # Unreadable file: the counts tell what was imported before it stopped
+            return Response(result, status=status.HTTP_400_BAD_REQUEST)
+        return Response(result, status=status.HTTP_207_MULTI_STATUS if result['failed'] else status.HTTP_200_OK)
+    
+    @action(detail=False, methods=['get'])
+    def changes(self, request):
+        """
+        Delta sync for offline clients.
+        
+        Returns tasks created or updated after the `since` sync token, the ids
+        of tasks deleted after it, and a new token. Without `since` every task
+        is returned (full sync). Tokens older than the tombstone retention
+        window get 410 Gone and must fall back to a full sync.
+        
+        Large syncs come in pages of up to TASK_SYNC_PAGE_SIZE tasks and
+        deleted ids, ordered by (change_seq, id): `next` links the following
+        page until it is null. Every page carries the same `token`, the
+        version the sync started at; changes made while the client pages are
+        left for the next sync from that token.
+        """
+        cursor = request.query_params.get('cursor')
+        if cursor:
+            try:
+                position = _decode_sync_cursor(cursor)
+            except (TypeError, ValueError, KeyError):
+                return Response({
+                    'error': 'Invalid sync cursor'
+                }, status=status.HTTP_400_BAD_REQUEST)
+            since, until = position['since'], position['until']
+            counter = self.get_task_counter()
+        else:
+            since = request.query_params.get('since')
+            if since is not None:
+                try:
+                    since = int(since)
+                except ValueError:
+                    return Response({
+                        'error': 'Invalid sync token'
+                    }, status=status.HTTP_400_BAD_REQUEST)
+            counter = self.get_task_counter()
+            until = counter.version
+            position = {'since': since, 'until': until, 'task': None, 'deleted': None}
+        
+        if since is not None and since < counter.sync_horizon:
+            return Response({
+                'error': 'Sync token expired, a full sync is required'
+            }, status=status.HTTP_410_GONE)
+        
+        if since is not None and since >= until:
+            # Nothing changed: answered from the counter row alone
+            return Response({'token': str(until), 'tasks': [], 'deleted': [], 'next': None})
+        
+        page_size = settings.TASK_SYNC_PAGE_SIZE
+        changed = _after_sync_position(
+            self.get_queryset().filter(change_seq__lte=until), since, position['task']
+        ).order_by('change_seq', 'id').values('change_seq', *TaskReadSerializer.columns)[:page_size + 1]
+        changed = list(changed)
+        deleted = []
+        if since is not None:
+            tombstones = TaskTombstone.objects.filter(user=request.user, change_seq__lte=until)
+            deleted = list(_after_sync_position(tombstones, since, position['deleted']).order_by(
+                'change_seq', 'id'
+            ).values_list('change_seq', 'id', 'task_id')[:page_size + 1])
+        
+        more = len(changed) > page_size or len(deleted) > page_size
+        changed, deleted = changed[:page_size], deleted[:page_size]
+        next_url = None
+        if more:
+            if changed:
+                position['task'] = [changed[-1]['change_seq'], changed[-1]['id']]
+            if deleted:
+                position['deleted'] = list(deleted[-1][:2])
+            next_url = replace_query_param(
+                request.build_absolute_uri(), 'cursor', _encode_sync_cursor(position)
+            )
+        return Response({
+            'token': str(until),
+            'tasks': TaskReadSerializer(changed).data,
+            'deleted': [task_id for _seq, _id, task_id in deleted],
+            'next': next_url,
+        })
+    
+    @action(detail=False, methods=['get'])
+    @conditional_task_view
     def recent(self, request):
         """Get recently created tasks"""
-        recent_tasks = self.get_queryset()[:10]
-        serializer = self.get_serializer(recent_tasks, many=True)
-        return Response(serializer.data)
+        return self.read_response(self.get_queryset()[:10], paginate=False)
     
-    @action(detail=False, methods=['get'])
+    @action(detail=False, methods=['get'], renderer_classes=[*api_settings.DEFAULT_RENDERER_CLASSES, NDJSONRenderer, CSVRenderer])
+    @conditional_task_view
     def overdue(self, request):
-        """Get overdue tasks"""
-        overdue_tasks = self.get_queryset().filter(
+        """
+        Get overdue tasks, paginated like the list and honouring its filters,
+        search and ordering; `?format=ndjson|csv` streams every overdue task.
+        
+        Served by the partial index on open tasks' due dates.
+        """
+        overdue_tasks = self.filter_queryset(self.get_queryset()).filter(
             due_date__lt=timezone.now(),
             status__in=['pending', 'in_progress']
         )
-        serializer = self.get_serializer(overdue_tasks, many=True)
-        return Response(serializer.data)
+        if request.accepted_renderer.format in (NDJSONRenderer.format, CSVRenderer.format):
+            return self.stream_response(overdue_tasks, 'overdue-tasks')
+        return self.read_response(overdue_tasks)
+
+
+ANALYTICS_PERIODS = ('day', 'week', 'month')
+
+
+def _is_task_id(value):
+    """Whether a JSON value from a request body is usable as a task id (booleans are not)"""
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _encode_sync_cursor(position):
+    return base64.urlsafe_b64encode(json.dumps(position, separators=(',', ':')).encode()).decode()
+
+
+def _decode_sync_cursor(cursor):
+    """The sync position of a `changes` page cursor; ValueError, TypeError or KeyError when malformed"""
+    position = json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
+    since = position['since']
+    for key in ('task', 'deleted'):
+        if position[key] is not None:
+            seq, pk = position[key]
+            position[key] = [int(seq), int(pk)]
+    return {
+        'since': None if since is None else int(since), 'until': int(position['until']),
+        'task': position['task'], 'deleted': position['deleted'],
+    }
+
+
+def _after_sync_position(queryset, since, position):
+    """Rows changed after `since` and past a (change_seq, id) page position, if any"""
+    if position is not None:
+        seq, pk = position
+        return queryset.filter(Q(change_seq__gt=seq) | Q(change_seq=seq, id__gt=pk))
+    if since is not None:
+        return queryset.filter(change_seq__gt=since)
+    return queryset
+
+
+def _date_range(params, default_start, default_end, max_days):
+    """
+    Inclusive (from, to) dates from the query string; ValueError with a
+    client-facing message when they are malformed or out of range.
+    """
+    try:
+        start = date.fromisoformat(params['from']) if params.get('from') else default_start
+        end = date.fromisoformat(params['to']) if params.get('to') else default_end
+    except ValueError:
+        raise ValueError("'from' and 'to' must be dates (YYYY-MM-DD)")
+    if end < start or (end - start).days >= max_days:
+        raise ValueError(f"'to' must be on or after 'from' and within {max_days} days of it")
+    return start, end
+
+
+def _month_end(day):
+    return _add_months(day.replace(day=1), 1) - timedelta(days=1)
+
+
+def _add_months(day, months):
+    """First day of the month `months` away from `day`'s month"""
+    month = day.year * 12 + day.month - 1 + months
+    return date(month // 12, month % 12 + 1, 1)
+
+
+def _period_start(period, day):
+    if period == 'week':
+        return day - timedelta(days=day.weekday())
+    if period == 'month':
+        return day.replace(day=1)
+    return day
+
+
+def _next_period(period, start):
+    if period == 'week':
+        return start + timedelta(weeks=1)
+    if period == 'month':
+        return _add_months(start, 1)
+    return start + timedelta(days=1)
+
+
+def _task_rows(queryset, columns, archived=None):
+    """
+    `queryset.values(*columns)`; with an `archived` queryset, the UNION ALL
+    of both tables' rows in the live queryset's ordering.
+    """
+    if archived is None:
+        return queryset.values(*columns)
+    ordering = list(queryset.query.order_by or queryset.model._meta.ordering)
+    if not {'id', '-id'} & set(ordering):
+        # Ties would otherwise come back in a different order on every page
+        ordering.append('-id' if ordering[0].startswith('-') else 'id')
+    # A combined query can only be ordered by columns it selects
+    columns = columns + [field.lstrip('-') for field in ordering if field.lstrip('-') not in columns]
+    return queryset.order_by().values(*columns).union(
+        archived.order_by().values(*columns), all=True
+    ).order_by(*ordering)
+
+
+class _Echo:
+    """Pseudo-buffer that hands back what csv.writer writes into it"""
+    
+    def write(self, value):
+        return value
+
+
+def _stream_csv(rows, header):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(header)
+    for row in rows:
+        yield writer.writerow(['' if row[field] is None else row[field] for field in header])
+
+
+def _stream_ndjson(rows):
+    for row in rows:
+        yield dumps(row) + b'\n'
+
+
+def _authenticate_event_stream(request):
+    """
+    Authenticate an event stream with the JWT from the Authorization header
+    or, since browsers' EventSource cannot set headers, the `token` parameter.
+    """
+    authentication = JWTAuthentication()
+    header = authentication.get_header(request)
+    raw_token = authentication.get_raw_token(header) if header else request.GET.get('token')
+    if not raw_token:
+        return None
+    return authentication.get_user(authentication.get_validated_token(raw_token))
+
+
+def _open_event_stream(request):
+    """
+    (user, TaskCounter row) of an event stream request, or (None, None)
+    without credentials. The request's database connection is released
+    before the stream starts: it would otherwise stay open for as long as
+    the stream does, one per idle client.
+    """
+    try:
+        user = _authenticate_event_stream(request)
+        return (user, TaskCounter.get_for_user(user.id)) if user is not None else (None, None)
+    finally:
+        connections.close_all()
+
+
+def _format_event(event):
+    lines = []
+    if event.get('token') is not None:
+        lines.append(f"id: {event['token']}")
+    lines.append(f"event: {event['event']}")
+    lines.append(f"data: {json.dumps(event)}")
+    return '\n'.join(lines) + '\n\n'
+
+
+async def task_events(request):
+    """
+    Server-Sent Events stream of the user's task changes.
+    
+    Each event carries the change kind, the number of tasks and the new sync
+    token; clients fetch the data through /api/tasks/changes/. Comments are
+    sent as heartbeats, and streams are closed after TASK_EVENTS_MAX_AGE
+    seconds so the browser reconnects (resuming from Last-Event-ID).
+    """
+    try:
+        user, counter = await sync_to_async(_open_event_stream)(request)
+    except (InvalidToken, AuthenticationFailed):
+        user = None
+    if user is None:
+        return JsonResponse({'detail': 'Authentication credentials were not provided.'}, status=401)
+    
+    last_event_id = request.headers.get('Last-Event-ID', '')
+    
+    async def stream():
+        broker = get_broker()
+        subscription = broker.subscribe(user.id)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + settings.TASK_EVENTS_MAX_AGE
+        try:
+            yield f'retry: {settings.TASK_EVENTS_HEARTBEAT * 1000}\n\n'
+            if last_event_id.isdigit() and int(last_event_id) < counter.version:
+                # Changes happened while the client was disconnected
+                yield _format_event({'event': 'resync', 'count': None, 'token': str(counter.version)})
+            while loop.time() < deadline:
+                event = await subscription.get(settings.TASK_EVENTS_HEARTBEAT)
+                yield ': ping\n\n' if event is None else _format_event(event)
+        finally:
+            broker.unsubscribe(subscription)
+    
+    response = StreamingHttpResponse(stream(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response